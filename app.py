@@ -7,6 +7,9 @@ import re
 import shutil
 import io
 import socket
+import tempfile
+import hmac
+from time import perf_counter
 from datetime import datetime, timedelta
 from functools import wraps
 from urllib.parse import unquote
@@ -15,12 +18,78 @@ from urllib.parse import unquote
 from live_state import live_state_manager
 
 # 백업 시스템 import
-from backup_db import backup_all, list_backups, restore_project_libraries, get_project_library_info
+from backup_db import backup_all, list_backups, restore_project_libraries, get_project_library_info, format_file_size
 
-from flask import Flask, jsonify, request, render_template, send_from_directory, session, make_response
+# 시퀀스 팩 (아틀라스 + 바이너리 인덱스) import
+from sequence_pack import build_sequence_pack
+
+# 라이브러리 이미지 최적화 import
+from image_optimizer import optimize_library_image, remove_variants, accepted_variants, select_variant
+
+# 라이브러리 인덱스 import
+from library_index import library_index
+
+# 재개 가능한 분할 업로드 모듈 import
+from chunked_upload import chunked_upload_manager, UploadError
+
+# 에셋 서빙 (ETag / immutable 캐시) 모듈 import
+from asset_server import asset_server
+
+# 프리로드 매니페스트 모듈 import
+from preload_manifest import preload_manifests
+
+# 에셋 참조 인덱스 모듈 import
+from asset_references import asset_references
+
+# 라이브러리 가비지 컬렉터 모듈 import
+from library_gc import library_gc
+
+# 스트리밍 ZIP 모듈 import
+from streaming_zip import stream_zip, write_zip, extract_members
+
+# 증분 백업 모듈 import
+from incremental_backup import incremental_backups, BackupError, serialize_row
+
+# 대량 DB 복구 엔진 import
+from bulk_restore import bulk_restore, BulkRestoreError
+
+# JSON 스트리밍 파서 import
+from json_stream import JsonStreamReader
+
+# SQL 덤프 문장 읽기 import
+from sql_dump import iter_sql_statements
+
+# 컴팩트 백업 형식 (테이블별 NDJSON) import
+from compact_backup import (
+    BACKUP_FORMATS, COMPACT_FORMAT, COMPACT_FORMAT_VERSION, resolve_compression, table_member_name,
+    spool_table, iter_spool, decode_table
+)
+
+# 라이브러리 스캐너 모듈 import
+from library_scanner import library_scanner
+
+# 백업/복구 백그라운드 작업 import
+from backup_jobs import backup_jobs, JobError, UPLOAD_FILENAME, ARTIFACT_FILENAME
+
+# 시스템 메트릭 샘플러 import
+from system_metrics import system_metrics, format_percent
+
+# 애플리케이션 계측 (Prometheus /metrics) import
+from app_metrics import app_metrics, METRICS_TOKEN
+
+# 요청별 SQL 프로파일러 import
+from request_profiler import request_profiler
+
+# 라이브 송출 지연 추적 import
+from live_latency import live_latency
+
+from flask import Flask, Response, g, has_app_context, jsonify, request, render_template, send_from_directory, session, make_response
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import attributes
 from flask_socketio import SocketIO, emit, join_room, leave_room, disconnect
-from flask_jwt_extended import JWTManager, create_access_token, get_jwt_identity, jwt_required, decode_token
+from flask_jwt_extended import JWTManager, create_access_token, get_jwt_identity, jwt_required, decode_token, verify_jwt_in_request
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -93,6 +162,63 @@ except Exception as e:
 # 전역 변수들 (중복 제거)
 # socketio는 이미 위에서 초기화됨
 
+# 라이브 송출 이벤트 (시스템 메트릭의 초당 라이브 이벤트 수 집계 대상)
+LIVE_EVENTS = frozenset([
+    'scene_change', 'scene_out', 'scene_live_update', 'object_live_update',
+    'timer_update', 'timer_control', 'live_state_cleared'
+])
+
+_socketio_emit = socketio.emit
+
+def instrumented_socketio_emit(event, *args, **kwargs):
+    """socketio.emit 래퍼 (핸들러 안의 emit 도 socketio.emit 을 거침)
+
+    라이브 이벤트 전송 횟수 집계 + 이벤트별 emit 시간 기록
+    라이브 제어 요청(live_traced) 안에서 보내는 라이브 이벤트에는 trace_id 를 붙이고 룸별 전송 시각 기록
+    """
+    trace = None
+    if event in LIVE_EVENTS:
+        system_metrics.count_live_event()
+        trace = g.get('live_trace') if has_app_context() else None
+        if trace is not None and args and isinstance(args[0], dict):
+            # 호출한 쪽의 payload(상태 객체 등)는 바꾸지 않고 복사본에 trace_id 를 붙임
+            args = ({**args[0], 'trace_id': trace.trace_id},) + args[1:]
+    if not app_metrics.enabled and trace is None:
+        return _socketio_emit(event, *args, **kwargs)
+    started = perf_counter()
+    try:
+        return _socketio_emit(event, *args, **kwargs)
+    finally:
+        finished = perf_counter()
+        if app_metrics.enabled:
+            app_metrics.observe_emit(event, finished - started)
+        if trace is not None:
+            live_latency.emitted(trace, kwargs.get('to', kwargs.get('room')), started, finished)
+
+socketio.emit = instrumented_socketio_emit
+
+def socket_room_kind(room):
+    """룸 이름 -> 종류 (user_<id>, user_<id>_channel_<채널>, project_<이름>)"""
+    if room.startswith('user_'):
+        return 'channel' if '_channel_' in room else 'user'
+    if room.startswith('project_'):
+        return 'project'
+    return 'other'
+
+def socketio_room_sizes():
+    """룸 종류별 [(종류, 룸 수, 인원 합계)] (전체 룸과 클라이언트별 sid 룸 제외, 룸 이름은 내보내지 않음)"""
+    sizes = {}
+    for namespace, rooms in list(socketio.server.manager.rooms.items()):
+        for room, members in list(rooms.items()):
+            if room is None or room in members:
+                continue
+            kind = socket_room_kind(room)
+            count, total = sizes.get(kind, (0, 0))
+            sizes[kind] = (count + 1, total + len(members))
+    return [(kind, count, total) for kind, (count, total) in sizes.items()]
+
+app_metrics.configure(room_sizes=socketio_room_sizes, system_sample=system_metrics.latest)
+
 # 사용자별 송출 상태 (메모리 저장)
 user_broadcast_state = {}
 
@@ -272,6 +398,96 @@ class CanvasPreset(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+@event.listens_for(db.session, 'after_flush')
+def track_project_changes(session, flush_context):
+    """씬/오브젝트 변경 시 프로젝트 버전 증가 (프리로드 매니페스트 캐시 무효화) + 에셋 참조 변경 수집"""
+    reference_changes = session.info.setdefault('asset_reference_changes', [])
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(instance, Object):
+            # 다른 씬으로 이동한 경우 이전 씬도 포함
+            history = attributes.get_history(instance, 'scene_id')
+            for scene_id in set(history.added or ()) | set(history.deleted or ()) | {instance.scene_id}:
+                if scene_id is not None:
+                    preload_manifests.bump_scene(scene_id)
+            
+            if instance in session.deleted:
+                reference_changes.append(asset_references.object_removal(instance.id))
+            else:
+                with session.no_autoflush:
+                    scene = session.get(Scene, instance.scene_id)
+                reference_changes.append(asset_references.object_change(
+                    instance.id, scene.project_id if scene else None, instance.scene_id, instance.type, instance.properties
+                ))
+        elif isinstance(instance, Scene):
+            preload_manifests.bump_project(instance.project_id)
+        elif isinstance(instance, Project):
+            preload_manifests.bump_project(instance.id)
+
+@event.listens_for(db.session, 'after_commit')
+def apply_asset_reference_changes(session):
+    """커밋된 오브젝트 변경을 에셋 참조 인덱스에 반영"""
+    asset_references.apply(session.info.pop('asset_reference_changes', None))
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def discard_asset_reference_changes(session, previous_transaction):
+    session.info.pop('asset_reference_changes', None)
+
+# --- 계측 (요청 지연 시간 / DB 쿼리) ---
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if app_metrics.enabled or request_profiler.enabled:
+        conn.info.setdefault('query_started', []).append(perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query_metrics(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    seconds = perf_counter() - started.pop()
+    if app_metrics.enabled:
+        app_metrics.observe_query(statement, seconds)
+    if request_profiler.enabled:
+        profile = g.get('request_profile') if has_app_context() else None
+        message = request_profiler.record_query(profile, statement, seconds)
+        if message:
+            app.logger.warning(message)
+
+@event.listens_for(Engine, 'handle_error')
+def record_query_error(exception_context):
+    started = exception_context.connection.info.get('query_started') if exception_context.connection else None
+    if started:
+        started.pop()
+    app_metrics.count_query_error()
+
+@app.before_request
+def start_request_timer():
+    if app_metrics.enabled or request_profiler.enabled:
+        g.request_started = perf_counter()
+    if request_profiler.enabled:
+        g.request_profile = request_profiler.start()
+
+@app.after_request
+def record_request_metrics(response):
+    """라우트(URL 규칙)별 처리 시간 기록 (스트리밍 응답은 응답 객체를 반환할 때까지)
+
+    프로파일링 중이면 SQL 문장 수/시간을 Server-Timing 헤더로 붙이고 느린 요청 기록
+    """
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    seconds = perf_counter() - started
+    if app_metrics.enabled:
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        app_metrics.observe_request(route, request.method, response.status_code, seconds)
+    profile = g.pop('request_profile', None)
+    if profile is not None:
+        response.headers.add('Server-Timing', request_profiler.server_timing(profile, seconds))
+        message = request_profiler.finish_request(profile, request.method, request.path, seconds)
+        if message:
+            app.logger.warning(message)
+    return response
+
 # --- Helper Functions ---
 
 def allowed_image_file(filename):
@@ -284,6 +500,21 @@ def check_file_size(file):
     file.seek(0)  # 파일 시작으로 복귀
     return size <= MAX_FILE_SIZE
 
+def save_uploaded_file(file, file_path):
+    """업로드 파일을 임시 파일에 쓴 뒤 os.replace 로 교체
+
+    같은 이름으로 덮어써도 기존 파일을 제자리에서 자르지 않으므로, asset_server 가 mmap 으로
+    보내고 있는 이전 파일은 그 요청이 끝날 때까지 그대로 유지됨 (잘린 매핑 접근 시 SIGBUS 방지)
+    """
+    tmp_path = file_path + '.tmp'
+    try:
+        file.save(tmp_path)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 def safe_unicode_filename(filename):
     # 위험문자만 제거하고 한글 등 유니코드는 허용
     keepchars = (' ', '.', '_', '-')
@@ -529,6 +760,20 @@ def admin_required(f):
     
     return decorated_function
 
+def live_traced(f):
+    """라이브 제어 API를 위한 데코레이터 - 요청마다 trace id 를 만들어 이 요청에서 보내는 라이브 이벤트에 붙임
+
+    X-Trace-Id 요청 헤더로 trace id 를 지정할 수 있고, 응답의 X-Trace-Id 헤더로 돌려줌
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.live_trace = live_latency.start(request.endpoint, request.headers.get('X-Trace-Id'), g.get('request_started'))
+        response = make_response(f(*args, **kwargs))
+        response.headers['X-Trace-Id'] = g.live_trace.trace_id
+        return response
+    
+    return decorated_function
+
 # CORS 미들웨어 제거 (Flask-CORS가 처리)
 
 @app.route('/health')
@@ -622,10 +867,13 @@ def handle_connect():
     
     # 기본적으로 연결 허용 (인증은 join 이벤트에서 처리)
     print("WebSocket connection accepted")
+    system_metrics.client_connected(request.sid)
     return True
 
 @socketio.on('disconnect')
 def handle_disconnect():
+    system_metrics.client_disconnected(request.sid)
+    live_latency.overlay_left(request.sid)
     if 'user_id' in session:
         del session['user_id']
 
@@ -638,6 +886,9 @@ def handle_join(data):
     if room:
         print(f"🎯 직접 룸 조인 요청: {room}")
         join_room(room)
+        # 오버레이 페이지는 사용자/채널 룸에 직접 참여
+        system_metrics.overlay_joined(request.sid)
+        live_latency.overlay_joined(request.sid, room)
         print(f"✅ Socket.io: 클라이언트가 룸에 참여 - {room}")
         emit('joined', {'room': room})
         return
@@ -996,6 +1247,7 @@ def handle_user_project_detail(username, project_name):
         if 'name' in data:
             project.name = data['name']
         db.session.commit()
+        asset_server.invalidate_folders()
         return jsonify(project_to_dict(project))
         
     elif request.method == 'DELETE':
@@ -1010,6 +1262,7 @@ def handle_user_project_detail(username, project_name):
             
         db.session.delete(project)
         db.session.commit()
+        asset_server.invalidate_folders()
         return jsonify({'message': 'Project deleted successfully'})
 
 @app.route('/api/projects/<project_name>/share', methods=['POST'])
@@ -1341,6 +1594,7 @@ def overlay_scene(project_name, scene_id):
 
 @app.route('/api/scenes/<int:scene_id>/push', methods=['POST'])
 @jwt_required()
+@live_traced
 def push_scene(scene_id):
     try:
         current_user = get_current_user_from_token()
@@ -1380,6 +1634,7 @@ def push_scene(scene_id):
 
 @app.route('/api/scenes/<int:scene_id>/out', methods=['POST'])
 @jwt_required()
+@live_traced
 def out_scene(scene_id):
     try:
         current_user = get_current_user_from_token()
@@ -1652,6 +1907,12 @@ def change_object_id(object_id):
         
         db.session.commit()
         
+        # 직접 INSERT 한 객체는 세션 이벤트를 거치지 않으므로 에셋 참조 인덱스에 직접 반영
+        scene = Scene.query.get(old_data['scene_id'])
+        asset_references.apply([asset_references.object_change(
+            new_id, scene.project_id if scene else None, old_data['scene_id'], old_data['type'], old_data['properties']
+        )])
+        
         # 새로 생성된 객체 조회
         new_obj = Object.query.get(new_id)
         
@@ -1788,6 +2049,15 @@ def handle_scene_out(data):
         print(f"❌ Error in handle_scene_out: {str(e)}")
         return False
 
+@socketio.on('live_ack')
+def handle_live_ack(data):
+    """오버레이가 trace_id 가 붙은 라이브 이벤트를 화면에 반영함 - 채널별 송출 지연 집계
+
+    오버레이 룸에 참여한 소켓의 ack 만 받음 (다른 클라이언트가 보낸 값으로 지연 통계가 바뀌지 않도록)
+    """
+    if isinstance(data, dict) and live_latency.is_overlay(request.sid):
+        live_latency.ack(request.sid, data.get('trace_id'), data.get('render_ms'))
+
 @socketio.on('get_first_scene')
 def handle_get_first_scene(data):
     project_name = data.get('project_name')
@@ -1915,6 +2185,90 @@ def get_sequence_thumbnail_path(project_name, sequence_name, user_id=None):
     os.makedirs(thumb_dir, exist_ok=True)
     return os.path.join(thumb_dir, f"{sequence_name}.webp")
 
+def resolve_sequence_folder(project_folder, sequence_name):
+    """클라이언트가 보낸 시퀀스 이름을 정리하고 폴더 경로 확인
+
+    반환값: (정리된 이름, sequences/ 바로 아래 폴더 경로), 이름이 비었거나 경로가 벗어나면 (None, None)
+    ('..' 같은 이름으로 library 폴더 등을 지우지 않도록 실제 경로 기준으로 검사)
+    """
+    name = safe_unicode_filename(sequence_name or '').strip()
+    sequences_path = os.path.realpath(os.path.join(project_folder, 'library', 'sequences'))
+    sequence_folder = os.path.realpath(os.path.join(sequences_path, name))
+    if not name or os.path.dirname(sequence_folder) != sequences_path:
+        return None, None
+    return name, sequence_folder
+
+def ingest_library_image(project_name, owner_id, images_path, filename):
+    """images 폴더에 저장된 업로드 이미지 후처리 (TGA 변환, 최적화, 썸네일, 인덱스)
+
+    반환값: 최종 파일명 (TGA는 PNG로 변환되어 이름이 바뀜)
+    """
+    file_path = os.path.join(images_path, filename)
+    
+    # TGA 파일인 경우 PNG로 변환
+    if filename.lower().endswith('.tga'):
+        try:
+            png_filename = filename[:-4] + '.png'
+            png_path = os.path.join(images_path, png_filename)
+            print(f"TGA를 PNG로 변환 중: {file_path} -> {png_path}")
+            
+            with Image.open(file_path) as img:
+                if img.mode != 'RGBA':
+                    img = img.convert('RGBA')
+                img.save(png_path + '.tmp', 'PNG')
+            os.replace(png_path + '.tmp', png_path)
+            
+            # 원본 TGA 파일 삭제
+            os.remove(file_path)
+            filename = png_filename
+            file_path = png_path
+            print(f"TGA -> PNG 변환 완료: {filename}")
+        except Exception as e:
+            print(f"TGA 변환 실패: {e}")
+            import traceback
+            print(traceback.format_exc())
+            # 변환 실패 시 원본 TGA 파일 유지
+            print(f"변환 실패로 원본 TGA 파일 유지: {filename}")
+    
+    # 이미지 최적화 (PNG 재압축 + WebP/AVIF 변형)
+    try:
+        optimize_library_image(file_path)
+    except Exception as e:
+        print(f"이미지 최적화 실패: {e}")
+    
+    # 썸네일 생성
+    thumb_path = get_thumbnail_path(project_name, filename, owner_id)
+    print(f"썸네일 경로: {thumb_path}")
+    create_thumbnail(file_path, thumb_path)
+    
+    library_index.upsert_image(os.path.join(get_project_folder(project_name, owner_id), 'library'), filename)
+    return filename
+
+def ingest_sequence(project_name, owner_id, sequence_name, meta_data):
+    """시퀀스 폴더에 sprite.png + meta.json 저장 후 후처리 (썸네일, 시퀀스 팩, 인덱스)"""
+    project_folder = get_project_folder(project_name, owner_id)
+    sequence_folder = os.path.join(project_folder, 'library', 'sequences', sequence_name)
+    sprite_path = os.path.join(sequence_folder, 'sprite.png')
+    
+    # 썸네일 생성
+    try:
+        thumb_path = get_sequence_thumbnail_path(project_name, sequence_name, owner_id)
+        create_sequence_thumbnail(sprite_path, thumb_path, meta_data.get('frame_width', 150))
+    except Exception as e:
+        print(f"썸네일 생성 실패: {e}")
+        # 썸네일 생성 실패는 치명적이지 않으므로 계속 진행
+    
+    # 시퀀스 팩 생성 (실패해도 스프라이트로 재생 가능하므로 계속 진행)
+    try:
+        pack_info = build_sequence_pack(sequence_folder)
+        if pack_info:
+            meta_data['pack'] = pack_info
+    except Exception as e:
+        print(f"시퀀스 팩 생성 실패: {e}")
+    
+    library_index.upsert_sequence(os.path.join(project_folder, 'library'), sequence_name)
+    return meta_data
+
 @app.route('/api/projects/<project_name>/upload/image', methods=['POST'])
 @auth_required('editor')
 def upload_image(project_name):
@@ -1955,36 +2309,9 @@ def upload_image(project_name):
                 print(f"파일이 이미 존재함: {file_path}")
                 continue
                 
-            file.save(file_path)
+            save_uploaded_file(file, file_path)
             print(f"파일 저장 완료: {file_path}")
-            
-            # TGA 파일인 경우 PNG로 변환
-            if filename.lower().endswith('.tga'):
-                try:
-                    png_filename = filename.replace('.tga', '.png')
-                    png_path = os.path.join(images_path, png_filename)
-                    print(f"TGA를 PNG로 변환 중: {file_path} -> {png_path}")
-                    
-                    with Image.open(file_path) as img:
-                        if img.mode != 'RGBA':
-                            img = img.convert('RGBA')
-                        img.save(png_path, 'PNG')
-                    
-                    # 원본 TGA 파일 삭제
-                    os.remove(file_path)
-                    filename = png_filename
-                    file_path = png_path
-                    print(f"TGA -> PNG 변환 완료: {filename}")
-                except Exception as e:
-                    print(f"TGA 변환 실패: {e}")
-                    import traceback
-                    print(traceback.format_exc())
-            
-            # 썸네일 생성
-            thumb_path = get_thumbnail_path(project_name, filename, current_user.id)
-            print(f"썸네일 경로: {thumb_path}")
-            create_thumbnail(file_path, thumb_path)
-            
+            filename = ingest_library_image(project_name, current_user.id, images_path, filename)
             uploaded_files.append(filename)
             print(f"업로드된 파일 목록에 추가: {filename}")
             
@@ -2125,6 +2452,12 @@ def process_sequence_images(image_files, output_dir, sequence_name, options=None
     with open(meta_path, 'w', encoding='utf-8') as f:
         json.dump(meta, f, ensure_ascii=False, indent=2)
     
+    # 시퀀스 팩 생성 (meta.json에 팩 정보가 추가됨)
+    if sprite_path:
+        pack_info = build_sequence_pack(output_dir)
+        if pack_info:
+            meta['pack'] = pack_info
+    
     print(f"Sequence '{sequence_name}' processing completed!")
     return processed_files, sprite_path, meta
 
@@ -2151,8 +2484,9 @@ def upload_sequence(project_name):
             return jsonify({'error': '파일이 너무 큽니다 (최대 50MB).'}), 400
 
         project_folder = get_project_folder(project_name, current_user.id)
-        sequences_path = os.path.join(project_folder, 'library', 'sequences')
-        sequence_folder = os.path.join(sequences_path, sequence_name)
+        sequence_name, sequence_folder = resolve_sequence_folder(project_folder, sequence_name)
+        if not sequence_name:
+            return jsonify({'error': '올바른 시퀀스 이름이 필요합니다.'}), 400
         
         # 기존 시퀀스가 있으면 삭제
         if os.path.exists(sequence_folder):
@@ -2172,6 +2506,14 @@ def upload_sequence(project_name):
         thumb_path = get_sequence_thumbnail_path(project_name, sequence_name, current_user.id)
         create_sequence_thumbnail(sprite_path, thumb_path, 150)
         
+        # 시퀀스 팩 생성 (실패해도 스프라이트로 재생 가능하므로 계속 진행)
+        try:
+            build_sequence_pack(sequence_folder)
+        except Exception as e:
+            print(f"시퀀스 팩 생성 실패: {e}")
+        
+        library_index.upsert_sequence(os.path.join(project_folder, 'library'), sequence_name)
+        
         return jsonify({
             'message': '시퀀스가 업로드되었습니다.',
             'sequence_name': sequence_name
@@ -2229,39 +2571,8 @@ def upload_user_image(username, project_name):
             if os.path.exists(file_path) and not overwrite:
                 continue
                 
-            file.save(file_path)
-            
-            # TGA 파일인 경우 PNG로 변환
-            if filename.lower().endswith('.tga'):
-                try:
-                    png_filename = filename.replace('.tga', '.png')
-                    png_path = os.path.join(images_path, png_filename)
-                    print(f"TGA를 PNG로 변환 중: {file_path} -> {png_path}")
-                    
-                    with Image.open(file_path) as img:
-                        print(f"TGA 이미지 정보: 모드={img.mode}, 크기={img.size}")
-                        if img.mode != 'RGBA':
-                            img = img.convert('RGBA')
-                            print(f"RGBA로 변환 완료: {img.mode}")
-                        img.save(png_path, 'PNG')
-                        print(f"PNG 저장 완료: {png_path}")
-                    
-                    # 원본 TGA 파일 삭제
-                    os.remove(file_path)
-                    filename = png_filename
-                    file_path = png_path
-                    print(f"TGA -> PNG 변환 완료: {filename}")
-                except Exception as e:
-                    print(f"TGA 변환 실패: {e}")
-                    import traceback
-                    print(traceback.format_exc())
-                    # 변환 실패 시 원본 TGA 파일 유지
-                    print(f"변환 실패로 원본 TGA 파일 유지: {filename}")
-            
-            # 썸네일 생성
-            thumb_path = get_thumbnail_path(project_name, filename, user.id)
-            create_thumbnail(file_path, thumb_path)
-            
+            save_uploaded_file(file, file_path)
+            filename = ingest_library_image(project_name, user.id, images_path, filename)
             uploaded_files.append(filename)
             
         print(f"최종 업로드된 파일 목록: {uploaded_files}")
@@ -2312,7 +2623,9 @@ def upload_user_sequence(username, project_name):
             return jsonify({'error': 'Permission denied'}), 403
 
         project_folder = get_project_folder(project_name, user.id)
-        sequence_folder = os.path.join(project_folder, 'library', 'sequences', sequence_name)
+        sequence_name, sequence_folder = resolve_sequence_folder(project_folder, sequence_name)
+        if not sequence_name:
+            return jsonify({'error': '올바른 시퀀스 이름이 필요합니다.'}), 400
         
         # 폴더가 이미 존재하면 삭제
         if os.path.exists(sequence_folder):
@@ -2334,13 +2647,7 @@ def upload_user_sequence(username, project_name):
         except Exception as e:
             return jsonify({'error': f'메타 파일 읽기 실패: {str(e)}'}), 400
 
-        # 썸네일 생성
-        try:
-            thumb_path = get_sequence_thumbnail_path(project_name, sequence_name, user.id)
-            create_sequence_thumbnail(sprite_path, thumb_path, meta_data.get('frame_width', 150))
-        except Exception as e:
-            print(f"썸네일 생성 실패: {e}")
-            # 썸네일 생성 실패는 치명적이지 않으므로 계속 진행
+        meta_data = ingest_sequence(project_name, user.id, sequence_name, meta_data)
 
         return jsonify({
             'message': '시퀀스가 업로드되었습니다.',
@@ -2353,6 +2660,308 @@ def upload_user_sequence(username, project_name):
         print(traceback.format_exc())
         return jsonify({'error': str(e)}), 500
 
+# 재개 가능한 분할 업로드 (init / PUT chunk / finalize)
+def upload_session_response(session, status=200):
+    return jsonify({
+        'upload_id': session['upload_id'],
+        'kind': session['target']['kind'],
+        'total_size': session['total_size'],
+        'received': session['received'],
+        'chunk_size': session['chunk_size']
+    }), status
+
+def upload_error_response(e, upload_id=None):
+    body = {'error': e.message}
+    # offset 불일치 시 클라이언트가 이어서 보낼 위치 안내
+    if e.status == 409 and upload_id:
+        try:
+            body['received'] = chunked_upload_manager.get_session(upload_id)['received']
+        except UploadError:
+            pass
+    return jsonify(body), e.status
+
+def create_chunked_upload(project_name, owner, project, current_user):
+    """분할 업로드 세션 생성 (kind: image | sequence)"""
+    data = request.get_json() or {}
+    kind = data.get('kind', 'image')
+    try:
+        total_size = int(data.get('total_size', 0))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid total_size'}), 400
+    
+    target = {'kind': kind, 'project_name': project_name, 'project_id': project.id, 'owner_id': owner.id}
+    if kind == 'image':
+        filename = safe_unicode_filename(data.get('filename', ''))
+        if not filename or not allowed_image_file(filename):
+            return jsonify({'error': '허용되지 않는 파일 형식입니다.'}), 400
+        overwrite = bool(data.get('overwrite', False))
+        images_path = os.path.join(get_project_folder(project_name, owner.id), 'library', 'images')
+        if os.path.exists(os.path.join(images_path, filename)) and not overwrite:
+            return jsonify({'error': f'파일이 이미 존재합니다: {filename}'}), 409
+        target.update({'filename': filename, 'overwrite': overwrite})
+    elif kind == 'sequence':
+        sequence_name, _ = resolve_sequence_folder(get_project_folder(project_name, owner.id), data.get('sequence_name', ''))
+        meta = data.get('meta')
+        if not sequence_name:
+            return jsonify({'error': '올바른 시퀀스 이름이 필요합니다.'}), 400
+        if not isinstance(meta, dict):
+            return jsonify({'error': '메타 데이터가 필요합니다.'}), 400
+        target.update({'sequence_name': sequence_name, 'meta': meta})
+    else:
+        return jsonify({'error': f'Unsupported upload kind: {kind}'}), 400
+    
+    try:
+        session = chunked_upload_manager.create_session(current_user.id, total_size, target)
+    except UploadError as e:
+        return upload_error_response(e)
+    return upload_session_response(session, 201)
+
+@app.route('/api/projects/<project_name>/uploads', methods=['POST'])
+@auth_required('editor')
+def init_chunked_upload(project_name):
+    try:
+        current_user = get_current_user_from_token()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        # 프로젝트 조회
+        project = get_project_by_name(project_name, current_user.id)
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
+        
+        # 프로젝트 접근 권한 확인
+        if not check_project_permission(current_user.id, project.id, 'editor'):
+            return jsonify({'error': 'Permission denied'}), 403
+        
+        return create_chunked_upload(project_name, current_user, project, current_user)
+    except Exception as e:
+        print(f"분할 업로드 생성 오류: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/users/<username>/projects/<project_name>/uploads', methods=['POST'])
+@auth_required('editor')
+def init_user_chunked_upload(username, project_name):
+    try:
+        current_user = get_current_user_from_token()
+        if not current_user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        # 사용자 조회
+        user = get_user_by_name(username)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        # 프로젝트 조회
+        project = get_project_by_name(project_name, user.id)
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
+        
+        # 프로젝트 접근 권한 확인
+        if not check_project_permission(current_user.id, project.id, 'editor'):
+            return jsonify({'error': 'Permission denied'}), 403
+        
+        return create_chunked_upload(project_name, user, project, current_user)
+    except Exception as e:
+        print(f"분할 업로드 생성 오류: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_chunked_upload(upload_id):
+    """업로드 상태 조회 (재개 시 received 부터 이어서 전송)"""
+    current_user = get_current_user_from_token()
+    if not current_user:
+        return jsonify({'error': 'Authentication required'}), 401
+    try:
+        session = chunked_upload_manager.get_session(upload_id)
+        if session['user_id'] != current_user.id:
+            return jsonify({'error': 'Permission denied'}), 403
+        return upload_session_response(session)
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.route('/api/uploads/<upload_id>', methods=['PUT'])
+@jwt_required()
+def put_chunked_upload(upload_id):
+    """청크 전송 (Content-Range: bytes <start>-<end>/<total> 또는 ?offset=<start>)"""
+    current_user = get_current_user_from_token()
+    if not current_user:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    offset = request.args.get('offset')
+    content_range = request.headers.get('Content-Range')
+    if content_range:
+        match = re.match(r'bytes (\d+)-(\d+)/(\d+|\*)', content_range)
+        if not match:
+            return jsonify({'error': 'Invalid Content-Range header'}), 400
+        offset = match.group(1)
+    if offset is None:
+        return jsonify({'error': 'Content-Range header or offset parameter is required'}), 400
+    
+    try:
+        session = chunked_upload_manager.write_chunk(
+            upload_id, current_user.id, int(offset), request.stream,
+            length=request.content_length,
+            chunk_sha256=request.headers.get('X-Chunk-SHA256')
+        )
+        return upload_session_response(session)
+    except ValueError:
+        return jsonify({'error': 'Invalid offset'}), 400
+    except UploadError as e:
+        return upload_error_response(e, upload_id)
+
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+@jwt_required()
+def abort_chunked_upload(upload_id):
+    current_user = get_current_user_from_token()
+    if not current_user:
+        return jsonify({'error': 'Authentication required'}), 401
+    try:
+        session = chunked_upload_manager.get_session(upload_id)
+        if session['user_id'] != current_user.id:
+            return jsonify({'error': 'Permission denied'}), 403
+        chunked_upload_manager.discard(upload_id)
+        return jsonify({'message': '업로드가 취소되었습니다.'})
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.route('/api/uploads/<upload_id>/finalize', methods=['POST'])
+@jwt_required()
+def finalize_chunked_upload(upload_id):
+    """업로드 완료 처리 후 기존 이미지/시퀀스 처리 로직으로 전달"""
+    current_user = get_current_user_from_token()
+    if not current_user:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        session = chunked_upload_manager.finalize(upload_id, current_user.id, data.get('sha256'))
+    except UploadError as e:
+        return upload_error_response(e, upload_id)
+    
+    target = session['target']
+    if not check_project_permission(current_user.id, target['project_id'], 'editor'):
+        return jsonify({'error': 'Permission denied'}), 403
+    
+    try:
+        # 완성된 파일이 이미지인지 확인
+        try:
+            with Image.open(session['data_path']) as img:
+                img.verify()
+        except Exception as e:
+            chunked_upload_manager.discard(upload_id)
+            return jsonify({'error': f'이미지 파일이 아닙니다: {str(e)}'}), 400
+        
+        project_name = target['project_name']
+        owner_id = target['owner_id']
+        project_folder = get_project_folder(project_name, owner_id)
+        
+        if target['kind'] == 'image':
+            images_path = os.path.join(project_folder, 'library', 'images')
+            os.makedirs(images_path, exist_ok=True)
+            filename = target['filename']
+            file_path = os.path.join(images_path, filename)
+            if os.path.exists(file_path) and not target.get('overwrite'):
+                return jsonify({'error': f'파일이 이미 존재합니다: {filename}'}), 409
+            
+            # 업로드 폴더가 다른 파일 시스템이면 move 가 복사가 되므로 임시 이름으로 옮긴 뒤 교체
+            shutil.move(session['data_path'], file_path + '.tmp')
+            os.replace(file_path + '.tmp', file_path)
+            filename = ingest_library_image(project_name, owner_id, images_path, filename)
+            chunked_upload_manager.discard(upload_id)
+            return jsonify({
+                'message': '이미지가 업로드되었습니다.',
+                'files': [filename],
+                'sha256': session['sha256']
+            })
+        
+        sequence_name, sequence_folder = resolve_sequence_folder(project_folder, target['sequence_name'])
+        if not sequence_name:
+            chunked_upload_manager.discard(upload_id)
+            return jsonify({'error': '올바른 시퀀스 이름이 필요합니다.'}), 400
+        
+        # 폴더가 이미 존재하면 삭제
+        if os.path.exists(sequence_folder):
+            shutil.rmtree(sequence_folder)
+        os.makedirs(sequence_folder, exist_ok=True)
+        
+        shutil.move(session['data_path'], os.path.join(sequence_folder, 'sprite.png'))
+        meta_data = target['meta']
+        with open(os.path.join(sequence_folder, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta_data, f, ensure_ascii=False, indent=2)
+        
+        meta_data = ingest_sequence(project_name, owner_id, sequence_name, meta_data)
+        chunked_upload_manager.discard(upload_id)
+        return jsonify({
+            'message': '시퀀스가 업로드되었습니다.',
+            'sequence_name': sequence_name,
+            'meta': meta_data,
+            'sha256': session['sha256']
+        })
+    except Exception as e:
+        print(f"분할 업로드 완료 처리 오류: {str(e)}")
+        import traceback
+        print(traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+
+def library_listing_response(library_path, kind):
+    """라이브러리 인덱스 기반 목록 응답 (q, offset, limit, detail 쿼리 파라미터 지원)"""
+    query = request.args.get('q')
+    detail = request.args.get('detail', 'false').lower() == 'true'
+    try:
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = request.args.get('limit')
+        limit = max(int(limit), 0) if limit is not None else None
+    except ValueError:
+        return jsonify({'error': 'Invalid offset or limit parameter'}), 400
+    
+    if kind == 'images':
+        entries, total = library_index.list_images(library_path, query, offset, limit)
+    else:
+        entries, total = library_index.list_sequences(library_path, query, offset, limit)
+    
+    if detail:
+        response = jsonify({'items': entries, 'total': total, 'offset': offset, 'limit': limit})
+    elif kind == 'images':
+        # 기존 응답 형식 유지 (파일명 목록)
+        response = jsonify([entry['name'] for entry in entries])
+    else:
+        response = jsonify(entries)
+    response.headers['X-Total-Count'] = str(total)
+    return response
+
+def load_asset_reference_rows(project_ids):
+    """에셋 참조 인덱스 로딩용 오브젝트 조회 (한 번의 쿼리)"""
+    return db.session.query(
+        Object.id, Object.scene_id, Scene.project_id, Object.type, Object.properties
+    ).join(Scene, Object.scene_id == Scene.id).filter(Scene.project_id.in_(project_ids)).all()
+
+def library_asset_usages(project, kind=None, name=None):
+    """프로젝트 라이브러리 에셋의 사용처 (같은 소유자의 모든 프로젝트 기준)"""
+    project_ids = [project_id for (project_id,) in db.session.query(Project.id).filter_by(user_id=project.user_id)]
+    asset_references.ensure_loaded(project_ids, load_asset_reference_rows)
+    return asset_references.usages(project_ids, project.name, kind, name)
+
+def asset_in_use_response(project, kind, name):
+    """사용 중인 에셋 삭제 시 409 응답 (?force=true 이면 그대로 삭제)"""
+    if request.args.get('force', 'false').lower() == 'true':
+        return None
+    usages = library_asset_usages(project, kind, name)['images' if kind == 'image' else 'sequences'].get(name)
+    if not usages:
+        return None
+    label = '이미지' if kind == 'image' else '시퀀스'
+    return jsonify({
+        'error': f'사용 중인 {label}입니다. ({len(usages)}개 오브젝트에서 사용 중)',
+        'references': usages
+    }), 409
+
+def library_references_response(project):
+    """라이브러리 에셋별 사용처 응답 (kind, name 쿼리 파라미터로 필터)"""
+    kind = request.args.get('kind')
+    if kind not in (None, 'image', 'sequence'):
+        return jsonify({'error': 'kind must be image or sequence'}), 400
+    return jsonify(library_asset_usages(project, kind, request.args.get('name')))
+
 @app.route('/api/projects/<project_name>/library/images', methods=['GET'])
 @auth_required('viewer')
 def list_project_images(project_name):
@@ -2365,16 +2974,7 @@ def list_project_images(project_name):
     if not check_project_permission(current_user.id, project.id, 'viewer'):
         return jsonify({'error': 'Permission denied'}), 403
     project_folder = get_project_folder(project_name, current_user.id)
-    images_path = os.path.join(project_folder, 'library', 'images')
-    print(f"이미지 라이브러리 경로: {images_path}")
-    
-    if not os.path.exists(images_path):
-        print(f"이미지 라이브러리 경로가 존재하지 않음: {images_path}")
-        return jsonify([])
-    
-    files = [f for f in os.listdir(images_path) if os.path.isfile(os.path.join(images_path, f))]
-    print(f"발견된 이미지 파일들: {files}")
-    return jsonify(files)
+    return library_listing_response(os.path.join(project_folder, 'library'), 'images')
 
 @app.route('/api/projects/<project_name>/library/sequences', methods=['GET'])
 @auth_required('viewer')
@@ -2388,239 +2988,111 @@ def list_project_sequences(project_name):
     if not check_project_permission(current_user.id, project.id, 'viewer'):
         return jsonify({'error': 'Permission denied'}), 403
     project_folder = get_project_folder(project_name, current_user.id)
-    sequences_path = os.path.join(project_folder, 'library', 'sequences')
-    if not os.path.exists(sequences_path):
-        return jsonify([])
-    sequence_folders = [d for d in os.listdir(sequences_path) if os.path.isdir(os.path.join(sequences_path, d))]
-    result = []
-    for seq in sequence_folders:
-        seq_path = os.path.join(sequences_path, seq)
-        frames = [f for f in os.listdir(seq_path) if os.path.isfile(os.path.join(seq_path, f))]
-        frames.sort()
-        result.append({'name': seq, 'frames': frames})
-    return jsonify(result)
+    return library_listing_response(os.path.join(project_folder, 'library'), 'sequences')
 
-@app.route('/projects/<project_name>/library/images/<path:filename>')
-def serve_project_image(project_name, filename):
-    # URL 디코딩
-    decoded_filename = unquote(filename)
-    
-    # URL 파라미터에서 사용자 ID 가져오기
-    user_id = request.args.get('user_id')
-    
-    if user_id:
-        try:
-            user_id = int(user_id)
+def resolve_asset_project_folder(project_name, user_id=None, username=None):
+    """에셋 서빙용 프로젝트 폴더 경로 (결과를 캐시하여 반복 요청 시 DB 조회 없음)"""
+    def lookup():
+        if username:
+            user = get_user_by_name(username)
+            if not user:
+                return None
+            project = get_project_by_name(project_name, user.id)
+        elif user_id:
             # 사용자별 프로젝트 조회
             project = get_project_by_name(project_name, user_id)
-            if not project:
-                return jsonify({'error': 'Project not found'}), 404
-            
-            # 사용자별 폴더 구조 사용
-            project_folder = get_project_folder(project_name, user_id)
-        except (ValueError, TypeError):
-            return jsonify({'error': 'Invalid user_id parameter'}), 400
+        else:
+            # 기존 방식 (하위 호환성)
+            project = Project.query.filter_by(name=project_name).first()
+        if not project:
+            return None
+        # 사용자별 라우트는 URL의 사용자, 그 외에는 프로젝트 소유자의 폴더 구조 사용
+        return get_project_folder(project_name, user.id if username else project.user_id)
+    
+    return asset_server.resolve_folder((project_name, user_id, username), lookup)
+
+def send_library_image(images_path, filename):
+    """라이브러리 이미지 전송 (Accept 헤더에 맞는 WebP/AVIF 변형 우선)"""
+    accepted = accepted_variants(request.headers.get('Accept', ''))
+    variant = asset_server.lookup(('variant', images_path, filename, accepted), os.path.join(images_path, filename),
+                                  lambda: select_variant(images_path, filename, accepted))
+    if variant:
+        variants_path, variant_filename, mimetype = variant
+        response = asset_server.send(variants_path, variant_filename, mimetype=mimetype,
+                                     version_path=os.path.join(images_path, filename))
     else:
-        # 기존 방식 (하위 호환성)
-        project = Project.query.filter_by(name=project_name).first()
-    if not project:
+        response = asset_server.send(images_path, filename)
+    if not isinstance(response, tuple):
+        response.headers['Vary'] = 'Accept'
+    return response
+
+def serve_library_asset(project_folder, subfolder, filename):
+    """library 하위 폴더의 에셋 전송 (이미지는 변형 선택 포함)"""
+    if not project_folder:
         return jsonify({'error': 'Project not found'}), 404
     
-    # 프로젝트 소유자의 폴더 구조 사용
-    project_folder = get_project_folder(project_name, project.user_id)
-    
-    images_path = os.path.join(project_folder, 'library', 'images')
-    
-    # 파일이 존재하는지 확인
-    file_path = os.path.join(images_path, decoded_filename)
-    if not os.path.exists(file_path):
-        return jsonify({'error': 'File not found'}), 404
+    directory = os.path.join(project_folder, 'library', subfolder)
+    if subfolder == 'images':
+        return send_library_image(directory, filename)
+    return asset_server.send(directory, filename)
+
+def get_asset_user_id_param():
+    """URL 파라미터에서 사용자 ID 가져오기 (없으면 None, 잘못된 값이면 ValueError)"""
+    user_id = request.args.get('user_id')
+    return int(user_id) if user_id else None
+
+@app.route('/projects/<project_name>/library/images/<path:filename>')
+def serve_project_image(project_name, filename):
+    try:
+        user_id = get_asset_user_id_param()
+    except ValueError:
+        return jsonify({'error': 'Invalid user_id parameter'}), 400
     
-    return send_from_directory(images_path, decoded_filename)
+    project_folder = resolve_asset_project_folder(project_name, user_id=user_id)
+    return serve_library_asset(project_folder, 'images', unquote(filename))
 
 @app.route('/projects/<project_name>/library/sequences/<path:sequence_and_filename>')
 def serve_project_sequence_frame(project_name, sequence_and_filename):
     # sequence_and_filename: '시퀀스명/프레임파일명.png'
-    decoded_path = unquote(sequence_and_filename)
-    
-    # 프로젝트 정보를 가져와서 소유자 ID 확인
-    project = Project.query.filter_by(name=project_name).first()
-    if not project:
-        return jsonify({'error': 'Project not found'}), 404
-    
-    # 프로젝트 소유자의 폴더 구조 사용
-    project_folder = get_project_folder(project_name, project.user_id)
-    sequences_path = os.path.join(project_folder, 'library', 'sequences')
-    
-    # 파일이 존재하는지 확인
-    file_path = os.path.join(sequences_path, decoded_path)
-    if not os.path.exists(file_path):
-        return jsonify({'error': 'File not found'}), 404
-    
-    return send_from_directory(sequences_path, decoded_path)
+    project_folder = resolve_asset_project_folder(project_name)
+    return serve_library_asset(project_folder, 'sequences', unquote(sequence_and_filename))
 
 @app.route('/projects/<project_name>/library/thumbnails/<path:filename>')
 def serve_project_thumbnail(project_name, filename):
-    # URL 디코딩
-    decoded_filename = unquote(filename)
-    
-    # URL 파라미터에서 사용자 ID 가져오기
-    user_id = request.args.get('user_id')
+    try:
+        user_id = get_asset_user_id_param()
+    except ValueError:
+        return jsonify({'error': 'Invalid user_id parameter'}), 400
     
-    if user_id:
-        try:
-            user_id = int(user_id)
-            # 사용자별 프로젝트 조회
-            project = get_project_by_name(project_name, user_id)
-            if not project:
-                return jsonify({'error': 'Project not found'}), 404
-            
-            # 사용자별 폴더 구조 사용
-            project_folder = get_project_folder(project_name, user_id)
-        except (ValueError, TypeError):
-            return jsonify({'error': 'Invalid user_id parameter'}), 400
-        else:
-        # 기존 방식 (하위 호환성)
-            project = Project.query.filter_by(name=project_name).first()
-        if not project:
-            return jsonify({'error': 'Project not found'}), 404
-        # 프로젝트 소유자의 폴더 구조 사용
-        project_folder = get_project_folder(project_name, project.user_id)
-    
-    thumbnails_path = os.path.join(project_folder, 'library', 'thumbnails')
-    
-    # 파일이 존재하는지 확인
-    file_path = os.path.join(thumbnails_path, decoded_filename)
-    if not os.path.exists(file_path):
-        return jsonify({'error': 'File not found'}), 404
-    
-    return send_from_directory(thumbnails_path, decoded_filename)
+    project_folder = resolve_asset_project_folder(project_name, user_id=user_id)
+    return serve_library_asset(project_folder, 'thumbnails', unquote(filename))
 
 @app.route('/projects/<project_name>/library/sequence_thumbnails/<path:filename>')
 def serve_project_sequence_thumbnail(project_name, filename):
-    # URL 디코딩
-    decoded_filename = unquote(filename)
-    
-    # 프로젝트 정보를 가져와서 소유자 ID 확인
-    project = Project.query.filter_by(name=project_name).first()
-    if not project:
-        return jsonify({'error': 'Project not found'}), 404
-    
-    # 프로젝트 소유자의 폴더 구조 사용
-    project_folder = get_project_folder(project_name, project.user_id)
-    sequence_thumbnails_path = os.path.join(project_folder, 'library', 'sequence_thumbnails')
-    
-    # 파일이 존재하는지 확인
-    file_path = os.path.join(sequence_thumbnails_path, decoded_filename)
-    if not os.path.exists(file_path):
-        return jsonify({'error': 'File not found'}), 404
-    
-    return send_from_directory(sequence_thumbnails_path, decoded_filename)
+    project_folder = resolve_asset_project_folder(project_name)
+    return serve_library_asset(project_folder, 'sequence_thumbnails', unquote(filename))
 
 # 사용자별 파일 서빙 라우트들
 @app.route('/users/<username>/projects/<project_name>/library/images/<path:filename>')
 def serve_user_project_image(username, project_name, filename):
-    # URL 디코딩
-    decoded_filename = unquote(filename)
-    
-    # 사용자 조회
-    user = get_user_by_name(username)
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    # 프로젝트 조회
-    project = get_project_by_name(project_name, user.id)
-    if not project:
-        return jsonify({'error': 'Project not found'}), 404
-    
-    # 사용자별 폴더 구조 사용
-    project_folder = get_project_folder(project_name, user.id)
-    images_path = os.path.join(project_folder, 'library', 'images')
-    
-    # 파일이 존재하는지 확인
-    file_path = os.path.join(images_path, decoded_filename)
-    if not os.path.exists(file_path):
-        return jsonify({'error': 'File not found'}), 404
-    
-    return send_from_directory(images_path, decoded_filename)
+    project_folder = resolve_asset_project_folder(project_name, username=username)
+    return serve_library_asset(project_folder, 'images', unquote(filename))
 
 @app.route('/users/<username>/projects/<project_name>/library/sequences/<path:sequence_and_filename>')
 def serve_user_project_sequence_frame(username, project_name, sequence_and_filename):
     # sequence_and_filename: '시퀀스명/프레임파일명.png'
-    decoded_path = unquote(sequence_and_filename)
-    
-    # 사용자 조회
-    user = get_user_by_name(username)
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    # 프로젝트 조회
-    project = get_project_by_name(project_name, user.id)
-    if not project:
-        return jsonify({'error': 'Project not found'}), 404
-    
-    # 사용자별 폴더 구조 사용
-    project_folder = get_project_folder(project_name, user.id)
-    sequences_path = os.path.join(project_folder, 'library', 'sequences')
-    
-    # 파일이 존재하는지 확인
-    file_path = os.path.join(sequences_path, decoded_path)
-    if not os.path.exists(file_path):
-        return jsonify({'error': 'File not found'}), 404
-    
-    return send_from_directory(sequences_path, decoded_path)
+    project_folder = resolve_asset_project_folder(project_name, username=username)
+    return serve_library_asset(project_folder, 'sequences', unquote(sequence_and_filename))
 
 @app.route('/users/<username>/projects/<project_name>/library/thumbnails/<path:filename>')
 def serve_user_project_thumbnail(username, project_name, filename):
-    # URL 디코딩
-    decoded_filename = unquote(filename)
-    
-    # 사용자 조회
-    user = get_user_by_name(username)
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    # 프로젝트 조회
-    project = get_project_by_name(project_name, user.id)
-    if not project:
-        return jsonify({'error': 'Project not found'}), 404
-    
-    # 사용자별 폴더 구조 사용
-    project_folder = get_project_folder(project_name, user.id)
-    thumbnails_path = os.path.join(project_folder, 'library', 'thumbnails')
-    
-    # 파일이 존재하는지 확인
-    file_path = os.path.join(thumbnails_path, decoded_filename)
-    if not os.path.exists(file_path):
-        return jsonify({'error': 'File not found'}), 404
-    
-    return send_from_directory(thumbnails_path, decoded_filename)
+    project_folder = resolve_asset_project_folder(project_name, username=username)
+    return serve_library_asset(project_folder, 'thumbnails', unquote(filename))
 
 @app.route('/users/<username>/projects/<project_name>/library/sequence_thumbnails/<path:filename>')
 def serve_user_project_sequence_thumbnail(username, project_name, filename):
-    # URL 디코딩
-    decoded_filename = unquote(filename)
-    
-    # 사용자 조회
-    user = get_user_by_name(username)
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    # 프로젝트 조회
-    project = get_project_by_name(project_name, user.id)
-    if not project:
-        return jsonify({'error': 'Project not found'}), 404
-    
-    # 사용자별 폴더 구조 사용
-    project_folder = get_project_folder(project_name, user.id)
-    sequence_thumbnails_path = os.path.join(project_folder, 'library', 'sequence_thumbnails')
-    
-    # 파일이 존재하는지 확인
-    file_path = os.path.join(sequence_thumbnails_path, decoded_filename)
-    if not os.path.exists(file_path):
-        return jsonify({'error': 'File not found'}), 404
-    
-    return send_from_directory(sequence_thumbnails_path, decoded_filename)
+    project_folder = resolve_asset_project_folder(project_name, username=username)
+    return serve_library_asset(project_folder, 'sequence_thumbnails', unquote(filename))
 
 @app.route('/api/projects/<project_name>/library/images/<filename>', methods=['DELETE'])
 @auth_required('editor')
@@ -2634,7 +3106,12 @@ def delete_project_image(project_name, filename):
     images_path = os.path.join(project_folder, 'library', 'images')
     file_path = os.path.join(images_path, decoded_filename)
     if os.path.exists(file_path):
+        in_use = asset_in_use_response(project, 'image', decoded_filename)
+        if in_use:
+            return in_use
         os.remove(file_path)
+        remove_variants(images_path, decoded_filename)
+        library_index.remove_image(os.path.join(project_folder, 'library'), decoded_filename)
         return jsonify({'message': 'Deleted'}), 200
     else:
         return jsonify({'error': 'File not found'}), 404
@@ -2650,7 +3127,11 @@ def delete_project_sequence(project_name, sequence_name):
     sequences_path = os.path.join(project_folder, 'library', 'sequences')
     sequence_folder = os.path.join(sequences_path, sequence_name)
     if os.path.exists(sequence_folder):
+        in_use = asset_in_use_response(project, 'sequence', sequence_name)
+        if in_use:
+            return in_use
         shutil.rmtree(sequence_folder)
+        library_index.remove_sequence(os.path.join(project_folder, 'library'), sequence_name)
         return jsonify({'message': 'Sequence deleted'}), 200
     else:
         return jsonify({'error': 'Sequence not found'}), 404
@@ -2676,11 +3157,7 @@ def list_user_project_images(username, project_name):
         return jsonify({'error': 'Permission denied'}), 403
     
     project_folder = get_project_folder(project_name, user.id)
-    images_path = os.path.join(project_folder, 'library', 'images')
-    if not os.path.exists(images_path):
-        return jsonify([])
-    files = [f for f in os.listdir(images_path) if os.path.isfile(os.path.join(images_path, f))]
-    return jsonify(files)
+    return library_listing_response(os.path.join(project_folder, 'library'), 'images')
 
 @app.route('/api/users/<username>/projects/<project_name>/library/sequences', methods=['GET'])
 @auth_required('viewer')
@@ -2702,17 +3179,7 @@ def list_user_project_sequences(username, project_name):
         return jsonify({'error': 'Permission denied'}), 403
     
     project_folder = get_project_folder(project_name, user.id)
-    sequences_path = os.path.join(project_folder, 'library', 'sequences')
-    if not os.path.exists(sequences_path):
-        return jsonify([])
-    sequence_folders = [d for d in os.listdir(sequences_path) if os.path.isdir(os.path.join(sequences_path, d))]
-    result = []
-    for seq in sequence_folders:
-        seq_path = os.path.join(sequences_path, seq)
-        frames = [f for f in os.listdir(seq_path) if os.path.isfile(os.path.join(seq_path, f))]
-        frames.sort()
-        result.append({'name': seq, 'frames': frames})
-    return jsonify(result)
+    return library_listing_response(os.path.join(project_folder, 'library'), 'sequences')
 
 @app.route('/api/users/<username>/projects/<project_name>/library/images/<filename>', methods=['DELETE'])
 @auth_required('editor')
@@ -2738,7 +3205,12 @@ def delete_user_project_image(username, project_name, filename):
     images_path = os.path.join(project_folder, 'library', 'images')
     file_path = os.path.join(images_path, decoded_filename)
     if os.path.exists(file_path):
+        in_use = asset_in_use_response(project, 'image', decoded_filename)
+        if in_use:
+            return in_use
         os.remove(file_path)
+        remove_variants(images_path, decoded_filename)
+        library_index.remove_image(os.path.join(project_folder, 'library'), decoded_filename)
         return jsonify({'message': 'Deleted'}), 200
     else:
         return jsonify({'error': 'File not found'}), 404
@@ -2766,15 +3238,99 @@ def delete_user_project_sequence(username, project_name, sequence_name):
     sequences_path = os.path.join(project_folder, 'library', 'sequences')
     sequence_folder = os.path.join(sequences_path, sequence_name)
     if os.path.exists(sequence_folder):
+        in_use = asset_in_use_response(project, 'sequence', sequence_name)
+        if in_use:
+            return in_use
         shutil.rmtree(sequence_folder)
+        library_index.remove_sequence(os.path.join(project_folder, 'library'), sequence_name)
         return jsonify({'message': 'Sequence deleted'}), 200
     else:
         return jsonify({'error': 'Sequence not found'}), 404
 
+@app.route('/api/projects/<project_name>/library/index/rebuild', methods=['POST'])
+@auth_required('editor')
+def rebuild_project_library_index(project_name):
+    """라이브러리 인덱스 재생성"""
+    current_user = get_current_user_from_token()
+    project = get_project_by_name(project_name, current_user.id)
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    # 프로젝트 접근 권한 확인
+    if not check_project_permission(current_user.id, project.id, 'editor'):
+        return jsonify({'error': 'Permission denied'}), 403
+    project_folder = get_project_folder(project_name, current_user.id)
+    data = library_index.rebuild(os.path.join(project_folder, 'library'))
+    return jsonify({
+        'message': '라이브러리 인덱스가 재생성되었습니다.',
+        'images': len(data['images']),
+        'sequences': len(data['sequences'])
+    })
+
+@app.route('/api/users/<username>/projects/<project_name>/library/index/rebuild', methods=['POST'])
+@auth_required('editor')
+def rebuild_user_project_library_index(username, project_name):
+    """사용자별 라이브러리 인덱스 재생성"""
+    current_user = get_current_user_from_token()
+    
+    # 사용자 조회
+    user = get_user_by_name(username)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # 프로젝트 조회
+    project = get_project_by_name(project_name, user.id)
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    # 프로젝트 접근 권한 확인
+    if not check_project_permission(current_user.id, project.id, 'editor'):
+        return jsonify({'error': 'Permission denied'}), 403
+    
+    project_folder = get_project_folder(project_name, user.id)
+    data = library_index.rebuild(os.path.join(project_folder, 'library'))
+    return jsonify({
+        'message': '라이브러리 인덱스가 재생성되었습니다.',
+        'images': len(data['images']),
+        'sequences': len(data['sequences'])
+    })
+
+@app.route('/api/projects/<project_name>/library/references', methods=['GET'])
+@auth_required('viewer')
+def get_project_library_references(project_name):
+    """라이브러리 에셋별 사용처 (씬/오브젝트)"""
+    current_user = get_current_user_from_token()
+    project = get_project_by_name(project_name, current_user.id)
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    return library_references_response(project)
+
+@app.route('/api/users/<username>/projects/<project_name>/library/references', methods=['GET'])
+@auth_required('viewer')
+def get_user_project_library_references(username, project_name):
+    """사용자별 라이브러리 에셋별 사용처 (씬/오브젝트)"""
+    current_user = get_current_user_from_token()
+    
+    # 사용자 조회
+    user = get_user_by_name(username)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # 프로젝트 조회
+    project = get_project_by_name(project_name, user.id)
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    # 프로젝트 접근 권한 확인
+    if not check_project_permission(current_user.id, project.id, 'viewer'):
+        return jsonify({'error': 'Permission denied'}), 403
+    
+    return library_references_response(project)
+
 @app.route('/api/preload/<project_name>')
 @auth_required('viewer')
 def preload_project(project_name):
-    """프로젝트 데이터를 미리 로드하여 캐시"""
+    """프리로드 매니페스트 (씬별 에셋 URL, 크기, 해시, 우선순위 + 씬/오브젝트 데이터)"""
     try:
         current_user = get_current_user_from_token()
         if not current_user:
@@ -2785,38 +3341,33 @@ def preload_project(project_name):
         if not project:
             return jsonify({'error': 'Project not found'}), 404
         
-        # 씬 데이터 가져오기
-        scenes = Scene.query.filter_by(project_id=project.id).all()
-        scene_data = []
+        owner_id = project.user_id
+        generations = {}
         
-        for scene in scenes:
-            objects = Object.query.filter_by(scene_id=scene.id).all()
-            object_data = []
+        manifest = preload_manifests.get(project.id, library_index.generation)
+        if manifest is None:
+            version = preload_manifests.version(project.id)
             
-            for obj in objects:
-                object_data.append({
-                    'id': obj.id,
-                    'type': obj.type,
-                    'properties': json.loads(obj.properties) if obj.properties else {}
-                })
+            # 씬 + 오브젝트를 한 번의 쿼리로 조회
+            rows = db.session.query(
+                Scene.id, Scene.name, Scene.order,
+                Object.id, Object.type, Object.properties
+            ).outerjoin(Object, Object.scene_id == Scene.id).filter(
+                Scene.project_id == project.id
+            ).order_by(Scene.order, Scene.id, Object.order, Object.id).all()
             
-            scene_data.append({
-                'id': scene.id,
-                'name': scene.name,
-                'objects': object_data
-            })
-        
-        # 프리로딩 데이터 반환
-        preload_data = {
-            'project': {
-                'id': project.id,
-                'name': project.name
-            },
-            'scenes': scene_data,
-            'timestamp': datetime.utcnow().isoformat()
-        }
+            def load_library(url_project_name):
+                library_path = os.path.join(get_project_folder(url_project_name, owner_id), 'library')
+                data = library_index.load(library_path)
+                generations[library_path] = library_index.generation(library_path)
+                return data
+            
+            manifest = preload_manifests.build({'id': project.id, 'name': project.name}, rows, load_library)
+            preload_manifests.put(project.id, version, generations, manifest)
         
-        return jsonify(preload_data)
+        response = jsonify(manifest)
+        response.set_etag(manifest['version'])
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -2909,6 +3460,7 @@ def delete_user(user_id):
         
         db.session.delete(user)
         db.session.commit()
+        asset_server.invalidate_folders()
         return jsonify({'message': '사용자가 삭제되었습니다.'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -2947,18 +3499,44 @@ def delete_project_admin(project_id):
         
         db.session.delete(project)
         db.session.commit()
+        asset_server.invalidate_folders()
         return jsonify({'message': '프로젝트가 삭제되었습니다.'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus 메트릭 (METRICS_TOKEN Bearer 토큰 또는 관리자 JWT 필요)"""
+    authorization = request.headers.get('Authorization', '')
+    if not (METRICS_TOKEN and hmac.compare_digest(authorization, f'Bearer {METRICS_TOKEN}')):
+        try:
+            verify_jwt_in_request()
+            user = User.query.get(get_jwt_identity())
+        except Exception:
+            user = None
+        if not user or user.username != 'admin':
+            return jsonify({'error': 'Unauthorized'}), 401
+    return Response(app_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# 시스템 메트릭: 프로젝트 폴더 크기는 라이브러리 스캔 캐시 사용
+# (WSGI 서버로 실행해도 수집되도록 앱을 불러올 때 샘플러 시작)
+system_metrics.configure(library_scanner.projects_dir, lambda: library_scanner.scan()['total_size'])
+system_metrics.ensure_started()
+
 @app.route('/api/admin/stats', methods=['GET'])
 @admin_required
 def get_system_stats():
-    """시스템 통계 조회 (관리자 전용)"""
+    """시스템 통계 조회 (관리자 전용)
+
+    메모리/CPU/소켓/디스크 값은 백그라운드 샘플러의 최근 샘플 (?series=N: 최근 N개 샘플 시계열, 기본 60)
+    """
     try:
-        total_users = User.query.count()
-        total_projects = Project.query.count()
-        active_users = User.query.filter_by(is_active=True).count()
+        # 사용자/활성 사용자/프로젝트 수를 한 번의 쿼리로 조회
+        total_users, active_users, total_projects = db.session.execute(select(
+            select(func.count(User.id)).scalar_subquery(),
+            select(func.count(User.id)).where(User.is_active == True).scalar_subquery(),
+            select(func.count(Project.id)).scalar_subquery()
+        )).one()
         
         # 최근 활동 (예시)
         recent_activities = [
@@ -2969,21 +3547,120 @@ def get_system_stats():
             for user in User.query.order_by(User.created_at.desc()).limit(10)
         ]
         
-        # 저장 공간 사용량 계산 (예시)
-        storage_used = "계산 중..."
+        # 저장 공간/메모리/CPU 사용량 (샘플러의 최근 샘플)
+        latest = system_metrics.latest() or {}
+        projects_bytes = latest.get('projects_bytes')
+        storage_used = format_file_size(projects_bytes) if projects_bytes is not None else '계산 중...'
+        series_limit = request.args.get('series', 60, type=int)
         
         return jsonify({
             'total_users': total_users,
             'total_projects': total_projects,
             'active_users': active_users,
             'storage_used': storage_used,
-            'memory_usage': '65%',  # 실제 구현 시 psutil 등 사용
-            'cpu_usage': '45%',     # 실제 구현 시 psutil 등 사용
-            'recent_activities': recent_activities
+            'memory_usage': format_percent(latest.get('memory_percent')),
+            'cpu_usage': format_percent(latest.get('cpu_percent')),
+            'system': {
+                'latest': latest or None,
+                'series': system_metrics.series(series_limit),
+                'sampler': system_metrics.get_stats()
+            },
+            'metrics': app_metrics.get_stats(),
+            'profiling': request_profiler.get_stats(),
+            'recent_activities': recent_activities,
+            'asset_cache': asset_server.get_stats(),
+            'asset_references': asset_references.get_stats(),
+            'library_scanner': library_scanner.get_stats(),
+            'backup_jobs': backup_jobs.get_stats()
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/admin/live-latency', methods=['GET', 'DELETE'])
+@admin_required
+def admin_live_latency():
+    """채널별 라이브 송출 지연 (p50/p95/p99) 조회 / 초기화 (관리자 전용)"""
+    if request.method == 'DELETE':
+        live_latency.reset()
+        return jsonify({'message': '라이브 지연 통계를 초기화했습니다.', 'stats': live_latency.get_stats()})
+    return jsonify(live_latency.get_stats())
+
+@app.route('/api/admin/assets/cache', methods=['GET', 'DELETE'])
+@admin_required
+def admin_asset_cache():
+    """에셋 서빙 캐시 통계 조회 / 비우기 (관리자 전용)"""
+    if request.method == 'DELETE':
+        asset_server.clear_cache()
+        return jsonify({'message': '에셋 캐시를 비웠습니다.', 'stats': asset_server.get_stats()})
+    return jsonify(asset_server.get_stats())
+
+def build_library_gc_snapshot(include_unreferenced=False):
+    """라이브러리 GC용 DB 스냅샷 (사용자, 프로젝트 폴더, 참조 중인 에셋)"""
+    users = {user_id for (user_id,) in db.session.query(User.id)}
+    projects = {}
+    owner_projects = {}
+    folders = {}
+    for project_id, name, user_id in db.session.query(Project.id, Project.name, Project.user_id):
+        slug = slugify(name)
+        # 이름이 같은 slug로 바뀌는 프로젝트는 폴더를 함께 씀
+        folder_project_id = projects.setdefault(user_id, {}).setdefault(slug, project_id)
+        folders.setdefault(folder_project_id, []).append(name)
+        owner_projects.setdefault(user_id, []).append(project_id)
+    
+    referenced = {}
+    if include_unreferenced:
+        asset_references.ensure_loaded([pid for pids in owner_projects.values() for pid in pids], load_asset_reference_rows)
+        for user_id, slugs in projects.items():
+            for folder_project_id in slugs.values():
+                names = {'image': set(), 'sequence': set()}
+                for name in folders[folder_project_id]:
+                    usages = asset_references.usages(owner_projects[user_id], name)
+                    names['image'].update(usages['images'])
+                    names['sequence'].update(usages['sequences'])
+                referenced[folder_project_id] = names
+    
+    return {'users': users, 'projects': projects, 'referenced': referenced}
+
+def is_live_project_folder(user_id, slug):
+    """폴더를 사용하는 사용자/프로젝트가 있는지 (GC 삭제 직전 재확인)"""
+    if slug is None:
+        return User.query.get(user_id) is not None
+    return any(slugify(name) == slug for (name,) in db.session.query(Project.name).filter_by(user_id=user_id))
+
+@app.route('/api/admin/library/gc', methods=['GET', 'POST', 'DELETE'])
+@admin_required
+def admin_library_gc():
+    """라이브러리 GC 상태 조회 / 시작 / 취소 (관리자 전용, 기본은 dry-run)"""
+    if request.method == 'GET':
+        return jsonify(library_gc.status())
+    
+    if request.method == 'DELETE':
+        if not library_gc.cancel():
+            return jsonify({'error': '실행 중인 GC 작업이 없습니다.'}), 404
+        return jsonify({'message': 'GC 작업 취소를 요청했습니다.'})
+    
+    data = request.get_json(silent=True) or {}
+    options = {
+        'dry_run': bool(data.get('dry_run', True)),
+        'include_unreferenced': bool(data.get('include_unreferenced', False))
+    }
+    try:
+        for key in ('ops_per_second', 'min_age'):
+            if data.get(key) is not None:
+                options[key] = max(int(data[key]), 0)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'ops_per_second and min_age must be integers'}), 400
+    
+    job = library_gc.start(
+        options,
+        lambda: build_library_gc_snapshot(options['include_unreferenced']),
+        is_live_project_folder,
+        app.app_context
+    )
+    if job is None:
+        return jsonify({'error': '이미 GC 작업이 실행 중입니다.', 'job': library_gc.status()}), 409
+    return jsonify(job), 202
+
 @app.route('/api/admin/restore', methods=['POST'])
 @admin_required
 def restore_database():
@@ -2997,50 +3674,54 @@ def restore_database():
         if file.filename == '':
             return jsonify({'error': '파일이 선택되지 않았습니다.'}), 400
         
+        # 전체 백업 ZIP (같은 URL)
+        if file.filename.endswith('.zip'):
+            return restore_backup()
+        
         if not file.filename.endswith('.sql'):
             return jsonify({'error': 'SQL 파일만 업로드 가능합니다.'}), 400
         
-        # 파일 내용 읽기
-        backup_content = file.read().decode('utf-8')
-        
         try:
             # SQLAlchemy text import 확인
             from sqlalchemy import text
             
             # 기존 데이터 삭제 (순서 중요: 외래키 제약조건 고려)
+            # 덤프가 사용자 테이블 전체(admin 계정과 비밀번호 포함)를 다시 넣으므로 admin 도 덤프 값으로 바뀜
+            # 덤프에 admin 행이 없으면 복구 후 지금의 admin 계정을 다시 넣어 관리자가 잠기지 않게 함
+            user_table = User.__table__
+            admin_row = db.session.execute(
+                user_table.select().where(user_table.c.username == 'admin')
+            ).mappings().first()
             db.session.execute(text("DELETE FROM objects;"))
             db.session.execute(text("DELETE FROM scene;"))
             db.session.execute(text("DELETE FROM project_permission;"))
             db.session.execute(text("DELETE FROM project;"))
-            db.session.execute(text("DELETE FROM user WHERE username != 'admin';"))  # admin 계정 보호
+            db.session.execute(text("DELETE FROM \"user\";"))
             
-            # SQL 문을 줄별로 분리하여 실행
-            sql_lines = backup_content.split('\n')
-            current_sql = ""
+            # 업로드를 메모리에 올리지 않고 문장 단위로 읽어 실행
+            # (리터럴 안의 :이름 이 바인드 파라미터로 해석되지 않도록 드라이버에 그대로 전달)
+            # 문장마다 SAVEPOINT 를 두고, 실패하면 건너뛰지 않고 전체 복구를 롤백
+            connection = db.session.connection()
+            for number, statement in enumerate(iter_sql_statements(io.TextIOWrapper(file.stream, encoding='utf-8')), 1):
+                try:
+                    with connection.begin_nested():
+                        # no_parameters: pyformat 드라이버(psycopg2)가 리터럴 안의 % 를 파라미터 자리로 해석하지 않도록 함
+                        connection.exec_driver_sql(statement, execution_options={'no_parameters': True})
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f"SQL 실행 실패 ({number}번째 문장): {str(e)[:200]} - SQL: {statement[:100]}")
+                    return jsonify({
+                        'error': f'{number}번째 SQL 문장을 실행하지 못해 복구를 취소했습니다: {str(e)[:200]}'
+                    }), 400
             
-            for line in sql_lines:
-                line = line.strip()
-                
-                # 주석이나 빈 줄 무시
-                if not line or line.startswith('--'):
-                    continue
-                
-                current_sql += line + " "
-                
-                # SQL 문이 완료되면 실행
-                if line.endswith(';'):
-                    try:
-                        # admin 사용자를 덮어쓰지 않도록 보호
-                        if "INSERT INTO user" in current_sql and "username = 'admin'" in current_sql:
-                            current_sql = ""
-                            continue
-                            
-                        db.session.execute(text(current_sql))
-                        current_sql = ""
-                    except Exception as e:
-                        app.logger.warning(f"SQL 실행 중 경고: {str(e)} - SQL: {current_sql[:100]}")
-                        current_sql = ""
-                        continue
+            if admin_row is not None and db.session.execute(
+                select(func.count()).select_from(user_table).where(user_table.c.username == 'admin')
+            ).scalar() == 0:
+                row = dict(admin_row)
+                if db.session.execute(select(user_table.c.id).where(user_table.c.id == row['id'])).first():
+                    del row['id']  # 덤프의 다른 사용자가 같은 id 를 쓰면 새 id 로
+                db.session.execute(user_table.insert(), row)
+                app.logger.info('덤프에 admin 계정이 없어 기존 admin 계정을 유지했습니다.')
             
             # 변경사항 커밋
             db.session.commit()
@@ -3059,158 +3740,163 @@ def restore_database():
         app.logger.error(f'복구 처리 중 오류: {str(e)}')
         return jsonify({'error': f'복구 처리 중 오류 발생: {str(e)}'}), 500
 
+def compact_table_entry(model, compression, tables):
+    """컴팩트 백업의 테이블 ZIP 항목 (arcname, 압축된 NDJSON 청크 반복자, ZIP_STORED)
+
+    행은 yield_per 로 나눠 조회하여 임시 파일에 바로 압축해 두고(ZIP 을 보내는 동안 DB 연결을 잡지 않도록),
+    기록한 행 수는 tables 에 집계
+    """
+    import zipfile
+    
+    table = model.__table__
+    key = BACKUP_DATA_KEYS[table.name]
+    info = tables[key] = {'member': table_member_name(key, compression), 'compression': compression, 'rows': 0}
+    
+    def rows():
+        result = db.session.execute(
+            table.select().order_by(*table.primary_key.columns).execution_options(yield_per=1000)
+        )
+        for row in result:
+            yield serialize_row(table, row)
+    
+    def on_row():
+        info['rows'] += 1
+    
+    columns = [column.name for column in table.columns]
+    spool = spool_table(columns, rows(), compression, on_row=on_row)
+    return info['member'], iter_spool(spool), zipfile.ZIP_STORED
+
+def prepare_backup_zip(on_progress, backup_format=COMPACT_FORMAT, compression=None):
+    """전체 백업 ZIP 항목 준비 -> (entries 반복자, on_entry 콜백)
+
+    on_progress(step, message, percentage): 진행상황 보고 (요청/백그라운드 작업 공통)
+    backup_format: compact = 테이블별 NDJSON 항목 (compression: gzip/zstd/none), json = backup_info.json 에 전체 포함
+    compact 형식의 테이블은 여기서 모두 임시 파일로 만든 뒤 세션을 닫으므로 entries 는 앱 컨텍스트 밖에서 소비해도 됨
+    """
+    compact = backup_format == COMPACT_FORMAT
+    if compact:
+        compression = resolve_compression(compression)
+    
+    # 백업 데이터 생성
+    on_progress('database', '데이터베이스 정보를 수집하고 있습니다...', 10)
+    # 라이브러리 폴더는 한 번만 스캔하여 백업 정보와 ZIP 파일 목록에 함께 사용
+    scan = library_scanner.scan(use_cache=False)
+    backup_data = create_backup_data(scan, include_database=not compact)
+    on_progress('database', '데이터베이스 정보 수집 완료', 30)
+    
+    # 라이브러리 파일 정보도 백업 데이터에 포함
+    print(f"🔍 백업 데이터의 라이브러리 파일 정보:")
+    if 'libraries_files' in backup_data:
+        for project_name, project_files in backup_data['libraries_files'].items():
+            print(f"  - 프로젝트 '{project_name}':")
+            for file_type, files in project_files.items():
+                print(f"    * {file_type}: {len(files)}개 파일")
+                for file_info in files:
+                    if isinstance(file_info, dict):
+                        print(f"      - {file_info.get('filename', 'unknown')} ({file_info.get('path', 'unknown')})")
+                    else:
+                        print(f"      - {file_info}")
+    else:
+        print("  - 라이브러리 파일 정보가 없습니다.")
+    
+    # 압축할 라이브러리 파일 목록
+    backup_files = collect_backup_library_files(scan)
+    total_files = len(backup_files)
+    print(f"🔍 백업 디버그: 압축할 라이브러리 파일 {total_files}개")
+    
+    if compact:
+        backup_data['metadata'].update({'format': COMPACT_FORMAT, 'version': COMPACT_FORMAT_VERSION,
+                                        'compression': compression})
+        tables = {}
+        table_entries = [compact_table_entry(model, compression, tables) for model in BACKUP_MODELS]
+        backup_data['tables'] = tables
+        db.session.close()  # 조회가 끝났으므로 ZIP 을 보내는 동안 DB 연결을 풀에 돌려줌
+    else:
+        json_data = json.dumps(backup_data, indent=2, ensure_ascii=False).encode('utf-8')
+        del backup_data
+    
+    on_progress('zip', 'ZIP 파일을 생성하고 있습니다...', 40)
+    
+    def zip_entries():
+        if compact:
+            # 테이블별 NDJSON 항목을 먼저 기록하고, 행 수를 포함한 테이블 목록을 백업 정보에 기록
+            yield from table_entries
+            yield 'backup_info.json', json.dumps(backup_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        else:
+            # JSON 백업 데이터를 ZIP에 추가
+            yield 'backup_info.json', json_data
+        for project_key, arcname, file_path in backup_files:
+            yield arcname, file_path
+    
+    processed = {'files': 0, 'tables': 0}
+    
+    def on_entry(arcname, error):
+        if arcname == 'backup_info.json':
+            on_progress('zip', '백업 정보를 ZIP에 추가했습니다', 50)
+            return
+        if arcname.startswith('database/'):
+            processed['tables'] += 1
+            on_progress('database', f'테이블 데이터를 기록했습니다 ({processed["tables"]}/{len(BACKUP_MODELS)})',
+                        40 + processed['tables'] * 10 // len(BACKUP_MODELS))
+            return
+        if error:
+            print(f"❌ 백업 파일 추가 실패: {arcname}, 오류: {error}")
+        
+        # 파일별 진행상황 업데이트 (10개 파일마다)
+        processed['files'] += 1
+        if processed['files'] % 10 == 0 or processed['files'] == total_files:
+            progress_percent = 50 + (processed['files'] * 30 // total_files)
+            on_progress('libraries', f'전체 라이브러리 압축 중... ({processed["files"]}/{total_files} 파일)', progress_percent)
+    
+    return zip_entries(), on_entry
+
 @app.route('/api/admin/backup', methods=['POST'])
 @admin_required
 def backup_database():
-    """전체 시스템 백업 (JSON + 라이브러리 ZIP 다운로드)"""
+    """전체 시스템 백업 (DB + 라이브러리 ZIP 스트리밍 다운로드)
+
+    format: compact(기본, 테이블별 NDJSON) | json, compression: gzip | zstd | none (compact 형식)
+    """
     try:
         user_id = get_jwt_identity()
         
+        options = request.get_json(silent=True) or {}
+        backup_format = options.get('format') or request.args.get('format') or COMPACT_FORMAT
+        if backup_format not in BACKUP_FORMATS:
+            return jsonify({
+                'success': False,
+                'message': f'지원하지 않는 백업 형식입니다: {backup_format}'
+            }), 400
+        try:
+            compression = resolve_compression(options.get('compression') or request.args.get('compression'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        def on_progress(step, message, percentage):
+            update_backup_progress(user_id, step, message, percentage)
+        
         with app.app_context():
             # 백업 시작
             update_backup_progress(user_id, 'start', '백업을 시작합니다...', 0)
-            
-            # 백업 데이터 생성
-            update_backup_progress(user_id, 'database', '데이터베이스 정보를 수집하고 있습니다...', 10)
-            backup_data = create_backup_data()
-            update_backup_progress(user_id, 'database', '데이터베이스 정보 수집 완료', 30)
-            
-            # 라이브러리 파일 정보도 백업 데이터에 포함
-            print(f"🔍 백업 데이터의 라이브러리 파일 정보:")
-            if 'libraries_files' in backup_data:
-                for project_name, project_files in backup_data['libraries_files'].items():
-                    print(f"  - 프로젝트 '{project_name}':")
-                    for file_type, files in project_files.items():
-                        print(f"    * {file_type}: {len(files)}개 파일")
-                        for file_info in files:
-                            if isinstance(file_info, dict):
-                                print(f"      - {file_info.get('filename', 'unknown')} ({file_info.get('path', 'unknown')})")
-                            else:
-                                print(f"      - {file_info}")
-            else:
-                print("  - 라이브러리 파일 정보가 없습니다.")
-            
-            # 라이브러리 파일들을 ZIP으로 압축
-            import zipfile
-            import io
-            import json
-            
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            
-            update_backup_progress(user_id, 'zip', 'ZIP 파일을 생성하고 있습니다...', 40)
-            
-            # 메모리에 ZIP 파일 생성
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # JSON 백업 데이터를 ZIP에 추가
-                json_data = json.dumps(backup_data, indent=2, ensure_ascii=False)
-                zipf.writestr('backup_info.json', json_data)
-                update_backup_progress(user_id, 'zip', '백업 정보를 ZIP에 추가했습니다', 50)
-                
-                # 라이브러리 파일들을 ZIP에 추가
-                current_dir = os.path.dirname(__file__)  # backend/
-                parent_dir = os.path.dirname(current_dir)  # graphics-editor/
-                projects_dir = os.path.join(parent_dir, 'projects')  # graphics-editor/projects/
-                
-                print(f"🔍 백업 디버그: current_dir = {current_dir}")
-                print(f"🔍 백업 디버그: parent_dir = {parent_dir}")
-                print(f"🔍 백업 디버그: projects_dir = {projects_dir}")
-                print(f"🔍 백업 디버그: projects_dir exists = {os.path.exists(projects_dir)}")
-                
-                if os.path.exists(projects_dir):
-                    # 사용자별 폴더 순회
-                    all_projects = []
-                    for user_dir in os.listdir(projects_dir):
-                        user_path = os.path.join(projects_dir, user_dir)
-                        if os.path.isdir(user_path):
-                            for project_dir in os.listdir(user_path):
-                                project_path = os.path.join(user_path, project_dir)
-                                if os.path.isdir(project_path):
-                                    all_projects.append((user_dir, project_dir, project_path))
-                    
-                    print(f"🔍 백업 디버그: 발견된 프로젝트들 = {[(u, p) for u, p, _ in all_projects]}")
-                    total_projects = len(all_projects)
-                    
-                    # 전체 파일 수 미리 계산
-                    total_files = 0
-                    project_files_count = {}
-                    for user_dir, project_dir, project_path in all_projects:
-                        library_path = os.path.join(project_path, 'library')
-                        project_key = f"{user_dir}/{project_dir}"
-                        print(f"🔍 백업 디버그: 프로젝트 '{project_key}' library_path = {library_path}")
-                        print(f"🔍 백업 디버그: library_path exists = {os.path.exists(library_path)}")
-                        
-                        if os.path.exists(library_path):
-                            file_count = sum(len(files) for _, _, files in os.walk(library_path))
-                            project_files_count[project_key] = file_count
-                            total_files += file_count
-                            print(f"🔍 백업 디버그: 프로젝트 '{project_key}' 파일 수 = {file_count}")
-                            
-                            # 실제 파일 목록 출력
-                            print(f"🔍 백업 디버그: 프로젝트 '{project_key}' 파일 목록:")
-                            for root, dirs, files in os.walk(library_path):
-                                for file in files:
-                                    file_path = os.path.join(root, file)
-                                    relative_path = os.path.relpath(file_path, library_path)
-                                    print(f"  - {relative_path} (전체 경로: {file_path})")
-                        else:
-                            print(f"🔍 백업 디버그: 프로젝트 '{project_key}' 라이브러리 폴더가 존재하지 않음")
-                    
-                    processed_files = 0
-                    for i, (user_dir, project_dir, project_path) in enumerate(all_projects):
-                        library_path = os.path.join(project_path, 'library')
-                        project_key = f"{user_dir}/{project_dir}"
-                        
-                        if os.path.exists(library_path):
-                            file_count = project_files_count.get(project_key, 0)
-                            update_backup_progress(user_id, 'libraries', f'프로젝트 "{project_key}" 라이브러리를 압축하고 있습니다... ({i+1}/{total_projects}, {file_count}개 파일)', 50 + (i * 30 // total_projects))
-                            
-                            # 프로젝트별 라이브러리 폴더를 ZIP에 추가
-                            all_files = []
-                            for root, dirs, files in os.walk(library_path):
-                                for file in files:
-                                    all_files.append((root, file))
-                            
-                            print(f"🔍 백업 디버그: 프로젝트 '{project_key}'에서 {len(all_files)}개 파일 발견")
-                            
-                            for j, (root, file) in enumerate(all_files):
-                                file_path = os.path.join(root, file)
-                                # ZIP 내에서의 상대 경로 (library 폴더 기준)
-                                relative_path = os.path.relpath(file_path, library_path)
-                                arcname = os.path.join(f'projects/{user_dir}/{project_dir}/library', relative_path)
-                                
-                                try:
-                                    zipf.write(file_path, arcname)
-                                    print(f"✅ 백업 파일 추가: {file_path} -> {arcname}")
-                                except Exception as e:
-                                    print(f"❌ 백업 파일 추가 실패: {file_path} -> {arcname}, 오류: {e}")
-                                
-                                # 파일별 진행상황 업데이트 (10개 파일마다)
-                                processed_files += 1
-                                if (processed_files % 10 == 0) or (j == len(all_files) - 1):
-                                    progress_percent = 50 + (processed_files * 30 // total_files) if total_files > 0 else 80
-                                    update_backup_progress(user_id, 'libraries', f'전체 라이브러리 압축 중... ({processed_files}/{total_files} 파일)', progress_percent)
-                        else:
-                            update_backup_progress(user_id, 'libraries', f'프로젝트 "{project_key}" 라이브러리 폴더가 없습니다. ({i+1}/{total_projects})', 50 + (i * 30 // total_projects))
-                            continue
-            
-            update_backup_progress(user_id, 'complete', '백업 파일 생성이 완료되었습니다. 다운로드를 시작합니다...', 100)
-            
-            # ZIP 파일 내용 확인
-            zip_buffer.seek(0)
-            with zipfile.ZipFile(zip_buffer, 'r') as check_zip:
-                zip_contents = check_zip.namelist()
-                print(f"📦 백업 ZIP 파일 내용:")
-                for item in zip_contents:
-                    print(f"  - {item}")
-            
-            # ZIP 파일을 응답으로 반환
-            zip_buffer.seek(0)
-            response = make_response(zip_buffer.getvalue())
-            response.headers['Content-Type'] = 'application/zip'
-            response.headers['Content-Disposition'] = f'attachment; filename="editonair_backup_{timestamp}.zip"'
-            
-            return response
+            entries, on_entry = prepare_backup_zip(on_progress, backup_format, compression)
+        
+        def generate():
+            # ZIP을 메모리에 모으지 않고 만들어지는 대로 전송
+            try:
+                yield from stream_zip(entries, on_entry=on_entry)
+                update_backup_progress(user_id, 'complete', '백업 파일 생성이 완료되었습니다.', 100)
+            except Exception as e:
+                print(f"Backup stream error: {e}")
+                update_backup_progress(user_id, 'error', f'백업 중 오류가 발생했습니다: {str(e)}', None)
+                raise
+        
+        response = Response(generate(), mimetype='application/zip')
+        response.headers['Content-Disposition'] = f'attachment; filename="editonair_backup_{timestamp}.zip"'
+        return response
             
     except Exception as e:
         print(f"Backup error: {e}")
@@ -3221,42 +3907,26 @@ def backup_database():
             'message': f'백업 중 오류가 발생했습니다: {str(e)}'
         }), 500
 
-def create_backup_data():
-    """백업 데이터 생성"""
+def collect_backup_library_files(scan):
+    """백업할 라이브러리 파일 목록 [(project_key, arcname, file_path)]"""
+    return [(file['project_key'], file['arcname'], file['file_path']) for file in library_scanner.iter_files(scan)]
+
+def create_backup_data(scan=None, include_database=True):
+    """백업 데이터 생성 (scan: library_scanner 스캔 결과, 없으면 새로 스캔)
+
+    include_database=False: 컴팩트 형식용 (테이블 행은 별도 항목으로 기록하고,
+    libraries_files 와 중복되는 libraries_info 도 생략)
+    """
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
     # 데이터베이스 백업
     db_backup = {}
     try:
-        # 사용자 데이터
-        users = User.query.all()
-        db_backup['users'] = [user.to_dict() for user in users]
-        
-        # 프로젝트 데이터
-        projects = Project.query.all()
-        db_backup['projects'] = [project_to_dict(project) for project in projects]
-        
-        # 씬 데이터
-        scenes = Scene.query.all()
-        db_backup['scenes'] = [scene_to_dict(scene) for scene in scenes]
-        
-        # 객체 데이터
-        objects = Object.query.all()
-        db_backup['objects'] = [object_to_dict(obj) for obj in objects]
-        
-        # 프로젝트 권한 데이터
-        permissions = ProjectPermission.query.all()
-        db_backup['permissions'] = [
-            {
-                'id': perm.id,
-                'project_id': perm.project_id,
-                'user_id': perm.user_id,
-                'permission_type': perm.permission_type,
-                'created_at': perm.created_at.isoformat() if perm.created_at else None,
-                'updated_at': perm.updated_at.isoformat() if perm.updated_at else None
-            }
-            for perm in permissions
-        ]
+        # 테이블별 전체 컬럼 (복구 시 그대로 적재)
+        for model in (BACKUP_MODELS if include_database else []):
+            table = model.__table__
+            rows = db.session.execute(table.select().order_by(*table.primary_key.columns))
+            db_backup[BACKUP_DATA_KEYS[table.name]] = [serialize_row(table, row) for row in rows]
     except Exception as e:
         print(f"Database backup error: {e}")
         db_backup['error'] = str(e)
@@ -3265,8 +3935,9 @@ def create_backup_data():
     libraries_info = {}
     libraries_files = {}
     try:
-        libraries_info = get_project_library_info()
-        libraries_files = get_libraries_files_info()
+        scan = scan or library_scanner.scan(use_cache=False)
+        libraries_info = get_project_library_info(scan)
+        libraries_files = get_libraries_files_info(scan)
         
         # 라이브러리 정보 요약 계산
         total_images = 0
@@ -3320,7 +3991,7 @@ def create_backup_data():
         'description': 'EditOnair 전체 시스템 백업 (데이터베이스 + 라이브러리 정보)'
     }
     
-    return {
+    backup_data = {
         'metadata': backup_metadata,
         'database': db_backup,
         'libraries_info': libraries_info,
@@ -3332,132 +4003,54 @@ def create_backup_data():
             'total_size': total_size
         }
     }
+    if not include_database:
+        del backup_data['database'], backup_data['libraries_info']
+    return backup_data
 
-def get_libraries_files_info():
-    """사용자별 프로젝트 라이브러리 파일 정보 수집 (개선된 버전)"""
-    projects_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'projects')
-    print(f"🔍 라이브러리 정보 수집: projects_dir = {projects_dir}")
-    print(f"🔍 projects_dir exists = {os.path.exists(projects_dir)}")
-    
-    if not os.path.exists(projects_dir):
-        print("❌ projects 디렉토리가 존재하지 않습니다.")
-        return {}
-    
+def get_libraries_files_info(scan=None):
+    """사용자별 프로젝트 라이브러리 파일 정보 수집 (library_scanner 스캔 결과 사용)"""
+    scan = scan or library_scanner.scan()
     libraries_files = {}
     
-    # 사용자별 폴더 순회
-    for user_dir in os.listdir(projects_dir):
-        user_path = os.path.join(projects_dir, user_dir)
-        if not os.path.isdir(user_path):
-            continue
-            
-        print(f"🔍 사용자 폴더 처리 중: {user_dir}")
+    for project_key, project in scan['projects'].items():
+        project_files = {
+            'images': [],
+            'sequences': [],
+            'thumbnails': []
+        }
+        sequences = {}
+        
+        for file in project['files']:
+            parts = file['path'].split('/')
+            filename = parts[-1]
+            if len(parts) == 2 and parts[0] == 'images' and filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
+                project_files['images'].append({
+                    'filename': filename,
+                    'size': file['size'],
+                    'path': f"library/{file['path']}"
+                })
+            elif len(parts) == 2 and parts[0] == 'thumbnails' and filename.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
+                project_files['thumbnails'].append({
+                    'filename': filename,
+                    'size': file['size'],
+                    'path': f"library/{file['path']}"
+                })
+            elif len(parts) >= 3 and parts[0] == 'sequences':
+                sequences.setdefault(parts[1], []).append({
+                    'filename': filename,
+                    'path': f"library/{file['path']}",
+                    'size': file['size']
+                })
         
-        # 사용자별 프로젝트 폴더 순회
-        for project_dir in os.listdir(user_path):
-            project_path = os.path.join(user_path, project_dir)
-            if not os.path.isdir(project_path):
-                continue
-                
-            # 프로젝트 키: user_id/project_name 형태로 저장
-            project_key = f"{user_dir}/{project_dir}"
-            print(f"🔍 프로젝트 처리 중: {project_key}")
-            
-            library_path = os.path.join(project_path, 'library')
-            
-            if not os.path.exists(library_path):
-                print(f"⚠️ 프로젝트 '{project_key}'에 library 폴더가 없습니다.")
-                libraries_files[project_key] = {
-                    'images': [],
-                    'sequences': [],
-                    'thumbnails': []
-                }
-                continue
-            
-            project_files = {
-                'images': [],
-                'sequences': [],
-                'thumbnails': []
-            }
-            
-            # 이미지 파일 정보 수집
-            images_path = os.path.join(library_path, 'images')
-            if os.path.exists(images_path):
-                print(f"🔍 이미지 폴더 처리: {images_path}")
-                for file in os.listdir(images_path):
-                    if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
-                        file_path = os.path.join(images_path, file)
-                        if os.path.isfile(file_path):
-                            file_size = os.path.getsize(file_path)
-                            project_files['images'].append({
-                                'filename': file,
-                                'size': file_size,
-                                'path': f'library/images/{file}'
-                            })
-                            print(f"  ✅ 이미지 파일: {file} ({file_size} bytes)")
-            else:
-                print(f"⚠️ 프로젝트 '{project_key}'에 images 폴더가 없습니다.")
-            
-            # 썸네일 파일 정보 수집
-            thumbnails_path = os.path.join(library_path, 'thumbnails')
-            if os.path.exists(thumbnails_path):
-                print(f"🔍 썸네일 폴더 처리: {thumbnails_path}")
-                for file in os.listdir(thumbnails_path):
-                    if file.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
-                        file_path = os.path.join(thumbnails_path, file)
-                        if os.path.isfile(file_path):
-                            file_size = os.path.getsize(file_path)
-                            project_files['thumbnails'].append({
-                                'filename': file,
-                                'size': file_size,
-                                'path': f'library/thumbnails/{file}'
-                            })
-                            print(f"  ✅ 썸네일 파일: {file} ({file_size} bytes)")
-            else:
-                print(f"⚠️ 프로젝트 '{project_key}'에 thumbnails 폴더가 없습니다.")
-            
-            # 시퀀스 파일 정보 수집
-            sequences_path = os.path.join(library_path, 'sequences')
-            if os.path.exists(sequences_path):
-                print(f"🔍 시퀀스 폴더 처리: {sequences_path}")
-                for seq_dir in os.listdir(sequences_path):
-                    seq_path = os.path.join(sequences_path, seq_dir)
-                    if os.path.isdir(seq_path):
-                        print(f"  🔍 시퀀스 '{seq_dir}' 처리 중...")
-                        seq_files = []
-                        for root, dirs, files in os.walk(seq_path):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                if os.path.isfile(file_path):
-                                    rel_path = os.path.relpath(file_path, seq_path)
-                                    file_size = os.path.getsize(file_path)
-                                    seq_files.append({
-                                        'filename': file,
-                                        'path': f'library/sequences/{seq_dir}/{rel_path}',
-                                        'size': file_size
-                                    })
-                                    print(f"    ✅ 시퀀스 파일: {file} ({file_size} bytes)")
-                        
-                        if seq_files:
-                            project_files['sequences'].append({
-                                'sequence_name': seq_dir,
-                                'files': seq_files
-                            })
-                            print(f"  ✅ 시퀀스 '{seq_dir}' 완료: {len(seq_files)}개 파일")
-            else:
-                print(f"⚠️ 프로젝트 '{project_key}'에 sequences 폴더가 없습니다.")
-            
-            # 프로젝트별 요약 정보 출력
-            total_images = len(project_files['images'])
-            total_thumbnails = len(project_files['thumbnails'])
-            total_sequences = sum(len(seq['files']) for seq in project_files['sequences'])
-            
-            print(f"📊 프로젝트 '{project_key}' 요약:")
-            print(f"  - 이미지: {total_images}개")
-            print(f"  - 썸네일: {total_thumbnails}개")
-            print(f"  - 시퀀스 파일: {total_sequences}개")
-            
-            libraries_files[project_key] = project_files
+        project_files['sequences'] = [
+            {'sequence_name': sequence_name, 'files': files}
+            for sequence_name, files in sequences.items()
+        ]
+        
+        if not project['has_library']:
+            print(f"⚠️ 프로젝트 '{project_key}'에 library 폴더가 없습니다.")
+        
+        libraries_files[project_key] = project_files
     
     return libraries_files
 
@@ -3479,10 +4072,162 @@ def get_backup_list():
             'message': f'백업 목록 조회 중 오류가 발생했습니다: {str(e)}'
         }), 500
 
-@app.route('/api/admin/restore', methods=['POST'])
+# 백업 대상 테이블 (부모 테이블 먼저)
+BACKUP_MODELS = [User, Project, Scene, Object, ProjectPermission]
+
+# 복구할 ZIP 업로드를 임시로 기록하는 폴더
+RESTORE_SPOOL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backups', 'restore')
+
+# 전체 백업 JSON 의 database 항목 키 (테이블 이름 -> 키)
+BACKUP_DATA_KEYS = {
+    'user': 'users',
+    'project': 'projects',
+    'scene': 'scenes',
+    'objects': 'objects',
+    'project_permission': 'permissions'
+}
+
+def get_projects_dir():
+    """프로젝트 폴더 루트 (projects/)"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'projects')
+
+@app.route('/api/admin/backups/incremental', methods=['GET', 'POST'])
+@admin_required
+def incremental_backup():
+    """증분 백업 목록 조회 / 생성 (full=true 이면 기준 백업)"""
+    if request.method == 'GET':
+        return jsonify({'success': True, 'backups': incremental_backups.list_archives()})
+    
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    try:
+        update_backup_progress(user_id, 'start', '증분 백업을 시작합니다...', 0)
+        record = incremental_backups.create(
+            db.session, BACKUP_MODELS, get_projects_dir(), full=bool(data.get('full', False)),
+            on_progress=lambda message, percentage: update_backup_progress(user_id, 'incremental', message, percentage)
+        )
+        update_backup_progress(user_id, 'complete', '증분 백업이 완료되었습니다.', 100)
+        return jsonify({'success': True, 'backup': record}), 201
+    except Exception as e:
+        print(f"Incremental backup error: {e}")
+        update_backup_progress(user_id, 'error', f'백업 중 오류가 발생했습니다: {str(e)}', None)
+        return jsonify({'success': False, 'message': f'백업 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@app.route('/api/admin/backups/incremental/<name>', methods=['GET'])
+@admin_required
+def download_incremental_backup(name):
+    """증분 백업 아카이브 다운로드"""
+    try:
+        path = incremental_backups.archive_path(name)
+    except BackupError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if not os.path.exists(path):
+        return jsonify({'success': False, 'message': '백업 파일을 찾을 수 없습니다.'}), 404
+    return send_from_directory(incremental_backups.store_dir, name, as_attachment=True, conditional=True)
+
+def refresh_after_incremental_restore(result, restore_database):
+    """증분 복구 후 DB/라이브러리 기반 캐시 비우기"""
+    if restore_database:
+        asset_server.invalidate_folders()
+        preload_manifests.clear()
+        asset_references.clear()
+    for library_path in result['libraries']:
+        # 복구된 파일 기준으로 다음 조회 시 라이브러리 인덱스 재생성
+        library_index.invalidate(library_path)
+
+@app.route('/api/admin/backups/incremental/<name>/restore', methods=['POST'])
+@admin_required
+def restore_incremental_backup(name):
+    """기준 백업 + 증분 체인을 name 시점까지 적용하여 복구"""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    restore_database = bool(data.get('restore_database', False))
+    restore_libraries = bool(data.get('restore_libraries', False))
+    if not restore_database and not restore_libraries:
+        return jsonify({'success': False, 'message': '복구할 항목을 선택해주세요.'}), 400
+    
+    try:
+        update_restore_progress(user_id, 'start', '복구를 시작합니다...', 0)
+        result = incremental_backups.restore(
+            name, db.session, BACKUP_MODELS, get_projects_dir(),
+            restore_database=restore_database, restore_libraries=restore_libraries,
+            on_progress=lambda message, percentage: update_restore_progress(user_id, 'incremental', message, percentage)
+        )
+    except BackupError as e:
+        update_restore_progress(user_id, 'error', str(e), None)
+        return jsonify({'success': False, 'message': str(e)}), 404
+    except Exception as e:
+        print(f"Incremental restore error: {e}")
+        update_restore_progress(user_id, 'error', f'복구 중 오류가 발생했습니다: {str(e)}', None)
+        return jsonify({'success': False, 'message': f'복구 중 오류가 발생했습니다: {str(e)}'}), 500
+    
+    refresh_after_incremental_restore(result, restore_database)
+    
+    update_restore_progress(user_id, 'complete', '복구가 성공적으로 완료되었습니다!', 100)
+    return jsonify({
+        'success': True,
+        'message': '복구가 성공적으로 완료되었습니다.',
+        'chain': result['chain'],
+        'rows': result['rows'],
+        'files': result['files']
+    }), 200
+
+def restore_from_zip(zip_path, restore_database, restore_libraries, on_progress):
+    """디스크에 있는 ZIP 백업 복구 (요청/백그라운드 작업 공통)
+
+    backup_info.json 은 앞에서부터 스트리밍으로 읽음 (database 는 테이블/행 단위)
+    컴팩트 형식이면 tables 목록의 테이블별 NDJSON 항목을 차례로 스트리밍
+    백업 정보 파일이 없으면 BackupError, 복구 실패 시 RuntimeError
+    """
+    import zipfile
+    
+    with zipfile.ZipFile(zip_path, 'r') as zipf:
+        # ZIP 항목 조회용 (항목 이름 -> ZipInfo)
+        members = {info.filename: info for info in zipf.infolist()}
+        if 'backup_info.json' not in members:
+            raise BackupError('백업 정보 파일을 찾을 수 없습니다.')
+        
+        on_progress('parse', '백업 정보를 분석하고 있습니다...', 20)
+        libraries_files = {}
+        tables_manifest = None
+        database_found = False
+        with zipf.open('backup_info.json') as raw:
+            reader = JsonStreamReader(io.TextIOWrapper(raw, encoding='utf-8'))
+            for key in reader.iter_object():
+                # 데이터베이스 복구
+                if key == 'database' and restore_database:
+                    database_found = True
+                    on_progress('database', '데이터베이스를 복구하고 있습니다...', 30)
+                    tables, finish = stream_backup_tables(reader)
+                    if not restore_database_from_backup(tables, on_progress):
+                        raise RuntimeError('데이터베이스 복구 중 오류가 발생했습니다.')
+                    finish()
+                    on_progress('database', '데이터베이스 복구 완료', 60)
+                elif key == 'tables' and restore_database:
+                    tables_manifest = reader.read_value()
+                elif key == 'libraries_files' and restore_libraries:
+                    libraries_files = reader.read_value()
+        
+        # 컴팩트 형식: 테이블별 항목에서 복구
+        if tables_manifest is not None and not database_found:
+            database_found = True
+            on_progress('database', '데이터베이스를 복구하고 있습니다...', 30)
+            if not restore_database_from_backup(compact_backup_tables(zipf, members, tables_manifest), on_progress):
+                raise RuntimeError('데이터베이스 복구 중 오류가 발생했습니다.')
+            on_progress('database', '데이터베이스 복구 완료', 60)
+        if restore_database and not database_found:
+            raise BackupError('백업에 데이터베이스 정보가 없습니다.')
+    
+    # 라이브러리 복구
+    if restore_libraries:
+        on_progress('libraries', '라이브러리 파일들을 복구하고 있습니다...', 70)
+        if not restore_libraries_from_zip(zip_path, members, libraries_files, on_progress):
+            raise RuntimeError('라이브러리 복구 중 오류가 발생했습니다.')
+        on_progress('libraries', '라이브러리 복구 완료', 90)
+
 @admin_required
 def restore_backup():
-    """백업 파일에서 복구"""
+    """백업 ZIP 파일에서 복구 (POST /api/admin/restore 에 ZIP 파일을 올린 경우)"""
     try:
         user_id = get_jwt_identity()
         
@@ -3506,75 +4251,54 @@ def restore_backup():
                 'message': 'ZIP 파일만 업로드 가능합니다.'
             }), 400
         
+        # 복구 옵션 확인
+        restore_database = request.form.get('restore_database', 'false').lower() == 'true'
+        restore_libraries = request.form.get('restore_libraries', 'false').lower() == 'true'
+        
+        if not restore_database and not restore_libraries:
+            update_restore_progress(user_id, 'error', '복구할 항목을 선택해주세요.', None)
+            return jsonify({
+                'success': False,
+                'message': '복구할 항목을 선택해주세요.'
+            }), 400
+        
+        def on_progress(step, message, percentage):
+            update_restore_progress(user_id, step, message, percentage)
+        
         with app.app_context():
             # 복구 시작
             update_restore_progress(user_id, 'start', '복구를 시작합니다...', 0)
-            
-            # ZIP 파일 처리
-            import zipfile
-            import io
-            import json
-            
             update_restore_progress(user_id, 'read', '백업 파일을 읽고 있습니다...', 10)
             
-            # ZIP 파일 읽기
-            zip_data = io.BytesIO(backup_file.read())
-            
-            with zipfile.ZipFile(zip_data, 'r') as zipf:
-                # 백업 정보 JSON 읽기
-                if 'backup_info.json' not in zipf.namelist():
-                    update_restore_progress(user_id, 'error', '백업 정보 파일을 찾을 수 없습니다.', None)
-                    return jsonify({
-                        'success': False,
-                        'message': '백업 정보 파일을 찾을 수 없습니다.'
-                    }), 400
-                
-                update_restore_progress(user_id, 'parse', '백업 정보를 분석하고 있습니다...', 20)
-                backup_info = json.loads(zipf.read('backup_info.json').decode('utf-8'))
-                
-                # 복구 옵션 확인
-                restore_database = request.form.get('restore_database', 'false').lower() == 'true'
-                restore_libraries = request.form.get('restore_libraries', 'false').lower() == 'true'
-                
-                if not restore_database and not restore_libraries:
-                    update_restore_progress(user_id, 'error', '복구할 항목을 선택해주세요.', None)
-                    return jsonify({
-                        'success': False,
-                        'message': '복구할 항목을 선택해주세요.'
-                    }), 400
-                
-                # 데이터베이스 복구
-                if restore_database:
-                    update_restore_progress(user_id, 'database', '데이터베이스를 복구하고 있습니다...', 30)
-                    success = restore_database_from_backup(backup_info['database'])
-                    if not success:
-                        update_restore_progress(user_id, 'error', '데이터베이스 복구 중 오류가 발생했습니다.', None)
-                        return jsonify({
-                            'success': False,
-                            'message': '데이터베이스 복구 중 오류가 발생했습니다.'
-                        }), 500
-                    update_restore_progress(user_id, 'database', '데이터베이스 복구 완료', 60)
-                
-                # 라이브러리 복구
-                if restore_libraries:
-                    update_restore_progress(user_id, 'libraries', '라이브러리 파일들을 복구하고 있습니다...', 70)
-                    success = restore_libraries_from_zip(zipf, backup_info.get('libraries_files', {}))
-                    if not success:
-                        update_restore_progress(user_id, 'error', '라이브러리 복구 중 오류가 발생했습니다.', None)
-                        return jsonify({
-                            'success': False,
-                            'message': '라이브러리 복구 중 오류가 발생했습니다.'
-                        }), 500
-                    update_restore_progress(user_id, 'libraries', '라이브러리 복구 완료', 90)
-                
-                update_restore_progress(user_id, 'complete', '복구가 성공적으로 완료되었습니다!', 100)
-                
+            # 업로드를 메모리에 올리지 않고 디스크에 기록한 뒤 ZIP으로 열기
+            os.makedirs(RESTORE_SPOOL_DIR, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=RESTORE_SPOOL_DIR, suffix='.zip', delete=False) as spool:
+                shutil.copyfileobj(backup_file.stream, spool, 1024 * 1024)
+            try:
+                restore_from_zip(spool.name, restore_database, restore_libraries, on_progress)
+            except BackupError as e:
+                update_restore_progress(user_id, 'error', str(e), None)
                 return jsonify({
-                    'success': True,
-                    'message': '복구가 성공적으로 완료되었습니다.',
-                    'restored_database': restore_database,
-                    'restored_libraries': restore_libraries
-                }), 200
+                    'success': False,
+                    'message': str(e)
+                }), 400
+            except RuntimeError as e:
+                update_restore_progress(user_id, 'error', str(e), None)
+                return jsonify({
+                    'success': False,
+                    'message': str(e)
+                }), 500
+            finally:
+                os.remove(spool.name)
+            
+            update_restore_progress(user_id, 'complete', '복구가 성공적으로 완료되었습니다!', 100)
+            
+            return jsonify({
+                'success': True,
+                'message': '복구가 성공적으로 완료되었습니다.',
+                'restored_database': restore_database,
+                'restored_libraries': restore_libraries
+            }), 200
                 
     except Exception as e:
         print(f"Restore error: {e}")
@@ -3585,107 +4309,90 @@ def restore_backup():
             'message': f'복구 중 오류가 발생했습니다: {str(e)}'
         }), 500
 
-def restore_database_from_backup(db_data):
-    """백업 데이터에서 데이터베이스 복구"""
+def stream_backup_tables(reader):
+    """백업 database 항목을 테이블 단위로 읽기 -> [(Table, 행 반복자)] (BACKUP_MODELS 순서)
+
+    백업의 테이블 순서가 BACKUP_MODELS 와 같으면 행을 하나씩 스트리밍하고,
+    순서가 다르면 먼저 나온 테이블만 메모리에 보관 (반복자는 순서대로 끝까지 소비해야 함)
+    """
+    keys = reader.iter_object()
+    buffered = {}
+    
+    def rows(key):
+        if key in buffered:
+            yield from buffered.pop(key)
+            return
+        for found in keys:
+            if found == key:
+                yield from reader.iter_array()
+                return
+            buffered[found] = reader.read_value()
+    
+    def finish():
+        # 남은 항목을 건너뛰어 database 객체 끝까지 읽음
+        for _ in keys:
+            pass
+    
+    return [(model.__table__, rows(BACKUP_DATA_KEYS[model.__table__.name])) for model in BACKUP_MODELS], finish
+
+def compact_backup_tables(zipf, members, manifest):
+    """컴팩트 백업의 tables 목록 -> [(Table, 행 반복자)] (BACKUP_MODELS 순서)
+
+    테이블 항목은 반복자를 소비할 때 하나씩 열어 스트리밍으로 압축 해제/디코딩
+    """
+    def rows(key):
+        entry = manifest.get(key)
+        if entry is None:
+            return
+        if entry['member'] not in members:
+            raise BackupError(f"백업에 {key} 테이블 항목이 없습니다: {entry['member']}")
+        with zipf.open(members[entry['member']]) as raw:
+            yield from decode_table(raw, entry.get('compression', 'none'))
+    
+    return [(model.__table__, rows(BACKUP_DATA_KEYS[model.__table__.name])) for model in BACKUP_MODELS]
+
+def restore_database_from_backup(tables, on_progress):
+    """백업 테이블 행으로 데이터베이스 복구 (on_progress(step, message, percentage))
+
+    tables: [(Table, 행 반복자)] (stream_backup_tables / compact_backup_tables), bulk_restore 로 배치 적재 (한 트랜잭션, 실패하면 기존 데이터 유지)
+    """
     try:
-        user_id = get_jwt_identity()
+        on_progress('database', '기존 데이터를 삭제하고 있습니다...', 35)
+        table_index = {table.name: i for i, (table, _) in enumerate(tables)}
         
-        # 기존 데이터 삭제 (순서 주의)
-        update_restore_progress(user_id, 'database', '기존 데이터를 삭제하고 있습니다...', 35)
-        Object.query.delete()
-        Scene.query.delete()
-        ProjectPermission.query.delete()
-        Project.query.delete()
-        User.query.delete()
-        
-        # 사용자 복구
-        update_restore_progress(user_id, 'database', '사용자 데이터를 복구하고 있습니다...', 40)
-        for user_data in db_data.get('users', []):
-            user = User(
-                id=user_data['id'],
-                username=user_data['username'],
-                password=user_data['password'],
-                created_at=datetime.fromisoformat(user_data['created_at']) if user_data['created_at'] else None,
-                is_active=user_data['is_active']
-            )
-            db.session.add(user)
-        
-        # 프로젝트 복구
-        update_restore_progress(user_id, 'database', '프로젝트 데이터를 복구하고 있습니다...', 45)
-        for project_data in db_data.get('projects', []):
-            project = Project(
-                id=project_data['id'],
-                name=project_data['name'],
-                created_at=datetime.fromisoformat(project_data['created_at']) if project_data['created_at'] else None,
-                updated_at=datetime.fromisoformat(project_data['updated_at']) if project_data['updated_at'] else None,
-                user_id=project_data['user_id']
-            )
-            db.session.add(project)
+        def on_batch(table_name, restored):
+            on_progress('database', f'{table_name} 데이터를 복구하고 있습니다... ({restored}행)',
+                        35 + table_index[table_name] * 24 // len(tables))
         
-        # 씬 복구
-        update_restore_progress(user_id, 'database', '씬 데이터를 복구하고 있습니다...', 50)
-        for scene_data in db_data.get('scenes', []):
-            scene = Scene(
-                id=scene_data['id'],
-                project_id=scene_data['project_id'],
-                name=scene_data['name'],
-                order=scene_data['order'],
-                duration=scene_data['duration'],
-                created_at=datetime.fromisoformat(scene_data['created_at']) if scene_data['created_at'] else None,
-                updated_at=datetime.fromisoformat(scene_data['updated_at']) if scene_data['updated_at'] else None
-            )
-            db.session.add(scene)
-        
-        # 객체 복구
-        update_restore_progress(user_id, 'database', '객체 데이터를 복구하고 있습니다...', 55)
-        for object_data in db_data.get('objects', []):
-            obj = Object(
-                id=object_data['id'],
-                name=object_data['name'],
-                type=object_data['type'],
-                order=object_data['order'],
-                properties=object_data['properties'],
-                in_motion=object_data['in_motion'],
-                out_motion=object_data['out_motion'],
-                timing=object_data['timing'],
-                scene_id=object_data['scene_id'],
-                created_at=datetime.fromisoformat(object_data['created_at']) if object_data['created_at'] else None,
-                updated_at=datetime.fromisoformat(object_data['updated_at']) if object_data['updated_at'] else None
-            )
-            db.session.add(obj)
-        
-        # 권한 복구
-        update_restore_progress(user_id, 'database', '권한 데이터를 복구하고 있습니다...', 58)
-        for perm_data in db_data.get('permissions', []):
-            perm = ProjectPermission(
-                id=perm_data['id'],
-                project_id=perm_data['project_id'],
-                user_id=perm_data['user_id'],
-                permission_type=perm_data['permission_type'],
-                created_at=datetime.fromisoformat(perm_data['created_at']) if perm_data['created_at'] else None,
-                updated_at=datetime.fromisoformat(perm_data['updated_at']) if perm_data['updated_at'] else None
-            )
-            db.session.add(perm)
-        
-        update_restore_progress(user_id, 'database', '데이터베이스에 저장하고 있습니다...', 59)
-        db.session.commit()
+        counts = bulk_restore(db.session, tables, on_progress=on_batch)
+        print(f"✅ 데이터베이스 복구 완료: {counts}")
         return True
         
+    except BulkRestoreError as e:
+        print(f"Database restore error: {e} (롤백 전 적재: {e.restored})")
+        return False
     except Exception as e:
         print(f"Database restore error: {e}")
         db.session.rollback()
         return False
+    finally:
+        # 캐시는 DB 기준으로 다시 만듦
+        asset_server.invalidate_folders()
+        preload_manifests.clear()
+        asset_references.clear()
 
-def restore_libraries_from_zip(zipf, libraries_files):
-    """ZIP 파일에서 라이브러리 복구 (사용자별 구조)"""
+def restore_libraries_from_zip(zip_path, members, libraries_files, on_progress):
+    """ZIP 파일에서 라이브러리 복구 (사용자별 구조)
+
+    members: ZIP 항목 이름 -> ZipInfo, 파일은 extract_members 로 병렬 압축 해제
+    """
     try:
-        user_id = get_jwt_identity()
-        projects_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'projects')
+        projects_dir = get_projects_dir()
+        projects_root = os.path.realpath(projects_dir)
         
-        total_projects = len(libraries_files)
-        for i, (project_key, project_files) in enumerate(libraries_files.items()):
-            update_restore_progress(user_id, 'libraries', f'프로젝트 "{project_key}" 라이브러리를 복구하고 있습니다... ({i+1}/{total_projects})', 70 + (i * 15 // total_projects))
-            
+        items = []
+        libraries = []
+        for project_key, project_files in libraries_files.items():
             # project_key는 "user_id/project_name" 형태
             if '/' in project_key:
                 user_dir, project_name = project_key.split('/', 1)
@@ -3693,41 +4400,40 @@ def restore_libraries_from_zip(zipf, libraries_files):
                 # 하위 호환성을 위해 기존 방식 지원
                 user_dir = 'default'
                 project_name = project_key
-            
             user_project_dir = os.path.join(projects_dir, user_dir, project_name)
-            os.makedirs(user_project_dir, exist_ok=True)
             
-            # 프로젝트별 파일 복구
-            for file_type, files in project_files.items():
-                if file_type == 'images':
-                    for file_info in files:
-                        zip_path = f'projects/{user_dir}/{project_name}/library/{file_info["path"]}'
-                        if zip_path in zipf.namelist():
-                            target_path = os.path.join(user_project_dir, file_info["path"])
-                            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                            with zipf.open(zip_path) as source, open(target_path, 'wb') as target:
-                                shutil.copyfileobj(source, target)
-                
-                elif file_type == 'thumbnails':
-                    for file_info in files:
-                        zip_path = f'projects/{user_dir}/{project_name}/library/{file_info["path"]}'
-                        if zip_path in zipf.namelist():
-                            target_path = os.path.join(user_project_dir, file_info["path"])
-                            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                            with zipf.open(zip_path) as source, open(target_path, 'wb') as target:
-                                shutil.copyfileobj(source, target)
-                
-                elif file_type == 'sequences':
-                    for seq_info in files:
-                        for file_info in seq_info['files']:
-                            zip_path = f'projects/{user_dir}/{project_name}/library/{file_info["path"]}'
-                            if zip_path in zipf.namelist():
-                                target_path = os.path.join(user_project_dir, file_info["path"])
-                                os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                                with zipf.open(zip_path) as source, open(target_path, 'wb') as target:
-                                    shutil.copyfileobj(source, target)
+            file_infos = list(project_files.get('images', [])) + list(project_files.get('thumbnails', []))
+            for seq_info in project_files.get('sequences', []):
+                file_infos.extend(seq_info['files'])
+            for file_info in file_infos:
+                # 경로는 프로젝트 폴더 기준 (library/images/a.png)
+                relative_path = file_info['path']
+                if not relative_path.startswith('library/'):
+                    relative_path = f'library/{relative_path}'
+                info = members.get(f'projects/{user_dir}/{project_name}/{relative_path}')
+                if info is None:
+                    continue
+                target_path = os.path.realpath(os.path.join(user_project_dir, *relative_path.split('/')))
+                if not target_path.startswith(projects_root + os.sep):
+                    print(f"⚠️ 잘못된 백업 경로 건너뜀: {info.filename}")
+                    continue
+                items.append((info, target_path))
+            libraries.append(os.path.join(user_project_dir, 'library'))
         
-        return True
+        total_files = len(items)
+        failed = 0
+        for i, (info, target_path, error) in enumerate(extract_members(zip_path, items), 1):
+            if error is not None:
+                failed += 1
+                print(f"❌ 라이브러리 파일 복구 실패: {info.filename}, 오류: {error}")
+            if i % 10 == 0 or i == total_files:
+                on_progress('libraries', f'라이브러리 파일을 복구하고 있습니다... ({i}/{total_files} 파일)', 70 + i * 15 // total_files)
+        
+        for library_path in libraries:
+            # 복구된 파일 기준으로 다음 조회 시 라이브러리 인덱스 재생성
+            library_index.invalidate(library_path)
+        
+        return failed == 0
         
     except Exception as e:
         print(f"Libraries restore error: {e}")
@@ -3739,11 +4445,14 @@ def get_libraries_info():
     """프로젝트별 라이브러리 정보 조회 (개선된 버전)"""
     try:
         with app.app_context():
+            # 한 번의 스캔 결과로 요약/상세 정보 생성 (폴더 mtime 기준 캐시)
+            scan = library_scanner.scan()
+            
             # 기존 라이브러리 정보
-            libraries_info = get_project_library_info()
+            libraries_info = get_project_library_info(scan)
             
             # 상세 파일 정보 수집
-            libraries_files = get_libraries_files_info()
+            libraries_files = get_libraries_files_info(scan)
             
             # 프로젝트별 상세 정보 계산
             detailed_info = {}
@@ -3851,6 +4560,177 @@ def get_restore_progress():
             'error': str(e)
         }), 500
 
+# --- 백업/복구 백그라운드 작업 ---
+
+def emit_backup_job(job):
+    """작업 상태를 요청한 관리자에게 WebSocket으로 전송"""
+    socketio.emit('backup_job', job, room=f"user_{job['user_id']}")
+
+def run_backup_job(job, progress, job_dir):
+    """백업 작업 (mode: archive = 전체 ZIP, incremental = 증분 백업)"""
+    user_id = job['user_id']
+    params = job['params']
+    
+    def on_progress(step, message, percentage):
+        progress(step, message, percentage)
+        update_backup_progress(user_id, step, message, percentage)
+    
+    try:
+        if params.get('mode') == 'incremental':
+            on_progress('start', '증분 백업을 시작합니다...', 0)
+            record = incremental_backups.create(
+                db.session, BACKUP_MODELS, get_projects_dir(), full=bool(params.get('full', False)),
+                on_progress=lambda message, percentage: on_progress('incremental', message, percentage)
+            )
+            backup_jobs.set_artifact(job, {'incremental': record['name'], 'filename': record['name'], 'size': record['size']})
+            update_backup_progress(user_id, 'complete', '증분 백업이 완료되었습니다.', 100)
+            return {'backup': record}
+        
+        on_progress('start', '백업을 시작합니다...', 0)
+        filename = f"editonair_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        entries, on_entry = prepare_backup_zip(on_progress, params.get('format') or COMPACT_FORMAT,
+                                               params.get('compression'))
+        size = write_zip(os.path.join(job_dir, ARTIFACT_FILENAME), entries, on_entry=on_entry)
+        backup_jobs.set_artifact(job, {'filename': filename, 'size': size})
+        update_backup_progress(user_id, 'complete', '백업 파일 생성이 완료되었습니다.', 100)
+        return {'filename': filename, 'size': size, 'size_formatted': format_file_size(size)}
+    except Exception as e:
+        update_backup_progress(user_id, 'error', f'백업 중 오류가 발생했습니다: {str(e)}', None)
+        raise
+
+def run_restore_job(job, progress, job_dir):
+    """복구 작업 (업로드한 ZIP 또는 증분 백업 아카이브)"""
+    user_id = job['user_id']
+    params = job['params']
+    restore_database = params['restore_database']
+    restore_libraries = params['restore_libraries']
+    
+    def on_progress(step, message, percentage):
+        progress(step, message, percentage)
+        update_restore_progress(user_id, step, message, percentage)
+    
+    try:
+        on_progress('start', '복구를 시작합니다...', 0)
+        if params.get('incremental'):
+            result = incremental_backups.restore(
+                params['incremental'], db.session, BACKUP_MODELS, get_projects_dir(),
+                restore_database=restore_database, restore_libraries=restore_libraries,
+                on_progress=lambda message, percentage: on_progress('incremental', message, percentage)
+            )
+            refresh_after_incremental_restore(result, restore_database)
+            outcome = {'chain': result['chain'], 'rows': result['rows'], 'files': result['files']}
+        else:
+            on_progress('read', '백업 파일을 읽고 있습니다...', 10)
+            restore_from_zip(os.path.join(job_dir, UPLOAD_FILENAME), restore_database, restore_libraries, on_progress)
+            outcome = {'restored_database': restore_database, 'restored_libraries': restore_libraries}
+    except Exception as e:
+        update_restore_progress(user_id, 'error', f'복구 중 오류가 발생했습니다: {str(e)}', None)
+        raise
+    
+    update_restore_progress(user_id, 'complete', '복구가 성공적으로 완료되었습니다!', 100)
+    return outcome
+
+backup_jobs.configure(app.app_context, emit_backup_job)
+backup_jobs.register('backup', run_backup_job)
+backup_jobs.register('restore', run_restore_job)
+
+@app.route('/api/admin/jobs', methods=['GET'])
+@admin_required
+def list_backup_jobs():
+    """백업/복구 작업 목록 (?type=backup|restore)"""
+    return jsonify({'success': True, 'jobs': backup_jobs.list_jobs(request.args.get('type'))})
+
+@app.route('/api/admin/jobs/backup', methods=['POST'])
+@admin_required
+def submit_backup_job():
+    """백업 작업 등록 (mode: archive | incremental, full: 증분 백업을 기준 백업으로,
+    format: compact | json, compression: gzip | zstd | none - archive 방식)"""
+    data = request.get_json(silent=True) or {}
+    mode = data.get('mode', 'archive')
+    if mode not in ('archive', 'incremental'):
+        return jsonify({'success': False, 'message': f'지원하지 않는 백업 방식입니다: {mode}'}), 400
+    backup_format = data.get('format') or COMPACT_FORMAT
+    if backup_format not in BACKUP_FORMATS:
+        return jsonify({'success': False, 'message': f'지원하지 않는 백업 형식입니다: {backup_format}'}), 400
+    try:
+        compression = resolve_compression(data.get('compression'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    params = {'mode': mode, 'full': bool(data.get('full', False)), 'format': backup_format, 'compression': compression}
+    job = backup_jobs.submit('backup', get_jwt_identity(), params)
+    return jsonify({'success': True, 'job': job}), 202
+
+@app.route('/api/admin/jobs/restore', methods=['POST'])
+@admin_required
+def submit_restore_job():
+    """복구 작업 등록 (multipart backup_file 업로드 또는 JSON {incremental: 아카이브 이름})"""
+    if request.files:
+        options = request.form
+        backup_file = request.files.get('backup_file')
+        if backup_file is None or backup_file.filename == '':
+            return jsonify({'success': False, 'message': '백업 파일을 선택해주세요.'}), 400
+        if not backup_file.filename.endswith('.zip'):
+            return jsonify({'success': False, 'message': 'ZIP 파일만 업로드 가능합니다.'}), 400
+        incremental = None
+    else:
+        options = request.get_json(silent=True) or {}
+        backup_file = None
+        incremental = options.get('incremental')
+        if not incremental:
+            return jsonify({'success': False, 'message': '백업 파일을 업로드해주세요.'}), 400
+        try:
+            if not os.path.exists(incremental_backups.archive_path(incremental)):
+                return jsonify({'success': False, 'message': '백업 파일을 찾을 수 없습니다.'}), 404
+        except BackupError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+    
+    # multipart 폼 값은 문자열
+    restore_database = str(options.get('restore_database', 'false')).lower() == 'true'
+    restore_libraries = str(options.get('restore_libraries', 'false')).lower() == 'true'
+    if not restore_database and not restore_libraries:
+        return jsonify({'success': False, 'message': '복구할 항목을 선택해주세요.'}), 400
+    
+    params = {'restore_database': restore_database, 'restore_libraries': restore_libraries, 'incremental': incremental}
+    try:
+        job = backup_jobs.submit('restore', get_jwt_identity(), params,
+                                 upload=backup_file.stream if backup_file is not None else None)
+    except OSError as e:
+        return jsonify({'success': False, 'message': f'백업 파일 저장 중 오류가 발생했습니다: {str(e)}'}), 500
+    return jsonify({'success': True, 'job': job}), 202
+
+@app.route('/api/admin/jobs/<job_id>', methods=['GET', 'DELETE'])
+@admin_required
+def handle_backup_job(job_id):
+    """작업 상태 조회 / 대기 중인 작업 취소, 끝난 작업 삭제"""
+    try:
+        if request.method == 'DELETE':
+            return jsonify({'success': True, 'job': backup_jobs.delete(job_id)})
+        return jsonify({'success': True, 'job': backup_jobs.get(job_id)})
+    except JobError as e:
+        return jsonify({'success': False, 'message': e.message}), e.status
+
+@app.route('/api/admin/jobs/<job_id>/download', methods=['GET'])
+@admin_required
+def download_backup_job(job_id):
+    """완료된 백업 작업의 결과 파일 다운로드 (Range 요청 지원)"""
+    try:
+        job = backup_jobs.get(job_id)
+    except JobError as e:
+        return jsonify({'success': False, 'message': e.message}), e.status
+    artifact = job.get('artifact')
+    if job['type'] != 'backup' or job['status'] != 'completed' or not artifact:
+        return jsonify({'success': False, 'message': '다운로드할 백업 파일이 없습니다.', 'status': job['status']}), 409
+    
+    if artifact.get('incremental'):
+        directory, filename = incremental_backups.store_dir, artifact['incremental']
+    else:
+        directory, filename = backup_jobs.job_dir(job_id), ARTIFACT_FILENAME
+    if not os.path.exists(os.path.join(directory, filename)):
+        return jsonify({'success': False, 'message': '백업 파일을 찾을 수 없습니다.'}), 404
+    return send_from_directory(directory, filename, as_attachment=True,
+                               download_name=artifact['filename'], conditional=True)
+
 # --- 라이브 컨트롤 API ---
 
 @app.route('/api/live/projects/<project_name>/state', methods=['GET'])
@@ -3871,6 +4751,7 @@ def get_project_live_state(project_name):
 
 @app.route('/api/live/objects/<int:object_id>/text', methods=['POST'])
 @jwt_required()
+@live_traced
 def update_text_live(object_id):
     """텍스트 객체 실시간 내용 변경"""
     try:
@@ -3949,6 +4830,7 @@ def update_text_live(object_id):
 
 @app.route('/api/live/scenes/<int:scene_id>/on', methods=['POST'])
 @jwt_required()
+@live_traced
 def scene_live_on(scene_id):
     """씬 송출 상태로 변경"""
     try:
@@ -4017,6 +4899,7 @@ def scene_live_on(scene_id):
 
 @app.route('/api/live/scenes/<int:scene_id>/off', methods=['POST'])
 @jwt_required()
+@live_traced
 def scene_live_off(scene_id):
     """씬 아웃 상태로 변경"""
     try:
@@ -4070,6 +4953,7 @@ def scene_live_off(scene_id):
 
 @app.route('/api/live/objects/<int:object_id>/timer/<action>', methods=['POST'])
 @jwt_required()
+@live_traced
 def control_timer(object_id, action):
     """타이머 제어 (start/stop/reset) - 단순화된 시스템"""
     try:
@@ -4210,6 +5094,7 @@ def get_timer_status(object_id):
 
 @app.route('/api/live/projects/<project_name>/clear', methods=['POST'])
 @auth_required('editor')
+@live_traced
 def clear_project_live_state(project_name):
     """프로젝트 라이브 상태 모두 초기화"""
     try:
@@ -4244,6 +5129,7 @@ def clear_project_live_state(project_name):
 
 @app.route('/api/live/objects/<int:object_id>/image', methods=['POST'])
 @jwt_required()
+@live_traced
 def update_image_live(object_id):
     """이미지 객체 실시간 이미지 변경"""
     try:
@@ -4311,6 +5197,7 @@ def update_image_live(object_id):
 
 @app.route('/api/live/objects/<int:object_id>/shape', methods=['POST'])
 @jwt_required()
+@live_traced
 def update_shape_live(object_id):
     """도형 객체 실시간 속성 변경 (컬러 등)"""
     try:
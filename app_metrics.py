@@ -0,0 +1,182 @@
+"""
+애플리케이션 계측 (Prometheus 텍스트 형식)
+- HTTP 요청: 라우트(URL 규칙)/메서드별 지연 시간 히스토그램, 상태 코드별 요청 수
+- DB: 문장 종류(SELECT/INSERT/...)별 쿼리 시간 히스토그램, 오류 수
+- Socket.IO: 이벤트 이름별 emit 시간 히스토그램(= 전송 횟수), 룸 종류(user/channel/project)별 룸 수와 인원 (수집 시점에 계산)
+- 시스템 메트릭 샘플러의 최근 샘플을 게이지로 함께 내보냄
+- 기록 경로는 락 없이 dict 조회 + bisect + 정수 증가만 수행 (요청당 수 마이크로초 이하, benchmarks/bench_metrics_overhead.py)
+  · gevent 그린렛에서 호출되므로 카운터 갱신이 서로 끼어들지 않음
+- 라벨 값은 URL 규칙/이벤트 이름/룸 종류처럼 개수가 한정된 값만 사용 (프로젝트 이름, 사용자 id 는 라벨로 내보내지 않음)
+"""
+
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() != 'false'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # 설정하면 /metrics 에 Bearer 토큰 필요
+METRICS_PREFIX = 'editonair'
+
+# 히스토그램 버킷 (초)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+EMIT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+STATEMENT_KINDS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+
+
+class Histogram:
+    """버킷별 개수(누적 아님)와 합계, 개수 (내보낼 때 누적으로 변환)"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def escape_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(names: Tuple[str, ...], values: Tuple[Any, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class AppMetrics:
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.started_at = time.time()
+        # (라우트, 메서드) -> Histogram, (라우트, 메서드, 상태) -> 개수
+        self.requests: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+        self.queries: Dict[str, Histogram] = {}
+        self.query_errors = 0
+        self.emits: Dict[str, Histogram] = {}
+        self._room_sizes: Optional[Callable[[], Iterable[Tuple[str, int, int]]]] = None
+        self._system_sample: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+
+    def configure(self, room_sizes: Optional[Callable[[], Iterable[Tuple[str, int, int]]]] = None,
+                  system_sample: Optional[Callable[[], Optional[Dict[str, Any]]]] = None):
+        """room_sizes: [(룸 종류, 룸 수, 인원 합계)] 반환 함수, system_sample: 최근 시스템 메트릭 샘플 반환 함수"""
+        self._room_sizes = room_sizes
+        self._system_sample = system_sample
+
+    # 기록
+    def observe_request(self, route: str, method: str, status: int, seconds: float):
+        key = (route, method)
+        histogram = self.requests.get(key)
+        if histogram is None:
+            histogram = self.requests[key] = Histogram(REQUEST_BUCKETS)
+        histogram.observe(seconds)
+        status_key = (route, method, status)
+        self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def observe_query(self, statement: str, seconds: float):
+        kind = statement.lstrip()[:6].upper()
+        if kind not in STATEMENT_KINDS:
+            kind = 'OTHER'
+        histogram = self.queries.get(kind)
+        if histogram is None:
+            histogram = self.queries[kind] = Histogram(QUERY_BUCKETS)
+        histogram.observe(seconds)
+
+    def count_query_error(self):
+        self.query_errors += 1
+
+    def observe_emit(self, event: str, seconds: float):
+        histogram = self.emits.get(event)
+        if histogram is None:
+            histogram = self.emits[event] = Histogram(EMIT_BUCKETS)
+        histogram.observe(seconds)
+
+    def reset(self):
+        self.requests.clear()
+        self.responses.clear()
+        self.queries.clear()
+        self.emits.clear()
+        self.query_errors = 0
+
+    # 내보내기
+    def _histogram_lines(self, name: str, help_text: str, label_names: Tuple[str, ...],
+                         histograms: Dict[Any, Histogram]) -> List[str]:
+        lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for key, histogram in sorted(histograms.items()):
+            values = key if isinstance(key, tuple) else (key,)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                cumulative += count
+                labels = format_labels(label_names, values, f'le="{format_value(bound)}"')
+                lines.append(f'{name}_bucket{labels} {cumulative}')
+            labels = format_labels(label_names, values)
+            lines.append(f'{name}_sum{labels} {format_value(histogram.sum)}')
+            lines.append(f'{name}_count{labels} {histogram.count}')
+        return lines
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        p = METRICS_PREFIX
+        lines = [
+            f'# HELP {p}_process_start_time_seconds 프로세스 시작 시각 (unix time)',
+            f'# TYPE {p}_process_start_time_seconds gauge',
+            f'{p}_process_start_time_seconds {format_value(self.started_at)}'
+        ]
+        lines += self._histogram_lines(f'{p}_http_request_duration_seconds', 'HTTP 요청 처리 시간 (라우트별)',
+                                       ('route', 'method'), self.requests)
+        lines += [f'# HELP {p}_http_responses_total HTTP 응답 수 (라우트/상태 코드별)',
+                  f'# TYPE {p}_http_responses_total counter']
+        for key, count in sorted(self.responses.items()):
+            lines.append(f"{p}_http_responses_total{format_labels(('route', 'method', 'status'), key)} {count}")
+        lines += self._histogram_lines(f'{p}_db_query_duration_seconds', 'DB 쿼리 실행 시간 (문장 종류별)',
+                                       ('statement',), self.queries)
+        lines += [f'# HELP {p}_db_query_errors_total DB 쿼리 오류 수', f'# TYPE {p}_db_query_errors_total counter',
+                  f'{p}_db_query_errors_total {self.query_errors}']
+        lines += self._histogram_lines(f'{p}_socketio_emit_duration_seconds', 'Socket.IO emit 시간 (이벤트별)',
+                                       ('event',), self.emits)
+
+        if self._room_sizes is not None:
+            sizes = sorted(self._room_sizes())
+            lines += [f'# HELP {p}_socketio_rooms Socket.IO 룸 수 (룸 종류별)', f'# TYPE {p}_socketio_rooms gauge']
+            lines += [f"{p}_socketio_rooms{format_labels(('kind',), (kind,))} {rooms}" for kind, rooms, _ in sizes]
+            lines += [f'# HELP {p}_socketio_room_members Socket.IO 룸 인원 합계 (룸 종류별)',
+                      f'# TYPE {p}_socketio_room_members gauge']
+            lines += [f"{p}_socketio_room_members{format_labels(('kind',), (kind,))} {members}" for kind, _, members in sizes]
+
+        sample = self._system_sample() if self._system_sample is not None else None
+        if sample:
+            for key, value in sorted(sample.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines += [f'# TYPE {p}_system_{key} gauge', f'{p}_system_{key} {format_value(value)}']
+        return '\n'.join(lines) + '\n'
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'routes': len(self.requests),
+            'requests': sum(h.count for h in self.requests.values()),
+            'queries': sum(h.count for h in self.queries.values()),
+            'emits': sum(h.count for h in self.emits.values())
+        }
+
+
+# 전역 애플리케이션 계측 인스턴스
+app_metrics = AppMetrics()
@@ -0,0 +1,180 @@
+"""
+에셋 참조 인덱스 (라이브러리 파일 -> 사용 중인 오브젝트)
+- 오브젝트 properties 의 에셋 URL(이미지 src, 시퀀스 spriteUrl 등)을 해석하여 역색인 유지
+- 프로젝트 단위로 처음 조회할 때 한 번의 쿼리로 생성, 이후 오브젝트/씬 변경은 커밋 시점에 증분 반영
+- 변경 사항은 flush 때 모아 두었다가 커밋되면 적용 (롤백되면 버림)
+- 이미지 삭제 전 사용처 경고, 프리로드, 라이브러리 정리(GC)에 사용
+"""
+
+import json
+import threading
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+
+from preload_manifest import parse_asset_url, extract_object_assets
+
+# 참조 키: (URL의 프로젝트 이름, 'image'|'sequence', 파일명 또는 시퀀스 이름)
+RefKey = Tuple[str, str, str]
+
+# 로딩 중 커밋이 반영된 경우 다시 조회하는 최대 횟수
+LOAD_ATTEMPTS = 3
+
+
+def object_references(obj_type: str, properties: Any) -> List[RefKey]:
+    """오브젝트가 참조하는 라이브러리 에셋 목록"""
+    if isinstance(properties, str):
+        try:
+            properties = json.loads(properties) if properties else {}
+        except ValueError:
+            return []
+    if not isinstance(properties, dict):
+        return []
+
+    refs = []
+    for url in extract_object_assets(obj_type, properties):
+        ref = parse_asset_url(url)
+        if ref:
+            key = (ref['project'], ref['kind'], ref['name'])
+            if key not in refs:
+                refs.append(key)
+    return refs
+
+
+class AssetReferenceIndex:
+    def __init__(self):
+        # 구조: {project_id: {object_id: (scene_id, [RefKey, ...])}}
+        self._objects: Dict[int, Dict[int, Tuple[int, List[RefKey]]]] = {}
+        # 역색인: {project_id: {RefKey: {object_id: scene_id}}}
+        self._assets: Dict[int, Dict[RefKey, Dict[int, int]]] = {}
+        self._object_projects: Dict[int, int] = {}
+        self._lock = threading.RLock()
+        # 적용된 변경 횟수 (로딩 중에 커밋된 변경이 있으면 로딩 결과를 저장하지 않음)
+        self._generation = 0
+
+    # 로딩
+    def ensure_loaded(self, project_ids: Iterable[int], load_rows: Callable[[List[int]], Iterable[Tuple]]):
+        """인덱스가 없는 프로젝트만 한 번의 쿼리로 로딩
+
+        load_rows: 프로젝트 id 목록 -> (object_id, scene_id, project_id, type, properties) 행
+        """
+        project_ids = list(project_ids)
+        for _ in range(LOAD_ATTEMPTS):
+            with self._lock:
+                missing = [pid for pid in project_ids if pid not in self._objects]
+                generation = self._generation
+            if not missing:
+                return
+
+            objects: Dict[int, Dict[int, Tuple[int, List[RefKey]]]] = {pid: {} for pid in missing}
+            for object_id, scene_id, project_id, obj_type, properties in load_rows(missing):
+                objects[project_id][object_id] = (scene_id, object_references(obj_type, properties))
+
+            with self._lock:
+                if generation != self._generation:
+                    # 조회 중 다른 요청의 커밋이 반영됨 -> 다시 조회
+                    continue
+                for project_id, entries in objects.items():
+                    self._objects[project_id] = {}
+                    self._assets[project_id] = {}
+                    for object_id, (scene_id, refs) in entries.items():
+                        self._set_object(project_id, object_id, scene_id, refs)
+                return
+
+    def is_loaded(self, project_id: int) -> bool:
+        return project_id in self._objects
+
+    # 내부 갱신
+    def _set_object(self, project_id: int, object_id: int, scene_id: int, refs: List[RefKey]):
+        self._objects[project_id][object_id] = (scene_id, refs)
+        self._object_projects[object_id] = project_id
+        assets = self._assets[project_id]
+        for key in refs:
+            assets.setdefault(key, {})[object_id] = scene_id
+
+    def _remove_object(self, object_id: int):
+        project_id = self._object_projects.pop(object_id, None)
+        if project_id is None or project_id not in self._objects:
+            return
+        entry = self._objects[project_id].pop(object_id, None)
+        if not entry:
+            return
+        assets = self._assets[project_id]
+        for key in entry[1]:
+            users = assets.get(key)
+            if users is not None:
+                users.pop(object_id, None)
+                if not users:
+                    del assets[key]
+
+    # 변경 반영 (SQLAlchemy 세션 이벤트에서 호출)
+    @staticmethod
+    def object_change(object_id: int, project_id: Optional[int], scene_id: Optional[int], obj_type: str, properties: Any) -> Tuple:
+        return ('upsert', object_id, project_id, scene_id, object_references(obj_type, properties))
+
+    @staticmethod
+    def object_removal(object_id: int) -> Tuple:
+        return ('remove', object_id)
+
+    def apply(self, changes: List[Tuple]):
+        """커밋된 변경 적용 (인덱스를 로딩하지 않은 프로젝트는 다음 로딩 때 DB에서 읽으므로 무시)"""
+        if not changes:
+            return
+        with self._lock:
+            self._generation += 1
+            for change in changes:
+                self._remove_object(change[1])
+                if change[0] == 'upsert':
+                    _, object_id, project_id, scene_id, refs = change
+                    if project_id in self._objects:
+                        self._set_object(project_id, object_id, scene_id, refs)
+
+    def forget_project(self, project_id: int):
+        with self._lock:
+            self._generation += 1
+            for object_id in self._objects.pop(project_id, {}):
+                self._object_projects.pop(object_id, None)
+            self._assets.pop(project_id, None)
+
+    def clear(self):
+        """전체 초기화 (데이터베이스 복원 등 대량 변경 후)"""
+        with self._lock:
+            self._generation += 1
+            self._objects.clear()
+            self._assets.clear()
+            self._object_projects.clear()
+
+    # 조회
+    def usages(self, project_ids: Iterable[int], library_project: str, kind: Optional[str] = None, name: Optional[str] = None) -> Dict[str, Dict[str, List[Dict[str, int]]]]:
+        """라이브러리(URL의 프로젝트 이름 기준) 에셋별 사용처
+
+        반환값: {'images': {파일명: [{'project_id', 'scene_id', 'object_id'}]}, 'sequences': {...}}
+        """
+        result = {'images': {}, 'sequences': {}}
+        with self._lock:
+            for project_id in project_ids:
+                for (ref_project, ref_kind, ref_name), users in self._assets.get(project_id, {}).items():
+                    if ref_project != library_project:
+                        continue
+                    if (kind and ref_kind != kind) or (name is not None and ref_name != name):
+                        continue
+                    bucket = result['images' if ref_kind == 'image' else 'sequences'].setdefault(ref_name, [])
+                    bucket.extend(
+                        {'project_id': project_id, 'scene_id': scene_id, 'object_id': object_id}
+                        for object_id, scene_id in sorted(users.items())
+                    )
+        return result
+
+    def referenced_names(self, project_ids: Iterable[int], library_project: str, kind: str) -> set:
+        """라이브러리에서 참조 중인 파일명/시퀀스 이름 집합"""
+        return set(self.usages(project_ids, library_project, kind)['images' if kind == 'image' else 'sequences'])
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'projects': len(self._objects),
+                'objects': len(self._object_projects),
+                'assets': sum(len(assets) for assets in self._assets.values())
+            }
+
+
+# 전역 에셋 참조 인덱스 인스턴스
+asset_references = AssetReferenceIndex()
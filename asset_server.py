@@ -0,0 +1,416 @@
+"""
+라이브러리 에셋 서빙 (HTTP 캐시)
+- 파일 콘텐츠 해시로 강한 ETag 생성, If-None-Match 요청은 304로 응답 (파일 본문 전송 없음)
+- URL에 ?v=<콘텐츠 해시> 가 붙어 있고 현재 파일과 일치하면 immutable 캐시 헤더 설정
+- 그 외에는 no-cache (매번 ETag로 재검증)
+- 파일 해시는 (경로, 크기, mtime) 기준으로 캐시하여 변경된 파일만 다시 계산
+- 프로젝트 폴더 경로 해석 결과를 캐시하여 반복 요청 시 DB 조회 없음
+- HTTP Range 요청 지원 (206 Partial Content)
+- 리버스 프록시가 있으면 파일 전송을 프록시에 위임 (nginx X-Accel-Redirect / X-Sendfile)
+- 프록시가 없으면 큰 블록 단위로 전송하고, 자주 요청되는 큰 파일(스프라이트 등)은 mmap으로 읽음
+- 작은 에셋(이미지, 썸네일, 팩)은 파일 내용과 헤더 정보를 메모리 LRU 캐시에 보관하여
+  파일 시스템 접근 없이 전송 (업로드/삭제 시 라이브러리 단위로 무효화)
+"""
+
+import os
+import mmap
+import time
+import hashlib
+import mimetypes
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional, Tuple
+from urllib.parse import quote
+
+from flask import jsonify, request, Response
+from werkzeug.security import safe_join
+from werkzeug.wsgi import FileWrapper
+
+# URL 버전 파라미터(v)에 사용하는 해시 길이
+ASSET_VERSION_LENGTH = 16
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60  # 1년
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# 전송 블록 크기 (Werkzeug 기본값 8KB 대신 큰 블록으로 전송하여 파이썬 루프 횟수 감소)
+ASSET_BLOCK_SIZE = int(os.environ.get('ASSET_BLOCK_SIZE', 256 * 1024))
+
+# 프록시 위임 설정
+# ASSET_OFFLOAD: '' (사용 안 함) | 'x-accel-redirect' (nginx) | 'x-sendfile' (Apache/lighttpd)
+ASSET_OFFLOAD = os.environ.get('ASSET_OFFLOAD', '').lower()
+ASSET_OFFLOAD_ROOT = os.environ.get('ASSET_OFFLOAD_ROOT', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'projects'))
+ASSET_ACCEL_PREFIX = os.environ.get('ASSET_ACCEL_PREFIX', '/_protected_assets/')
+
+# mmap 설정 (이 크기 이상이고 ASSET_MMAP_HOT_HITS 번 이상 요청된 파일만 매핑)
+ASSET_MMAP_ENABLED = os.environ.get('ASSET_MMAP', 'true').lower() == 'true'
+ASSET_MMAP_MIN_SIZE = int(os.environ.get('ASSET_MMAP_MIN_SIZE', 1024 * 1024))
+ASSET_MMAP_HOT_HITS = int(os.environ.get('ASSET_MMAP_HOT_HITS', 3))
+ASSET_MMAP_MAX_FILES = int(os.environ.get('ASSET_MMAP_MAX_FILES', 32))
+
+# 메모리 캐시 설정 (전체 크기 / 파일당 최대 크기 / 파일 변경 재확인 주기)
+ASSET_CACHE_ENABLED = os.environ.get('ASSET_CACHE', 'true').lower() == 'true'
+ASSET_CACHE_MAX_BYTES = int(os.environ.get('ASSET_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+ASSET_CACHE_MAX_FILE_SIZE = int(os.environ.get('ASSET_CACHE_MAX_FILE_SIZE', 4 * 1024 * 1024))
+ASSET_CACHE_REVALIDATE_SECONDS = float(os.environ.get('ASSET_CACHE_REVALIDATE_SECONDS', 10))
+ASSET_LOOKUP_MAX_ENTRIES = int(os.environ.get('ASSET_LOOKUP_MAX_ENTRIES', 10000))  # 조회 결과 메모 최대 개수
+
+
+def compute_file_hash(file_path: str) -> str:
+    """파일 SHA-256 해시 계산"""
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+class MappedFileReader:
+    """공유 mmap 위에서 요청별로 독립된 읽기 위치를 가지는 파일 객체"""
+
+    def __init__(self, mapped: mmap.mmap):
+        self._mapped = mapped
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._mapped) if size is None or size < 0 else min(self._pos + size, len(self._mapped))
+        data = self._mapped[self._pos:end]
+        self._pos = end
+        return data
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += len(self._mapped)
+        self._pos = max(0, min(offset, len(self._mapped)))
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self):
+        # 매핑은 여러 요청이 공유하므로 닫지 않음 (참조가 없어지면 자동 해제)
+        self._mapped = None
+
+
+class AssetServer:
+    def __init__(self, offload: str = None, mmap_enabled: bool = None, mmap_min_size: int = None,
+                 mmap_hot_hits: int = None, block_size: int = None, cache_enabled: bool = None,
+                 cache_max_bytes: int = None):
+        # 프로젝트 폴더 경로 캐시 {(project_name, user_id, username): project_folder}
+        self._folders: Dict[Tuple, str] = {}
+        # 파일 해시 캐시 {path: (size, mtime_ns, sha256)}
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+        self.offload = ASSET_OFFLOAD if offload is None else offload
+        self.offload_root = os.path.realpath(ASSET_OFFLOAD_ROOT)
+        self.mmap_enabled = ASSET_MMAP_ENABLED if mmap_enabled is None else mmap_enabled
+        self.mmap_min_size = ASSET_MMAP_MIN_SIZE if mmap_min_size is None else mmap_min_size
+        self.mmap_hot_hits = ASSET_MMAP_HOT_HITS if mmap_hot_hits is None else mmap_hot_hits
+        self.block_size = block_size or ASSET_BLOCK_SIZE
+
+        # 큰 파일 요청 횟수 {path: count}, mmap 캐시 {path: (size, mtime_ns, mmap)} (LRU)
+        self._hits: Dict[str, int] = {}
+        self._mapped: OrderedDict = OrderedDict()
+        self._stats = {'offloaded': 0, 'mmap_served': 0, 'file_served': 0, 'not_modified': 0, 'partial': 0}
+
+        # 메모리 캐시 {path: entry} (LRU), 조회 결과 메모 {key: (path, value)} (LRU)
+        self.cache_enabled = ASSET_CACHE_ENABLED if cache_enabled is None else cache_enabled
+        self.cache_max_bytes = ASSET_CACHE_MAX_BYTES if cache_max_bytes is None else cache_max_bytes
+        self._memory: OrderedDict = OrderedDict()
+        self._memory_bytes = 0
+        self._lookups: OrderedDict = OrderedDict()
+        self._cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    # 경로 해석 캐시
+    def resolve_folder(self, key: Tuple, lookup: Callable[[], Optional[str]]) -> Optional[str]:
+        """캐시된 프로젝트 폴더 반환 (없으면 lookup 호출, 찾은 경우에만 캐시)"""
+        folder = self._folders.get(key)
+        if folder is None:
+            folder = lookup()
+            if folder is not None:
+                with self._lock:
+                    self._folders[key] = folder
+        return folder
+
+    def invalidate_folders(self):
+        """프로젝트 이름 변경/삭제, 복원 시 경로 캐시 초기화"""
+        with self._lock:
+            self._folders.clear()
+
+    # 콘텐츠 해시
+    def file_hash(self, file_path: str, stat: os.stat_result = None) -> str:
+        if stat is None:
+            stat = os.stat(file_path)
+        cached = self._hashes.get(file_path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        digest = compute_file_hash(file_path)
+        with self._lock:
+            self._hashes[file_path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def asset_version(self, file_path: str) -> Optional[str]:
+        """URL에 붙일 버전 문자열 (?v=...)"""
+        try:
+            return self.file_hash(file_path)[:ASSET_VERSION_LENGTH]
+        except OSError:
+            return None
+
+    def forget(self, file_path: str):
+        """삭제된 파일의 해시/mmap/메모리 캐시 제거"""
+        self.invalidate_prefix(file_path)
+
+    def invalidate_prefix(self, path: str):
+        """경로(파일 또는 폴더) 아래의 모든 캐시 제거 (업로드/삭제/복원 시 라이브러리 단위로 호출)"""
+        prefix = os.path.normpath(path)
+        folder_prefix = prefix + os.sep
+
+        def matches(key):
+            return key == prefix or key.startswith(folder_prefix)
+
+        with self._lock:
+            for cache in (self._hashes, self._hits, self._mapped):
+                for key in [k for k in cache if matches(os.path.normpath(k))]:
+                    del cache[key]
+            for key in [k for k in self._memory if matches(k)]:
+                self._memory_bytes -= len(self._memory.pop(key)['data'])
+                self._cache_stats['invalidations'] += 1
+            for key in [k for k, (p, _) in self._lookups.items() if matches(p)]:
+                del self._lookups[key]
+
+    def clear_cache(self):
+        """메모리 캐시 전체 비우기"""
+        with self._lock:
+            self._cache_stats['invalidations'] += len(self._memory)
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._lookups.clear()
+
+    def lookup(self, key: Tuple, path: str, compute: Callable[[], Any]) -> Any:
+        """파일 시스템 조회 결과 메모 (예: 변형 이미지 선택), path 기준으로 함께 무효화"""
+        with self._lock:
+            cached = self._lookups.get(key)
+            if cached is not None:
+                self._lookups.move_to_end(key)
+                return cached[1]
+        value = compute()
+        with self._lock:
+            self._lookups[key] = (os.path.normpath(path), value)
+            while len(self._lookups) > ASSET_LOOKUP_MAX_ENTRIES:
+                self._lookups.popitem(last=False)
+        return value
+
+    # 메모리 캐시
+    def _memory_get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_enabled:
+            return None
+        with self._lock:
+            entry = self._memory.get(file_path)
+            if entry is None:
+                return None
+
+            # 업로드/삭제 API를 거치지 않은 변경(직접 복사 등)에 대비해 주기적으로 재확인
+            now = time.monotonic()
+            if now - entry['checked_at'] > ASSET_CACHE_REVALIDATE_SECONDS:
+                try:
+                    stat = os.stat(file_path)
+                    valid = stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']
+                except OSError:
+                    valid = False
+                if not valid:
+                    self._memory_bytes -= len(self._memory.pop(file_path)['data'])
+                    self._cache_stats['invalidations'] += 1
+                    return None
+                entry['checked_at'] = now
+
+            self._memory.move_to_end(file_path)
+            self._cache_stats['hits'] += 1
+            return entry
+
+    def _memory_put(self, file_path: str, stat: os.stat_result, etag: str, mimetype: str,
+                    source_hash: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_enabled or stat.st_size > min(ASSET_CACHE_MAX_FILE_SIZE, self.cache_max_bytes):
+            return None
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if len(data) != stat.st_size:
+            return None
+
+        entry = {
+            'data': data,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'mtime_ns': stat.st_mtime_ns,
+            'etag': etag,
+            'source_hash': source_hash,
+            'mimetype': mimetype,
+            'checked_at': time.monotonic()
+        }
+        with self._lock:
+            previous = self._memory.pop(file_path, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous['data'])
+            self._memory[file_path] = entry
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.cache_max_bytes and self._memory:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted['data'])
+                self._cache_stats['evictions'] += 1
+        return entry
+
+    # 전송
+    def send(self, directory: str, filename: str, mimetype: str = None, version_path: str = None):
+        """에셋 파일 전송 (ETag / Last-Modified / 304 / Range / 캐시 헤더)
+
+        version_path: ?v= 값과 비교할 원본 파일 경로 (변형 이미지를 보낼 때 원본 기준으로 판단)
+        """
+        file_path = safe_join(directory, filename)
+        if file_path is None:
+            return jsonify({'error': 'File not found'}), 404
+        file_path = os.path.normpath(file_path)
+
+        # 메모리 캐시 적중 시 파일 시스템 접근 없이 전송
+        entry = self._memory_get(file_path)
+        if entry is None:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                return jsonify({'error': 'File not found'}), 404
+            if not os.path.isfile(file_path):
+                return jsonify({'error': 'File not found'}), 404
+
+            etag = self.file_hash(file_path, stat)
+            if mimetype is None:
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            try:
+                source_hash = etag if version_path is None else self.file_hash(version_path)
+            except OSError:
+                source_hash = None
+
+            response = self._offload_response(file_path, mimetype)
+            if response is None:
+                if self.cache_enabled:
+                    self._cache_stats['misses'] += 1
+                entry = self._memory_put(file_path, stat, etag, mimetype, source_hash)
+
+        if entry is not None:
+            source_hash = entry['source_hash']
+            response = Response(entry['data'], mimetype=entry['mimetype'])
+            response.set_etag(entry['etag'])
+            response.last_modified = entry['mtime']
+            response.make_conditional(request.environ, accept_ranges=True, complete_length=entry['size'])
+        elif response is not None:
+            self._stats['offloaded'] += 1
+            response.set_etag(etag)
+            response.last_modified = stat.st_mtime
+            response.make_conditional(request.environ)
+        else:
+            mapped = self._get_mapped(file_path, stat)
+            if mapped is not None:
+                self._stats['mmap_served'] += 1
+                body = FileWrapper(MappedFileReader(mapped), self.block_size)
+            else:
+                self._stats['file_served'] += 1
+                # WSGI 서버가 file_wrapper를 제공하면 사용 (gunicorn 등은 sendfile로 전송)
+                wrapper = request.environ.get('wsgi.file_wrapper', FileWrapper)
+                body = wrapper(open(file_path, 'rb'), self.block_size)
+
+            response = Response(body, mimetype=mimetype, direct_passthrough=True)
+            response.content_length = stat.st_size
+            response.set_etag(etag)
+            response.last_modified = stat.st_mtime
+            response.make_conditional(request.environ, accept_ranges=True, complete_length=stat.st_size)
+
+        if response.status_code == 304:
+            self._stats['not_modified'] += 1
+        elif response.status_code == 206:
+            self._stats['partial'] += 1
+
+        version = request.args.get('v')
+        immutable = bool(version and source_hash and len(version) >= 8 and source_hash.startswith(version))
+        if immutable:
+            response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def _offload_response(self, file_path: str, mimetype: str) -> Optional[Response]:
+        """프록시 위임 응답 (본문 없이 헤더만, 위임 대상이 아니면 None)"""
+        if self.offload not in ('x-accel-redirect', 'x-sendfile'):
+            return None
+        real_path = os.path.realpath(file_path)
+        relative = os.path.relpath(real_path, self.offload_root)
+        if relative.startswith('..'):
+            return None
+
+        response = Response(mimetype=mimetype)
+        if self.offload == 'x-accel-redirect':
+            # nginx internal location 예: location /_protected_assets/ { internal; alias /app/projects/; }
+            response.headers['X-Accel-Redirect'] = ASSET_ACCEL_PREFIX.rstrip('/') + '/' + quote(relative.replace(os.sep, '/'))
+        else:
+            response.headers['X-Sendfile'] = real_path
+        response.headers['Accept-Ranges'] = 'bytes'
+        return response
+
+    # mmap
+    def _get_mapped(self, file_path: str, stat: os.stat_result) -> Optional[mmap.mmap]:
+        """자주 요청되는 큰 파일의 mmap 반환 (조건에 맞지 않으면 None)
+
+        매핑한 파일을 제자리에서 다시 쓰면(잘라내기) 매핑을 읽는 요청이 SIGBUS 로 죽으므로
+        라이브러리 파일은 항상 임시 파일에 쓴 뒤 os.replace 로 교체해야 함 (업로드, 이미지 최적화)
+        """
+        if not self.mmap_enabled or stat.st_size < self.mmap_min_size:
+            return None
+
+        with self._lock:
+            cached = self._mapped.get(file_path)
+            if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                self._mapped.move_to_end(file_path)
+                return cached[2]
+
+            hits = self._hits.get(file_path, 0) + 1
+            self._hits[file_path] = hits
+            if hits < self.mmap_hot_hits:
+                return None
+
+            try:
+                with open(file_path, 'rb') as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ mmap 실패: {file_path}, {e}")
+                return None
+
+            # 교체된 파일의 이전 매핑은 진행 중인 요청이 끝나면 해제됨
+            self._mapped[file_path] = (stat.st_size, stat.st_mtime_ns, mapped)
+            self._mapped.move_to_end(file_path)
+            while len(self._mapped) > ASSET_MMAP_MAX_FILES:
+                self._mapped.popitem(last=False)
+            return mapped
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'cached_folders': len(self._folders),
+            'cached_hashes': len(self._hashes),
+            'cached_lookups': len(self._lookups),
+            'mapped_files': len(self._mapped),
+            'mapped_bytes': sum(entry[0] for entry in self._mapped.values()),
+            'offload': self.offload or None,
+            **self._stats,
+            'memory_cache': {
+                'enabled': self.cache_enabled,
+                'entries': len(self._memory),
+                'bytes': self._memory_bytes,
+                'max_bytes': self.cache_max_bytes,
+                **self._cache_stats
+            }
+        }
+
+
+# 전역 에셋 서버 인스턴스
+asset_server = AssetServer()
@@ -7,6 +7,13 @@ import json
 import zipfile
 from pathlib import Path
 
+from library_scanner import library_scanner
+from sql_dump import write_sql_dump
+from streaming_zip import write_zip
+
+# SQL 덤프 대상 테이블 (부모 테이블 먼저)
+SQL_DUMP_TABLES = ['user', 'project', 'scene', 'objects', 'project_permission']
+
 def get_database_url():
     """데이터베이스 URL 가져오기"""
     # 환경 변수에서 DATABASE_URL 가져오기
@@ -17,7 +24,7 @@ def get_database_url():
     return db_url
 
 def backup_postgres_db(backup_dir, timestamp):
-    """PostgreSQL 데이터베이스 백업 (SQLAlchemy 기반)"""
+    """PostgreSQL 데이터베이스 백업 (SQLAlchemy 기반, sql_dump 로 테이블별 스트리밍 기록)"""
     try:
         # 백업 파일 경로
         backup_file = os.path.join(backup_dir, f'database_{timestamp}.sql')
@@ -26,94 +33,32 @@ def backup_postgres_db(backup_dir, timestamp):
         try:
             from flask import current_app
             app_context = current_app.app_context()
+            db = current_app.extensions['sqlalchemy']
         except RuntimeError:
             # Flask 앱 컨텍스트가 없으면 직접 import
             import sys
-            import os
             sys.path.append(os.path.dirname(__file__))
-            from app import app, db, User, Project, Scene, Object, ProjectPermission
+            from app import app, db
             app_context = app.app_context()
         
         with app_context:
-            backup_content = []
-            backup_content.append("-- EditOnair Database Backup")
-            backup_content.append(f"-- Generated: {datetime.now().isoformat()}")
-            backup_content.append("-- ")
-            backup_content.append("")
-            
+            tables = [db.metadata.tables[name] for name in SQL_DUMP_TABLES]
+            tmp_file = backup_file + '.tmp'
             try:
-                # 사용자 테이블 백업
-                users = User.query.all()
-                if users:
-                    backup_content.append("-- User Table")
-                    backup_content.append("DELETE FROM \"user\" WHERE id IN (SELECT id FROM \"user\");")
-                    for user in users:
-                        created_at = user.created_at.isoformat() if user.created_at else 'NULL'
-                        backup_content.append(f"INSERT INTO \"user\" (id, username, password, created_at, is_active) VALUES ({user.id}, '{user.username}', '{user.password}', '{created_at}', {user.is_active});")
-                    backup_content.append("")
-                
-                # 프로젝트 테이블 백업
-                projects = Project.query.all()
-                if projects:
-                    backup_content.append("-- Project Table")
-                    backup_content.append("DELETE FROM project WHERE id IN (SELECT id FROM project);")
-                    for project in projects:
-                        created_at = project.created_at.isoformat() if project.created_at else 'NULL'
-                        updated_at = project.updated_at.isoformat() if project.updated_at else 'NULL'
-                        backup_content.append(f"INSERT INTO project (id, name, created_at, updated_at, user_id) VALUES ({project.id}, '{project.name}', '{created_at}', '{updated_at}', {project.user_id});")
-                    backup_content.append("")
-                
-                # 씬 테이블 백업
-                scenes = Scene.query.all()
-                if scenes:
-                    backup_content.append("-- Scene Table")
-                    backup_content.append("DELETE FROM scene WHERE id IN (SELECT id FROM scene);")
-                    for scene in scenes:
-                        created_at = scene.created_at.isoformat() if scene.created_at else 'NULL'
-                        updated_at = scene.updated_at.isoformat() if scene.updated_at else 'NULL'
-                        backup_content.append(f"INSERT INTO scene (id, project_id, name, \"order\", duration, created_at, updated_at) VALUES ({scene.id}, {scene.project_id}, '{scene.name}', {scene.order}, {scene.duration}, '{created_at}', '{updated_at}');")
-                    backup_content.append("")
-                
-                # 객체 테이블 백업
-                objects = Object.query.all()
-                if objects:
-                    backup_content.append("-- Objects Table")
-                    backup_content.append("DELETE FROM objects WHERE id IN (SELECT id FROM objects);")
-                    for obj in objects:
-                        # JSON 문자열을 이스케이프
-                        properties = obj.properties.replace("'", "''") if obj.properties else ''
-                        in_motion = obj.in_motion.replace("'", "''") if obj.in_motion else ''
-                        out_motion = obj.out_motion.replace("'", "''") if obj.out_motion else ''
-                        timing = obj.timing.replace("'", "''") if obj.timing else ''
-                        
-                        created_at = obj.created_at.isoformat() if obj.created_at else 'NULL'
-                        updated_at = obj.updated_at.isoformat() if obj.updated_at else 'NULL'
-                        
-                        backup_content.append(f"INSERT INTO objects (id, name, type, \"order\", properties, in_motion, out_motion, timing, scene_id, created_at, updated_at) VALUES ({obj.id}, '{obj.name}', '{obj.type}', {obj.order}, '{properties}', '{in_motion}', '{out_motion}', '{timing}', {obj.scene_id}, '{created_at}', '{updated_at}');")
-                    backup_content.append("")
-                
-                # 프로젝트 권한 테이블 백업
-                permissions = ProjectPermission.query.all()
-                if permissions:
-                    backup_content.append("-- Project Permission Table")
-                    backup_content.append("DELETE FROM project_permission WHERE id IN (SELECT id FROM project_permission);")
-                    for perm in permissions:
-                        created_at = perm.created_at.isoformat() if perm.created_at else 'NULL'
-                        updated_at = perm.updated_at.isoformat() if perm.updated_at else 'NULL'
-                        backup_content.append(f"INSERT INTO project_permission (id, project_id, user_id, permission_type, created_at, updated_at) VALUES ({perm.id}, {perm.project_id}, {perm.user_id}, '{perm.permission_type}', '{created_at}', '{updated_at}');")
-                    backup_content.append("")
+                # 행을 배치 단위로 읽으면서 바로 기록 (다 쓴 뒤 파일 교체)
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    counts = write_sql_dump(db.session, tables, f)
+                os.replace(tmp_file, backup_file)
                 
-                # 백업 내용을 파일에 저장
-                backup_sql = "\n".join(backup_content)
-                with open(backup_file, 'w', encoding='utf-8') as f:
-                    f.write(backup_sql)
-                
-                print(f'PostgreSQL database backed up to: {backup_file}')
+                print(f'PostgreSQL database backed up to: {backup_file} ({counts})')
                 return True
                 
             except Exception as e:
                 print(f'Error creating backup content: {e}')
                 return False
+            finally:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
                 
     except Exception as e:
         print(f'Error backing up PostgreSQL database: {e}')
@@ -143,74 +88,35 @@ def backup_project_files(backup_dir, timestamp):
         print(f'Error backing up project files: {e}')
         return False
 
-def get_project_library_info():
-    """프로젝트별 라이브러리 정보 수집"""
-    projects_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'projects')
-    if not os.path.exists(projects_dir):
-        return {}
+def get_project_library_info(scan=None):
+    """프로젝트별 라이브러리 정보 수집 (library_scanner 스캔 결과 사용)"""
+    scan = scan or library_scanner.scan()
     
     libraries_info = {}
     
-    for project_dir in os.listdir(projects_dir):
-        project_path = os.path.join(projects_dir, project_dir)
-        if not os.path.isdir(project_path):
-            continue
-            
-        library_path = os.path.join(project_path, 'library')
-        if not os.path.exists(library_path):
-            libraries_info[project_dir] = {
-                'images_count': 0,
-                'images_size': '0B',
-                'sequences_count': 0,
-                'sequences_size': '0B',
-                'thumbnails_count': 0,
-                'thumbnails_size': '0B'
-            }
-            continue
-        
-        # 이미지 정보
-        images_path = os.path.join(library_path, 'images')
-        images_count = 0
-        images_size = 0
-        if os.path.exists(images_path):
-            for file in os.listdir(images_path):
-                if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
-                    file_path = os.path.join(images_path, file)
-                    if os.path.isfile(file_path):
-                        images_count += 1
-                        images_size += os.path.getsize(file_path)
-        
-        # 썸네일 정보
-        thumbnails_path = os.path.join(library_path, 'thumbnails')
-        thumbnails_count = 0
-        thumbnails_size = 0
-        if os.path.exists(thumbnails_path):
-            for file in os.listdir(thumbnails_path):
-                if file.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
-                    file_path = os.path.join(thumbnails_path, file)
-                    if os.path.isfile(file_path):
-                        thumbnails_count += 1
-                        thumbnails_size += os.path.getsize(file_path)
-        
-        # 시퀀스 정보
-        sequences_path = os.path.join(library_path, 'sequences')
-        sequences_count = 0
+    for project_key, project in scan['projects'].items():
+        images_count = images_size = 0
+        thumbnails_count = thumbnails_size = 0
+        sequences = set()
         sequences_size = 0
-        if os.path.exists(sequences_path):
-            for seq_dir in os.listdir(sequences_path):
-                seq_path = os.path.join(sequences_path, seq_dir)
-                if os.path.isdir(seq_path):
-                    sequences_count += 1
-                    # 시퀀스 폴더 내 모든 파일 크기 합계
-                    for root, dirs, files in os.walk(seq_path):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            sequences_size += os.path.getsize(file_path)
         
-        libraries_info[project_dir] = {
+        for file in project['files']:
+            parts = file['path'].split('/')
+            if len(parts) == 2 and parts[0] == 'images' and parts[1].lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
+                images_count += 1
+                images_size += file['size']
+            elif len(parts) == 2 and parts[0] == 'thumbnails' and parts[1].lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
+                thumbnails_count += 1
+                thumbnails_size += file['size']
+            elif len(parts) >= 3 and parts[0] == 'sequences':
+                # 시퀀스 폴더 내 모든 파일 크기 합계
+                sequences.add(parts[1])
+                sequences_size += file['size']
+        
+        libraries_info[project_key] = {
             'images_count': images_count,
             'images_size': f'{images_size}B',
-            'sequences_count': sequences_count,
+            'sequences_count': len(sequences),
             'sequences_size': f'{sequences_size}B',
             'thumbnails_count': thumbnails_count,
             'thumbnails_size': f'{thumbnails_size}B'
@@ -241,26 +147,34 @@ def backup_project_libraries(backup_dir, timestamp):
     # 백업 파일 경로
     backup_file = os.path.join(backup_dir, f'libraries_{timestamp}.zip')
     
+    def library_entries():
+        for project_dir in os.listdir(projects_dir):
+            project_path = os.path.join(projects_dir, project_dir)
+            if not os.path.isdir(project_path):
+                continue
+            
+            library_path = os.path.join(project_path, 'library')
+            if not os.path.exists(library_path):
+                continue
+            
+            # 프로젝트별 라이브러리 폴더를 ZIP에 추가
+            for root, dirs, files in os.walk(library_path):
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    # ZIP 내에서의 상대 경로
+                    arcname = os.path.join(f'project_{project_dir}', 
+                                         os.path.relpath(file_path, project_path))
+                    yield arcname, file_path
+    
+    def on_entry(arcname, error):
+        if error:
+            print(f'Failed to add to backup: {arcname} ({error})')
+        else:
+            print(f'Added to backup: {arcname}')
+    
     try:
-        with zipfile.ZipFile(backup_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for project_dir in os.listdir(projects_dir):
-                project_path = os.path.join(projects_dir, project_dir)
-                if not os.path.isdir(project_path):
-                    continue
-                
-                library_path = os.path.join(project_path, 'library')
-                if not os.path.exists(library_path):
-                    continue
-                
-                # 프로젝트별 라이브러리 폴더를 ZIP에 추가
-                for root, dirs, files in os.walk(library_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        # ZIP 내에서의 상대 경로
-                        arcname = os.path.join(f'project_{project_dir}', 
-                                             os.path.relpath(file_path, project_path))
-                        zipf.write(file_path, arcname)
-                        print(f'Added to backup: {arcname}')
+        # 이미지 등 압축된 형식은 그대로 저장, 나머지는 스레드 풀에서 압축 (streaming_zip 압축 정책)
+        write_zip(backup_file, library_entries(), on_entry=on_entry)
         
         print(f'Project libraries backed up to: {backup_file}')
         return True
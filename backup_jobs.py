@@ -0,0 +1,280 @@
+"""
+백업/복구 백그라운드 작업
+- HTTP 요청 안에서 백업/복구를 실행하지 않고 작업 큐에 넣은 뒤 바로 응답 (프록시 타임아웃, 워커 점유 방지)
+- 작업은 전용 스레드 하나가 순서대로 실행 (백업과 복구가 동시에 돌지 않음)
+  · 대기 작업이 없으면 스레드 종료 (gevent 패치 전에 만든 락/큐에서 대기하지 않도록 블로킹 대기 없음)
+- 작업 상태는 backups/jobs/<job_id>/job.json 에 저장 (서버 재시작 후에도 조회 가능)
+  · 재시작 시 대기 중이던 작업은 다시 큐에 넣고, 실행 중이던 작업은 interrupted 로 표시
+- 백업 결과(ZIP)와 복구용 업로드 파일은 작업 폴더에 디스크로 기록
+- 진행상황이 바뀔 때마다 on_update 콜백 호출 (Socket.IO 전송용)
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+
+BACKUP_JOBS_DIR = os.environ.get(
+    'BACKUP_JOBS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backups', 'jobs')
+)
+BACKUP_JOB_TTL = int(os.environ.get('BACKUP_JOB_TTL', 7 * 24 * 60 * 60))  # 끝난 작업(과 결과 파일) 보관 기간 (초)
+
+JOB_FILENAME = 'job.json'
+UPLOAD_FILENAME = 'upload.zip'
+ARTIFACT_FILENAME = 'backup.zip'
+COPY_BLOCK_SIZE = 1024 * 1024
+
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled', 'interrupted')
+
+# 작업 처리 함수: (작업 상태, progress(step, message, percentage), 작업 폴더) -> 결과 dict
+JobHandler = Callable[[Dict[str, Any], Callable[[str, str, Optional[int]], None], str], Dict[str, Any]]
+
+
+class JobError(Exception):
+    """백업 작업 오류 (HTTP 상태 코드 포함)"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class BackupJobRunner:
+    def __init__(self, jobs_dir: str):
+        self.jobs_dir = jobs_dir
+        self._handlers: Dict[str, JobHandler] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._worker: Optional[threading.Thread] = None
+        self._context: Optional[Callable] = None
+        self._on_update: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    def configure(self, context: Callable, on_update: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """context: 작업 스레드에서 DB를 쓰기 위한 앱 컨텍스트 팩토리, on_update: 상태 변경 알림"""
+        self._context = context
+        self._on_update = on_update
+
+    def register(self, job_type: str, handler: JobHandler):
+        self._handlers[job_type] = handler
+
+    # 경로 헬퍼
+    def job_dir(self, job_id: str) -> str:
+        if not job_id or not all(c in '0123456789abcdef' for c in job_id):
+            raise JobError('Invalid job id', 404)
+        return os.path.join(self.jobs_dir, job_id)
+
+    def file_path(self, job_id: str, filename: str) -> str:
+        return os.path.join(self.job_dir(job_id), filename)
+
+    def _save(self, job: Dict[str, Any]):
+        path = self.file_path(job['id'], JOB_FILENAME)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _ensure_loaded(self):
+        """저장된 작업 상태 읽기 (프로세스에서 처음 한 번)"""
+        requeue = []
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                names = sorted(os.listdir(self.jobs_dir))
+            except OSError:
+                names = []
+            for name in names:
+                try:
+                    with open(os.path.join(self.jobs_dir, name, JOB_FILENAME), 'r', encoding='utf-8') as f:
+                        job = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if job.get('status') == 'running':
+                    job['status'] = 'interrupted'
+                    job['error'] = '서버가 다시 시작되어 작업이 중단되었습니다.'
+                    job['finished_at'] = datetime.utcnow().isoformat()
+                    self._save(job)
+                elif job.get('status') == 'queued':
+                    requeue.append(job)
+                self._jobs[job['id']] = job
+        if requeue:
+            print(f"🔁 대기 중이던 백업 작업 {len(requeue)}개를 다시 큐에 넣었습니다.")
+            self._enqueue(*[job['id'] for job in sorted(requeue, key=lambda j: j['created_at'])])
+
+    def _enqueue(self, *job_ids: str):
+        """대기열에 추가하고 실행 스레드가 없으면 시작 (락을 잡은 채로 스레드를 시작하지 않음)"""
+        with self._lock:
+            self._pending.extend(job_ids)
+            worker = None
+            if self._worker is None:
+                worker = self._worker = threading.Thread(target=self._work, daemon=True)
+        if worker is not None:
+            worker.start()
+
+    # 작업 관리
+    def submit(self, job_type: str, user_id, params: Dict[str, Any], upload=None) -> Dict[str, Any]:
+        """작업 등록 후 큐에 추가 (upload: 작업 폴더에 upload.zip 으로 저장할 파일 객체)"""
+        if job_type not in self._handlers:
+            raise JobError(f'Unknown job type: {job_type}')
+        self._ensure_loaded()
+        self.cleanup_expired()
+
+        job_id = uuid.uuid4().hex
+        job_dir = self.job_dir(job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        if upload is not None:
+            try:
+                with open(os.path.join(job_dir, UPLOAD_FILENAME), 'wb') as f:
+                    shutil.copyfileobj(upload, f, COPY_BLOCK_SIZE)
+            except OSError:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                raise
+
+        job = {
+            'id': job_id,
+            'type': job_type,
+            'status': 'queued',
+            'user_id': user_id,
+            'params': params,
+            'progress': {'step': 'queued', 'message': '작업 대기 중입니다...', 'percentage': 0},
+            'result': None,
+            'artifact': None,
+            'error': None,
+            'created_at': datetime.utcnow().isoformat(),
+            'started_at': None,
+            'finished_at': None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            self._save(job)
+        self._enqueue(job_id)
+        self._notify(job)
+        return dict(job)
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        self._ensure_loaded()
+        self.job_dir(job_id)
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise JobError('Job not found', 404)
+        return dict(job)
+
+    def list_jobs(self, job_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        self._ensure_loaded()
+        jobs = [dict(job) for job in self._jobs.values() if job_type is None or job['type'] == job_type]
+        return sorted(jobs, key=lambda job: job['created_at'], reverse=True)
+
+    def set_artifact(self, job: Dict[str, Any], artifact: Dict[str, Any]):
+        """작업 결과 파일 정보 기록 (처리 함수에서 호출)"""
+        job['artifact'] = artifact
+        with self._lock:
+            self._save(job)
+
+    def delete(self, job_id: str) -> Dict[str, Any]:
+        """대기 중이면 취소, 끝난 작업이면 결과 파일과 함께 삭제"""
+        job = self._jobs.get(self.get(job_id)['id'])
+        with self._lock:
+            if job['status'] == 'running':
+                raise JobError('실행 중인 작업은 삭제할 수 없습니다.', 409)
+            if job['status'] == 'queued':
+                # 큐에서 꺼낼 때 건너뜀
+                job['status'] = 'cancelled'
+                job['finished_at'] = datetime.utcnow().isoformat()
+                self._save(job)
+                upload_path = self.file_path(job_id, UPLOAD_FILENAME)
+                if os.path.exists(upload_path):
+                    os.remove(upload_path)
+            else:
+                self._jobs.pop(job_id, None)
+                shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+        self._notify(job)
+        return dict(job)
+
+    def cleanup_expired(self):
+        """보관 기간이 지난 작업 정리"""
+        cutoff = datetime.utcfromtimestamp(time.time() - BACKUP_JOB_TTL).isoformat()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job['status'] in FINISHED_STATUSES and (job.get('finished_at') or job['created_at']) < cutoff]
+            for job_id in expired:
+                self._jobs.pop(job_id, None)
+                shutil.rmtree(os.path.join(self.jobs_dir, job_id), ignore_errors=True)
+        if expired:
+            print(f"🧹 만료된 백업 작업 {len(expired)}개 정리")
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._ensure_loaded()
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {'jobs': counts, 'queued': len(self._pending)}
+
+    # 작업 실행
+    def _notify(self, job: Dict[str, Any]):
+        if self._on_update is None:
+            return
+        try:
+            self._on_update(dict(job))
+        except Exception as e:
+            print(f"백업 작업 알림 실패: {e}")
+
+    def _update(self, job: Dict[str, Any], **changes):
+        with self._lock:
+            job.update(changes)
+            self._save(job)
+        self._notify(job)
+
+    def _work(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                job_id = self._pending.popleft()
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] != 'queued':
+                continue
+            self._run(job)
+
+    def _run(self, job: Dict[str, Any]):
+        job_dir = self.job_dir(job['id'])
+
+        def progress(step: str, message: str, percentage: Optional[int] = None):
+            self._update(job, progress={'step': step, 'message': message, 'percentage': percentage})
+
+        self._update(job, status='running', started_at=datetime.utcnow().isoformat(),
+                     progress={'step': 'start', 'message': '작업을 시작합니다...', 'percentage': 0})
+        print(f"📦 백업 작업 시작: {job['type']} ({job['id']})")
+        try:
+            handler = self._handlers[job['type']]
+            if self._context is not None:
+                with self._context():
+                    result = handler(job, progress, job_dir)
+            else:
+                result = handler(job, progress, job_dir)
+        except Exception as e:
+            print(f"❌ 백업 작업 실패: {job['type']} ({job['id']}): {e}")
+            self._update(job, status='failed', error=getattr(e, 'message', None) or str(e),
+                         finished_at=datetime.utcnow().isoformat())
+        else:
+            print(f"✅ 백업 작업 완료: {job['type']} ({job['id']})")
+            self._update(job, status='completed', result=result,
+                         progress={'step': 'complete', 'message': '작업이 완료되었습니다.', 'percentage': 100},
+                         finished_at=datetime.utcnow().isoformat())
+        finally:
+            # 복구용 업로드 파일은 작업이 끝나면 필요 없음
+            upload_path = os.path.join(job_dir, UPLOAD_FILENAME)
+            if os.path.exists(upload_path):
+                os.remove(upload_path)
+
+
+# 전역 백업 작업 실행기 인스턴스
+backup_jobs = BackupJobRunner(BACKUP_JOBS_DIR)
@@ -0,0 +1,149 @@
+"""
+에셋 서빙 벤치마크 (처리량 / GB당 서버 CPU 시간)
+
+기존 send_from_directory 경로와 asset_server 경로(큰 블록 스트리밍, mmap, 프록시 위임)를 비교한다.
+서버는 별도 프로세스(Werkzeug threaded 서버, 운영과 같은 방식)로 띄우고,
+요청 전후로 서버 프로세스의 CPU 시간을 조회하여 GB당 CPU 사용량을 계산한다.
+
+사용법:
+    python benchmarks/bench_asset_serving.py [--size-mb 32] [--requests 20] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import http.client
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+SCENARIOS = ['baseline', 'stream', 'mmap', 'offload']
+
+
+def run_server(directory, port, ready):
+    import logging
+    from flask import Flask, jsonify, send_from_directory
+    from werkzeug.serving import make_server
+    from asset_server import AssetServer
+
+    app = Flask(__name__)
+    servers = {
+        'stream': AssetServer(offload='', mmap_enabled=False),
+        'mmap': AssetServer(offload='', mmap_enabled=True, mmap_min_size=0, mmap_hot_hits=1),
+        'offload': AssetServer(offload='x-accel-redirect'),
+    }
+    servers['offload'].offload_root = os.path.realpath(directory)
+
+    @app.route('/baseline/<path:filename>')
+    def baseline(filename):
+        return send_from_directory(directory, filename)
+
+    @app.route('/<scenario>/<path:filename>')
+    def serve(scenario, filename):
+        return servers[scenario].send(directory, filename)
+
+    @app.route('/_cpu')
+    def cpu():
+        return jsonify({'cpu': time.process_time()})
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    ready.set()
+    server.serve_forever()
+
+
+def server_cpu(port):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('GET', '/_cpu')
+    value = json.loads(conn.getresponse().read())['cpu']
+    conn.close()
+    return value
+
+
+def fetch(port, path, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('GET', path, headers=headers or {})
+    response = conn.getresponse()
+    total = 0
+    while True:
+        block = response.read(1024 * 1024)
+        if not block:
+            break
+        total += len(block)
+    conn.close()
+    return response.status, total
+
+
+def run_scenario(port, scenario, filename, requests, headers=None):
+    path = f'/{scenario}/{filename}'
+    fetch(port, path, headers)  # 워밍업 (해시 계산, mmap 생성)
+
+    cpu_before = server_cpu(port)
+    started = time.perf_counter()
+    transferred = 0
+    for _ in range(requests):
+        status, size = fetch(port, path, headers)
+        assert status in (200, 206), f'{scenario}: HTTP {status}'
+        transferred += size
+    elapsed = time.perf_counter() - started
+    cpu_used = server_cpu(port) - cpu_before
+
+    gb = transferred / (1024 ** 3)
+    return {
+        'scenario': scenario,
+        'range': bool(headers),
+        'requests': requests,
+        'bytes': transferred,
+        'seconds': round(elapsed, 4),
+        'throughput_mb_s': round(transferred / (1024 * 1024) / elapsed, 1) if elapsed else None,
+        'server_cpu_s': round(cpu_used, 4),
+        'server_cpu_s_per_gb': round(cpu_used / gb, 3) if gb else None,
+        'server_cpu_ms_per_request': round(cpu_used * 1000 / requests, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='에셋 서빙 벤치마크')
+    parser.add_argument('--size-mb', type=int, default=32, help='테스트 스프라이트 크기 (MB)')
+    parser.add_argument('--requests', type=int, default=20, help='시나리오별 요청 수')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--json', action='store_true', help='JSON으로 결과 출력')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = 'sprite.png'
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(os.urandom(args.size_mb * 1024 * 1024))
+
+        ready = multiprocessing.Event()
+        server = multiprocessing.Process(target=run_server, args=(directory, args.port, ready), daemon=True)
+        server.start()
+        ready.wait(10)
+
+        try:
+            results = [run_scenario(args.port, scenario, filename, args.requests) for scenario in SCENARIOS]
+            # 1MB Range 요청 (오버레이 부분 로드 / 이어받기)
+            range_headers = {'Range': 'bytes=1048576-2097151'}
+            results += [run_scenario(args.port, scenario, filename, args.requests * 10, range_headers)
+                        for scenario in ('baseline', 'stream', 'mmap')]
+        finally:
+            server.terminate()
+
+    if args.json:
+        print(json.dumps({'size_mb': args.size_mb, 'results': results}, indent=2))
+        return
+
+    print(f"파일 크기: {args.size_mb}MB, 시나리오별 요청 {args.requests}회 (Range는 {args.requests * 10}회)")
+    print(f"{'scenario':<10} {'range':<6} {'MB/s':>10} {'CPU s/GB':>10} {'CPU ms/req':>11}")
+    for r in results:
+        # offload는 본문을 프록시가 보내므로 요청당 CPU만 의미 있음
+        per_gb = '-' if r['server_cpu_s_per_gb'] is None else r['server_cpu_s_per_gb']
+        throughput = '-' if r['scenario'] == 'offload' else r['throughput_mb_s']
+        print(f"{r['scenario']:<10} {str(r['range']):<6} {throughput:>10} {per_gb:>10} {r['server_cpu_ms_per_request']:>11}")
+
+
+if __name__ == '__main__':
+    main()
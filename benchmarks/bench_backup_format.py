@@ -0,0 +1,115 @@
+"""
+백업 형식 벤치마크 (합성 백업: 오브젝트 10만 개)
+
+JSON 형식(database 전체를 들여쓰기 JSON 으로 backup_info.json 에 넣고 ZIP deflate)과
+compact_backup 의 테이블별 NDJSON(gzip / zstd / 압축 없음)을 비교한다.
+  · json-nested: 예전 백업 형태 (프로젝트 안에 씬/오브젝트, 씬 안에 오브젝트를 다시 넣어 같은 행을 세 번 기록)
+  · json: 지금의 format=json (테이블별 행 목록, 중복 없음)
+형식마다 인코딩 시간, 결과 크기, 디코딩(행을 모두 읽는) 시간을 기록한다.
+json-nested 는 이미 만든 중첩 구조를 직렬화하는 시간만 잰다 (실제로는 행마다 JSON 문자열을 다시 파싱하는 비용이 더 있음).
+
+사용법:
+    python benchmarks/bench_backup_format.py [--objects 100000] [--json]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import zlib
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_bulk_restore import synthetic_backup
+from compact_backup import available_compressions, encode_table, decode_table
+
+
+def nested_backup(data):
+    """예전 create_backup_data 의 database 형태 (project_to_dict / scene_to_dict 가 하위 행을 포함)"""
+    def object_dict(row):
+        return {'id': row['id'], 'name': row['name'], 'type': row['type'], 'order': row['order'],
+                **{key: json.loads(row[key]) for key in ('properties', 'in_motion', 'out_motion', 'timing')}}
+
+    scene_objects = {}
+    for row in data['objects']:
+        scene_objects.setdefault(row['scene_id'], []).append(object_dict(row))
+    scenes = [{**row, 'objects': scene_objects.get(row['id'], [])} for row in data['scenes']]
+    return {
+        'users': data['users'],
+        'projects': [{**row, 'user': data['users'][0],
+                      'scenes': [{'id': scene['id'], 'name': scene['name'], 'order': scene['order'],
+                                  'objects': scene['objects']} for scene in scenes]} for row in data['projects']],
+        'scenes': scenes,
+        'objects': [{**row, **object_dict(row)} for row in data['objects']],
+        'permissions': data['permissions']
+    }
+
+
+def count_rows(database):
+    return sum(len(database[key]) for key in ('users', 'projects', 'scenes', 'objects', 'permissions'))
+
+
+def run_json(data):
+    started = time.perf_counter()
+    # ZIP_DEFLATED 기본 압축 수준과 같은 zlib 6
+    encoded = zlib.compress(json.dumps({'database': data}, indent=2, ensure_ascii=False).encode('utf-8'), 6)
+    encode_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rows = count_rows(json.loads(zlib.decompress(encoded))['database'])
+    decode_seconds = time.perf_counter() - started
+    return len(encoded), encode_seconds, decode_seconds, rows
+
+
+def run_compact(data, compression):
+    started = time.perf_counter()
+    members = {}
+    for key, rows in data.items():
+        columns = list(rows[0]) if rows else []
+        members[key] = b''.join(encode_table(columns, rows, compression))
+    encode_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rows = sum(sum(1 for _ in decode_table(io.BytesIO(member), compression)) for member in members.values())
+    decode_seconds = time.perf_counter() - started
+    return sum(len(member) for member in members.values()), encode_seconds, decode_seconds, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='백업 형식 벤치마크')
+    parser.add_argument('--objects', type=int, default=100000, help='합성 백업의 오브젝트 수')
+    parser.add_argument('--json', action='store_true', help='JSON으로 결과 출력')
+    args = parser.parse_args()
+
+    data = synthetic_backup(args.objects)
+    results = []
+    formats = ['json-nested', 'json'] + [f'compact/{compression}' for compression in available_compressions()]
+    for name in formats:
+        if name == 'json-nested':
+            size, encode_seconds, decode_seconds, rows = run_json(nested_backup(data))
+        elif name == 'json':
+            size, encode_seconds, decode_seconds, rows = run_json(data)
+        else:
+            size, encode_seconds, decode_seconds, rows = run_compact(data, name.split('/', 1)[1])
+        results.append({
+            'format': name,
+            'bytes': size,
+            'encode_seconds': round(encode_seconds, 3),
+            'decode_seconds': round(decode_seconds, 3),
+            'rows': rows
+        })
+
+    if args.json:
+        print(json.dumps({'objects': args.objects, 'results': results}, indent=2))
+        return
+
+    print(f"{'format':<14} {'MB':>8} {'encode s':>9} {'decode s':>9} {'rows':>8}")
+    for r in results:
+        print(f"{r['format']:<14} {r['bytes'] / 1024 / 1024:>8.2f} {r['encode_seconds']:>9} "
+              f"{r['decode_seconds']:>9} {r['rows']:>8}")
+
+
+if __name__ == '__main__':
+    main()
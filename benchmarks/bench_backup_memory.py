@@ -0,0 +1,109 @@
+"""
+백업 ZIP 메모리 벤치마크 (라이브러리 크기별 최대 RSS)
+
+기존 방식(BytesIO 에 ZIP 전체 생성 -> 다시 열어 목록 확인 -> getvalue() 복사)과
+streaming_zip.stream_zip(청크 단위로 내보내기)을 비교한다.
+각 실행은 별도 프로세스에서 수행하고, ZIP 생성 전후의 최대 RSS 차이를 기록한다.
+
+사용법:
+    python benchmarks/bench_backup_memory.py [--sizes 32,128,256] [--file-mb 4] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+MODES = ['legacy', 'stream']
+
+
+def peak_rss_mb():
+    # Linux: KB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def library_entries(directory):
+    for name in sorted(os.listdir(directory)):
+        yield f'projects/user_1/bench/library/images/{name}', os.path.join(directory, name)
+
+
+def run_legacy(directory):
+    import io
+    import zipfile
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr('backup_info.json', '{}')
+        for arcname, path in library_entries(directory):
+            zipf.write(path, arcname)
+    zip_buffer.seek(0)
+    with zipfile.ZipFile(zip_buffer, 'r') as check_zip:
+        check_zip.namelist()
+    zip_buffer.seek(0)
+    body = zip_buffer.getvalue()
+    return len(body)
+
+
+def run_stream(directory):
+    from streaming_zip import stream_zip
+    entries = [('backup_info.json', b'{}')] + list(library_entries(directory))
+    total = 0
+    for chunk in stream_zip(entries):
+        total += len(chunk)  # 응답으로 보내고 버리는 것과 같음
+    return total
+
+
+def measure(mode, directory, queue):
+    before = peak_rss_mb()
+    started = time.perf_counter()
+    size = run_legacy(directory) if mode == 'legacy' else run_stream(directory)
+    queue.put({
+        'seconds': round(time.perf_counter() - started, 3),
+        'zip_bytes': size,
+        'baseline_rss_mb': round(before, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'peak_rss_delta_mb': round(peak_rss_mb() - before, 1)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='백업 ZIP 메모리 벤치마크')
+    parser.add_argument('--sizes', default='32,128,256', help='라이브러리 크기 목록 (MB, 쉼표 구분)')
+    parser.add_argument('--file-mb', type=int, default=4, help='파일 하나의 크기 (MB)')
+    parser.add_argument('--json', action='store_true', help='JSON으로 결과 출력')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for size_mb in [int(s) for s in args.sizes.split(',') if s]:
+        with tempfile.TemporaryDirectory() as directory:
+            # 이미지처럼 압축이 거의 안 되는 데이터
+            for i in range(max(size_mb // args.file_mb, 1)):
+                with open(os.path.join(directory, f'image_{i:05d}.png'), 'wb') as f:
+                    f.write(os.urandom(args.file_mb * 1024 * 1024))
+
+            for mode in MODES:
+                queue = context.Queue()
+                process = context.Process(target=measure, args=(mode, directory, queue))
+                process.start()
+                result = queue.get()
+                process.join()
+                result.update({'mode': mode, 'library_mb': size_mb})
+                results.append(result)
+
+    if args.json:
+        print(json.dumps({'file_mb': args.file_mb, 'results': results}, indent=2))
+        return
+
+    print(f"{'library MB':>10} {'mode':<8} {'peak RSS +MB':>13} {'seconds':>8}")
+    for r in results:
+        print(f"{r['library_mb']:>10} {r['mode']:<8} {r['peak_rss_delta_mb']:>13} {r['seconds']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+DB 복구 벤치마크 (합성 백업: 오브젝트 10만 개)
+
+기존 방식(행마다 ORM 인스턴스 생성 + session.add, 마지막에 한 번 커밋)과
+bulk_restore.bulk_restore(Core executemany 배치, 한 트랜잭션)를 비교한다.
+각 실행은 별도 프로세스에서 빈 DB에 복구하고, 걸린 시간과 최대 RSS 증가량을 기록한다.
+
+사용법:
+    python benchmarks/bench_bulk_restore.py [--objects 100000] [--batch-size 5000] [--database-url URL] [--json]
+    (--database-url 을 주지 않으면 임시 SQLite 파일 사용, 대상 DB의 테이블은 매번 다시 만듦)
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import contextlib
+import multiprocessing
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+MODES = ['orm', 'bulk']
+
+
+def peak_rss_mb():
+    # Linux: KB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def synthetic_backup(objects, objects_per_scene=50):
+    """create_backup_data 의 database 항목과 같은 형태"""
+    now = datetime.utcnow().isoformat()
+    scenes = (objects + objects_per_scene - 1) // objects_per_scene
+    properties = json.dumps({'text': '자막 텍스트', 'fontSize': 48, 'color': '#ffffff', 'x': 100, 'y': 900})
+    return {
+        'users': [{'id': 1, 'username': 'bench', 'password': 'x' * 60, 'created_at': now, 'is_active': True}],
+        'projects': [{'id': 1, 'name': 'bench', 'user_id': 1, 'created_at': now, 'updated_at': now}],
+        'scenes': [{'id': i + 1, 'project_id': 1, 'name': f'scene {i}', 'order': i, 'duration': 0,
+                    'created_at': now, 'updated_at': now} for i in range(scenes)],
+        'objects': [{'id': i + 1, 'name': f'object {i}', 'type': 'text', 'order': i % objects_per_scene,
+                     'properties': properties, 'in_motion': '{}', 'out_motion': '{}', 'timing': '{}',
+                     'scene_id': i // objects_per_scene + 1, 'created_at': now, 'updated_at': now}
+                    for i in range(objects)],
+        'permissions': [{'id': 1, 'project_id': 1, 'user_id': 1, 'permission_type': 'owner',
+                         'created_at': now, 'updated_at': now}]
+    }
+
+
+def run_orm(A, data):
+    from bulk_restore import normalize_row
+    session = A.db.session
+    for model in A.BACKUP_MODELS:
+        table = model.__table__
+        for row in data[A.BACKUP_DATA_KEYS[table.name]]:
+            session.add(model(**normalize_row(table, row)))
+    session.commit()
+
+
+def run_bulk(A, data, batch_size):
+    from bulk_restore import bulk_restore
+    tables = [(model.__table__, data[A.BACKUP_DATA_KEYS[model.__table__.name]]) for model in A.BACKUP_MODELS]
+    bulk_restore(A.db.session, tables, batch_size=batch_size)
+
+
+def measure(mode, database_url, objects, batch_size, conn):
+    os.environ['DATABASE_URL'] = database_url
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as A
+    data = synthetic_backup(objects)
+    with A.app.app_context():
+        A.db.drop_all()
+        A.db.create_all()
+        before = peak_rss_mb()
+        started = time.perf_counter()
+        if mode == 'orm':
+            run_orm(A, data)
+        else:
+            run_bulk(A, data, batch_size)
+        seconds = time.perf_counter() - started
+        restored = A.Object.query.count()
+    # app import 시 gevent 패치가 적용되어 Queue 의 전송 스레드가 돌지 않으므로 Pipe 로 바로 전송
+    conn.send({
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(restored / seconds) if seconds else None,
+        'objects_restored': restored,
+        'peak_rss_delta_mb': round(peak_rss_mb() - before, 1)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DB 복구 벤치마크')
+    parser.add_argument('--objects', type=int, default=100000, help='합성 백업의 오브젝트 수')
+    parser.add_argument('--batch-size', type=int, default=5000, help='bulk 모드 배치(executemany) 크기')
+    parser.add_argument('--database-url', help='대상 DB (기본: 임시 SQLite)')
+    parser.add_argument('--json', action='store_true', help='JSON으로 결과 출력')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or 'sqlite:///' + os.path.join(directory, 'bench.db')
+        for mode in MODES:
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=measure, args=(mode, database_url, args.objects, args.batch_size, sender))
+            process.start()
+            result = receiver.recv()
+            process.join()
+            result['mode'] = mode
+            results.append(result)
+
+    if args.json:
+        print(json.dumps({'objects': args.objects, 'batch_size': args.batch_size, 'results': results}, indent=2))
+        return
+
+    print(f"{'mode':<6} {'seconds':>8} {'rows/s':>9} {'peak RSS +MB':>13}")
+    for r in results:
+        print(f"{r['mode']:<6} {r['seconds']:>8} {r['rows_per_second']:>9} {r['peak_rss_delta_mb']:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+라이브 제어 경로 부하 벤치마크 (임시 SQLite DB, 앱을 이 프로세스 안에서 실행)
+
+운영자 M 명(사용자/프로젝트 하나씩)과 오버레이 N 개(운영자마다 N/M 개, project_<이름> / user_<id> 룸 참여)를 만들고
+운영자들이 번갈아 라이브 제어 요청(씬 송출, 텍스트 라이브 변경, 타이머 시작/정지, 씬 라이브 on)을 보낸다.
+요청마다 그 운영자의 오버레이가 받은 이벤트를 읽고, trace_id 가 붙은 이벤트에는 live_ack 를 보낸다.
+
+Socket.IO 클라이언트는 Flask-SocketIO 테스트 클라이언트 (네트워크 전송은 제외, 서버 쪽 핸들러/emit/룸 fan-out 은 실제 코드)
+기록: 요청 처리량, 작업별 응답 시간, 이벤트별 emit(fan-out) 시간 p50/p95/p99, 오버레이 수신 이벤트 수,
+      live_latency 채널별 지연, CPU 시간, RSS
+결과는 JSON 으로 저장해 커밋 간 비교 (--output 으로 저장, --compare 로 이전 결과와 비교)
+
+사용법:
+    python benchmarks/bench_live_control.py [--operators 4] [--overlays 40] [--rounds 100]
+                                            [--output result.json] [--compare base.json] [--json]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import resource
+import tempfile
+import contextlib
+import subprocess
+from collections import defaultdict
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from live_latency import percentile
+
+OPERATIONS = ('push_scene', 'text_live', 'timer_start', 'timer_stop', 'scene_live_on')
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=30).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def summarize(values, scale=1000):
+    """[초] -> {count, p50, p95, p99, max} (ms)"""
+    values = sorted(values)
+    if not values:
+        return {'count': 0}
+    summary = {'count': len(values)}
+    for p in (50, 95, 99):
+        summary[f'p{p}_ms'] = round(percentile(values, p) * scale, 3)
+    summary['max_ms'] = round(values[-1] * scale, 3)
+    return summary
+
+
+def setup_operators(A, operators, overlays):
+    """운영자(사용자 + 프로젝트 + 씬 2개 + 텍스트/타이머 오브젝트)와 오버레이 소켓 클라이언트 생성"""
+    result = []
+    for i in range(operators):
+        client = A.app.test_client()
+        username = f'operator{i}'
+        registered = client.post('/api/auth/register', json={'username': username, 'password': 'bench'}).get_json()
+        user_id = registered['user']['id']
+        headers = {'Authorization': f"Bearer {registered['token']}"}
+        project_name = f'bench-{i}'
+        project = client.post('/api/projects', json={
+            'name': project_name,
+            'scenes': [{'name': 'scene-1', 'order': 0}, {'name': 'scene-2', 'order': 1}]
+        }, headers=headers).get_json()
+        scene_ids = [scene['id'] for scene in project['scenes']]
+        text_id = client.post(f'/api/scenes/{scene_ids[0]}/objects', json={
+            'name': 'caption', 'type': 'text', 'properties': {'content': '자막'}
+        }, headers=headers).get_json()['id']
+        timer_id = client.post(f'/api/scenes/{scene_ids[0]}/objects', json={
+            'name': 'clock', 'type': 'timer', 'properties': {'timeFormat': 'MM:SS'}
+        }, headers=headers).get_json()['id']
+
+        sockets = []
+        for _ in range(overlays // operators + (1 if i < overlays % operators else 0)):
+            socket = A.socketio.test_client(A.app)
+            socket.emit('join', {'room': f'project_{project_name}'})
+            socket.emit('join', {'room': f'user_{user_id}'})
+            socket.get_received()
+            sockets.append(socket)
+
+        result.append({
+            'client': client, 'headers': headers, 'project_name': project_name,
+            'scene_ids': scene_ids, 'text_id': text_id, 'timer_id': timer_id, 'sockets': sockets
+        })
+    return result
+
+
+def operation_request(operator, operation, round_index):
+    """(URL, JSON 본문)"""
+    name = operator['project_name']
+    if operation == 'push_scene':
+        return f"/api/scenes/{operator['scene_ids'][round_index % 2]}/push", {}
+    if operation == 'text_live':
+        return f"/api/live/objects/{operator['text_id']}/text", {'content': f'자막 {round_index}', 'project_name': name}
+    if operation == 'timer_start':
+        return f"/api/live/objects/{operator['timer_id']}/timer/start", {'project_name': name}
+    if operation == 'timer_stop':
+        return f"/api/live/objects/{operator['timer_id']}/timer/stop", {'project_name': name}
+    return f"/api/live/scenes/{operator['scene_ids'][round_index % 2]}/on", {'project_name': name}
+
+
+def run(operators, overlays, rounds):
+    logging.getLogger('socketio.server').setLevel(logging.ERROR)
+    logging.getLogger('engineio.server').setLevel(logging.ERROR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as A
+    from system_metrics import read_rss_bytes
+
+    with A.app.app_context():
+        A.db.create_all()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        operator_list = setup_operators(A, operators, overlays)
+
+        # 이벤트별 emit 시간 (socketio.emit 을 한 번 더 감쌈, 라이브 이벤트만)
+        emit_seconds = defaultdict(list)
+        inner_emit = A.socketio.emit
+
+        def timed_emit(event, *args, **kwargs):
+            if event not in A.LIVE_EVENTS:
+                return inner_emit(event, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return inner_emit(event, *args, **kwargs)
+            finally:
+                emit_seconds[event].append(time.perf_counter() - started)
+
+        A.socketio.emit = timed_emit
+        A.live_latency.reset()
+
+        request_seconds = defaultdict(list)
+        received = defaultdict(int)
+        errors = 0
+        rss_before = read_rss_bytes()
+        cpu_before = cpu_seconds()
+        started = time.perf_counter()
+        try:
+            for round_index in range(rounds):
+                for operator in operator_list:
+                    for operation in OPERATIONS:
+                        url, body = operation_request(operator, operation, round_index)
+                        request_started = time.perf_counter()
+                        response = operator['client'].post(url, json=body, headers=operator['headers'])
+                        request_seconds[operation].append(time.perf_counter() - request_started)
+                        if response.status_code != 200:
+                            errors += 1
+                        # 오버레이: 받은 이벤트 집계 + trace 이벤트 ack
+                        for socket in operator['sockets']:
+                            for packet in socket.get_received():
+                                received[packet['name']] += 1
+                                data = packet['args'][0] if packet['args'] else None
+                                if isinstance(data, dict) and data.get('trace_id'):
+                                    socket.emit('live_ack', {'trace_id': data['trace_id'], 'render_ms': 0})
+            elapsed = time.perf_counter() - started
+        finally:
+            A.socketio.emit = inner_emit
+        cpu = cpu_seconds() - cpu_before
+        rss_after = read_rss_bytes()
+
+    total_requests = sum(len(values) for values in request_seconds.values())
+    latency = A.live_latency.get_stats()
+    return {
+        'elapsed_seconds': round(elapsed, 3),
+        'requests': total_requests,
+        'errors': errors,
+        'requests_per_second': round(total_requests / elapsed, 1) if elapsed else None,
+        'events_delivered': sum(received.values()),
+        'events_delivered_per_second': round(sum(received.values()) / elapsed, 1) if elapsed else None,
+        'cpu_seconds': round(cpu, 3),
+        'cpu_percent': round(cpu * 100 / elapsed, 1) if elapsed else None,
+        'rss_mb': round(rss_after / 1024 / 1024, 1) if rss_after else None,
+        'rss_growth_mb': round((rss_after - rss_before) / 1024 / 1024, 1) if rss_after and rss_before else None,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'request_latency': {operation: summarize(values) for operation, values in request_seconds.items()},
+        'emit_fanout_latency': {event: summarize(values) for event, values in sorted(emit_seconds.items())},
+        'received_events': dict(sorted(received.items())),
+        'live_latency': {'acks': latency['acks'], 'unmatched_acks': latency['unmatched_acks'],
+                         'channels': latency['channels']}
+    }
+
+
+def flatten(value, prefix=''):
+    """중첩 dict -> {'a.b.c': 숫자}"""
+    items = {}
+    if isinstance(value, dict):
+        for key, child in value.items():
+            items.update(flatten(child, f'{prefix}.{key}' if prefix else str(key)))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        items[prefix] = value
+    return items
+
+
+def compare(base, current):
+    """이전 결과 대비 변화율 (공통 숫자 항목, live_latency 채널별 값 제외)"""
+    base_values = flatten(base['results'])
+    rows = []
+    for key, value in flatten(current['results']).items():
+        if key.startswith('live_latency.channels') or key not in base_values:
+            continue
+        old = base_values[key]
+        change = round((value - old) * 100 / old, 1) if old else None
+        rows.append({'metric': key, 'base': old, 'current': value, 'change_percent': change})
+    return {'base_commit': base.get('commit'), 'rows': rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='라이브 제어 경로 부하 벤치마크')
+    parser.add_argument('--operators', type=int, default=4, help='운영자(사용자/프로젝트) 수')
+    parser.add_argument('--overlays', type=int, default=40, help='오버레이 소켓 클라이언트 수 (운영자에게 나눠 배정)')
+    parser.add_argument('--rounds', type=int, default=100, help='운영자마다 반복할 작업 묶음 수 (묶음당 요청 5개)')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--json', action='store_true', help='JSON으로 결과 출력')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'bench.db')
+        results = run(args.operators, args.overlays, args.rounds)
+
+    report = {
+        'benchmark': 'live_control',
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'parameters': {'operators': args.operators, 'overlays': args.overlays, 'rounds': args.rounds},
+        'results': results
+    }
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            report['comparison'] = compare(json.load(f), report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"commit {report['commit']}, operators {args.operators}, overlays {args.overlays}, rounds {args.rounds}")
+    print(f"requests {results['requests']} ({results['errors']} errors) in {results['elapsed_seconds']}s "
+          f"= {results['requests_per_second']} req/s, events delivered {results['events_delivered_per_second']}/s")
+    print(f"cpu {results['cpu_seconds']}s ({results['cpu_percent']}%), rss {results['rss_mb']} MB "
+          f"(+{results['rss_growth_mb']}), peak {results['peak_rss_mb']} MB")
+    print(f"\n{'request':<16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, summary in results['request_latency'].items():
+        print(f"{name:<16} {summary['p50_ms']:>9} {summary['p95_ms']:>9} {summary['p99_ms']:>9}")
+    print(f"\n{'emit (fan-out)':<20} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, summary in results['emit_fanout_latency'].items():
+        print(f"{name:<20} {summary['count']:>7} {summary['p50_ms']:>9} {summary['p95_ms']:>9} {summary['p99_ms']:>9}")
+    if 'comparison' in report:
+        print(f"\ncompared with {report['comparison']['base_commit']}:")
+        for row in report['comparison']['rows']:
+            if row['change_percent'] is not None and abs(row['change_percent']) >= 5:
+                print(f"  {row['metric']:<48} {row['base']:>10} -> {row['current']:>10} ({row['change_percent']:+}%)")
+
+
+if __name__ == '__main__':
+    main()
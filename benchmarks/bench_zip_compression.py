@@ -0,0 +1,93 @@
+"""
+라이브러리 ZIP 압축 벤치마크 (합성 라이브러리: PNG/WebP + JSON 메타데이터)
+
+기존 방식(모든 파일을 한 스레드에서 ZIP_DEFLATED)과
+streaming_zip 압축 정책(압축된 형식은 STORED, 나머지는 스레드 풀에서 미리 deflate)을 비교한다.
+각 방식의 경과 시간, CPU 시간, ZIP 크기를 기록한다.
+
+사용법:
+    python benchmarks/bench_zip_compression.py [--images 300] [--image-kb 256] [--json-files 300] [--workers N] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import zipfile
+import argparse
+import resource
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from streaming_zip import COMPRESS_WORKERS, stream_zip
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def synthetic_library(directory, images, image_kb, json_files):
+    """압축된 이미지(무작위 바이트)와 압축이 잘 되는 JSON 파일 생성 -> [(arcname, 경로)]"""
+    entries = []
+    for i in range(images):
+        name = f'images/image_{i}.png' if i % 2 else f'thumbnails/image_{i}.webp'
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(os.urandom(image_kb * 1024))
+        entries.append((f'library/{name}', path))
+    frames = [{'x': i * 64, 'y': 0, 'w': 64, 'h': 64, 'duration': 33} for i in range(2000)]
+    for i in range(json_files):
+        path = os.path.join(directory, f'sequences/seq_{i}/meta.json')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'name': f'seq_{i}', 'frames': frames}, f)
+        entries.append((f'library/sequences/seq_{i}/meta.json', path))
+    return entries
+
+
+def measure(name, entries):
+    started = time.perf_counter()
+    cpu = cpu_seconds()
+    size = sum(len(chunk) for chunk in entries())
+    return {
+        'mode': name,
+        'seconds': round(time.perf_counter() - started, 3),
+        'cpu_seconds': round(cpu_seconds() - cpu, 3),
+        'megabytes': round(size / 1024 / 1024, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='라이브러리 ZIP 압축 벤치마크')
+    parser.add_argument('--images', type=int, default=300, help='이미지 파일 수')
+    parser.add_argument('--image-kb', type=int, default=256, help='이미지 파일 크기 (KB)')
+    parser.add_argument('--json-files', type=int, default=300, help='JSON 메타데이터 파일 수')
+    parser.add_argument('--workers', type=int, default=max(COMPRESS_WORKERS, 2), help='압축 스레드 수')
+    parser.add_argument('--json', action='store_true', help='JSON으로 결과 출력')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        entries = synthetic_library(directory, args.images, args.image_kb, args.json_files)
+        results = [
+            # 기존 방식: 항목마다 ZIP_DEFLATED 지정, 한 스레드
+            measure('deflate-all', lambda: stream_zip(
+                [(arcname, path, zipfile.ZIP_DEFLATED) for arcname, path in entries], workers=1)),
+            measure('policy', lambda: stream_zip(entries, workers=1)),
+            measure(f'policy+{args.workers}threads', lambda: stream_zip(entries, workers=args.workers))
+        ]
+
+    if args.json:
+        print(json.dumps({'images': args.images, 'image_kb': args.image_kb, 'json_files': args.json_files,
+                          'cpu_count': os.cpu_count(), 'results': results}, indent=2))
+        return
+
+    print(f"{'mode':<18} {'seconds':>8} {'cpu s':>8} {'MB':>8}")
+    for r in results:
+        print(f"{r['mode']:<18} {r['seconds']:>8} {r['cpu_seconds']:>8} {r['megabytes']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+대량 DB 복구 엔진
+- 행마다 ORM 인스턴스를 만들지 않고 Core insert 를 executemany 로 실행
+  (SQLAlchemy insertmanyvalues 가 여러 행을 INSERT ... VALUES (...), (...) 로 묶어 전송)
+- 삭제, 인덱스 삭제/재생성, 적재, 시퀀스 재설정을 한 트랜잭션에서 실행하고 마지막에 한 번 커밋
+  (중간에 실패하면 롤백되어 기존 데이터가 그대로 남음, PostgreSQL/SQLite 는 DDL 도 트랜잭션에 포함)
+- BULK_RESTORE_BATCH_SIZE 행씩 executemany 로 실행하고 배치마다 진행 상황 보고
+- 적재 전 보조 인덱스를 삭제하고 적재가 끝나면 다시 생성
+- PostgreSQL: 적재 후 id 시퀀스를 max(id) 로 재설정
+- 행은 반복자로 받으므로 테이블 단위로 스트리밍 가능 (전체 백업을 메모리에 올리지 않아도 됨)
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Integer, String, Text, Table, text
+
+BULK_RESTORE_BATCH_SIZE = int(os.environ.get('BULK_RESTORE_BATCH_SIZE', 5000))  # executemany 한 번에 보내는 행 수
+
+
+class BulkRestoreError(Exception):
+    """적재 실패 (트랜잭션은 롤백됨, 실패한 테이블과 롤백 전까지 적재했던 행 수 포함)"""
+
+    def __init__(self, message: str, table: str, restored: Dict[str, int]):
+        super().__init__(message)
+        self.table = table
+        self.restored = restored
+
+
+def normalize_row(table: Table, data: Dict[str, Any]) -> Dict[str, Any]:
+    """백업 행을 insert 파라미터로 변환
+
+    - 모든 컬럼 키를 채움 (executemany 는 행마다 같은 키가 필요, 없는 값은 컬럼 기본값)
+    - ISO 문자열 -> datetime, dict/list -> JSON 문자열 (JSON 을 Text 컬럼에 저장하는 모델)
+    """
+    row = {}
+    for column in table.columns:
+        if column.name in data:
+            value = data[column.name]
+        elif column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        elif column.default is not None and column.default.is_callable:
+            value = column.default.arg(None)
+        else:
+            value = None
+        if isinstance(value, str) and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif isinstance(value, (dict, list)) and isinstance(column.type, (Text, String)):
+            value = json.dumps(value, ensure_ascii=False)
+        row[column.name] = value
+    return row
+
+
+def batched(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def reset_sequences(session, tables: List[Table]):
+    """PostgreSQL id 시퀀스를 적재된 max(id) 다음 값으로 재설정 (SQLite 는 필요 없음)"""
+    if session.get_bind().dialect.name != 'postgresql':
+        return
+    for table in tables:
+        primary_keys = list(table.primary_key.columns)
+        if len(primary_keys) != 1 or not isinstance(primary_keys[0].type, Integer):
+            continue
+        column = primary_keys[0].name
+        session.execute(text(
+            f'SELECT setval(pg_get_serial_sequence(:table, :column), '
+            f'COALESCE((SELECT MAX("{column}") FROM "{table.name}"), 1), '
+            f'(SELECT MAX("{column}") FROM "{table.name}") IS NOT NULL)'
+        ), {'table': f'"{table.name}"', 'column': column})
+
+
+def bulk_restore(session, tables: List[Tuple[Table, Iterable[Dict[str, Any]]]], clear: bool = True,
+                 batch_size: int = BULK_RESTORE_BATCH_SIZE,
+                 on_progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+    """테이블별 행을 배치 단위로 적재 (전체가 한 트랜잭션, 실패하면 롤백 후 BulkRestoreError)
+
+    tables     : [(Table, 행 반복자)] 부모 테이블 먼저 (삭제는 역순)
+    clear      : 적재 전에 tables 의 기존 행 삭제
+    on_progress: 배치를 실행할 때마다 호출 (테이블 이름, 지금까지 적재한 행 수)
+    반환값     : {테이블 이름: 적재한 행 수}
+    """
+    table_list = [table for table, _ in tables]
+    indexes = [index for table in table_list for index in table.indexes]
+    restored = {table.name: 0 for table in table_list}
+    current = None
+
+    try:
+        if clear:
+            for table in reversed(table_list):
+                session.execute(table.delete())
+        connection = session.connection()
+        for index in indexes:
+            index.drop(connection)
+
+        for table, rows in tables:
+            current = table.name
+            for batch in batched((normalize_row(table, row) for row in rows), batch_size):
+                session.execute(table.insert(), batch)
+                restored[table.name] += len(batch)
+                if on_progress is not None:
+                    on_progress(table.name, restored[table.name])
+        current = None
+
+        connection = session.connection()
+        for index in indexes:
+            index.create(connection)
+        reset_sequences(session, table_list)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        if current is None:
+            raise
+        raise BulkRestoreError(
+            f'{current} 테이블 {restored[current] + 1}번째 행 근처에서 적재하지 못해 복구를 롤백했습니다: {e}',
+            current, dict(restored)
+        ) from e
+    return restored
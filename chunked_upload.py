@@ -0,0 +1,219 @@
+"""
+재개 가능한 분할 업로드 (init / PUT chunk / finalize)
+- 업로드 세션은 uploads/<upload_id>/ 에 session.json + data.part 로 저장 (서버 재시작 후에도 재개 가능)
+- 청크는 요청 스트림에서 임시 파일로 바로 기록 (전체 파일을 메모리에 올리지 않음)
+- SHA-256 해시를 청크 단위로 누적 계산 (메모리 상태가 없으면 파일에서 다시 계산)
+- finalize 후 완성된 파일은 기존 이미지/시퀀스 처리 로직으로 전달
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024))  # 권장 청크 크기 8MB
+MAX_CHUNK_SIZE = 64 * 1024 * 1024  # 64MB
+MAX_CHUNKED_UPLOAD_SIZE = int(os.environ.get('MAX_CHUNKED_UPLOAD_SIZE', 1024 * 1024 * 1024))  # 1GB
+UPLOAD_SESSION_TTL = 24 * 60 * 60  # 24시간 지난 세션은 정리
+UPLOAD_DIR = os.environ.get('CHUNKED_UPLOAD_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'uploads'))
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """분할 업로드 오류 (HTTP 상태 코드 포함)"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class ChunkedUploadManager:
+    def __init__(self, upload_dir: str):
+        self.upload_dir = upload_dir
+        # 진행 중인 세션의 누적 해시 {upload_id: (해시에 반영된 크기, hashlib 객체)}
+        self._hashers: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # 경로 헬퍼
+    def _session_dir(self, upload_id: str) -> str:
+        if not upload_id or not all(c in '0123456789abcdef' for c in upload_id):
+            raise UploadError('Invalid upload id', 404)
+        return os.path.join(self.upload_dir, upload_id)
+
+    def _session_path(self, upload_id: str) -> str:
+        return os.path.join(self._session_dir(upload_id), 'session.json')
+
+    def data_path(self, upload_id: str) -> str:
+        return os.path.join(self._session_dir(upload_id), 'data.part')
+
+    def _lock_for(self, upload_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    # 세션 관리
+    def _save_session(self, session: Dict[str, Any]):
+        path = self._session_path(session['upload_id'])
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(session, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def get_session(self, upload_id: str) -> Dict[str, Any]:
+        path = self._session_path(upload_id)
+        if not os.path.exists(path):
+            raise UploadError('Upload session not found', 404)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def create_session(self, user_id: int, total_size: int, target: Dict[str, Any]) -> Dict[str, Any]:
+        """업로드 세션 생성
+
+        target: 완료 후 처리에 필요한 정보 (kind, project_name, owner_id, filename 등)
+        """
+        if total_size <= 0:
+            raise UploadError('total_size must be positive')
+        if total_size > MAX_CHUNKED_UPLOAD_SIZE:
+            raise UploadError(f'파일이 너무 큽니다 (최대 {MAX_CHUNKED_UPLOAD_SIZE // (1024 * 1024)}MB).', 413)
+
+        self.cleanup_expired()
+
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self._session_dir(upload_id), exist_ok=True)
+        open(self.data_path(upload_id), 'wb').close()
+
+        session = {
+            'upload_id': upload_id,
+            'user_id': user_id,
+            'total_size': total_size,
+            'received': 0,
+            'chunk_size': UPLOAD_CHUNK_SIZE,
+            'target': target,
+            'created_at': time.time(),
+            'updated_at': time.time()
+        }
+        self._save_session(session)
+        self._hashers[upload_id] = (0, hashlib.sha256())
+        print(f"📤 분할 업로드 세션 생성: {upload_id} ({total_size} bytes, {target.get('kind')})")
+        return session
+
+    def _get_hasher(self, upload_id: str, received: int):
+        """누적 해시 반환 (서버 재시작 등으로 없으면 받은 데이터로 재계산)"""
+        cached = self._hashers.get(upload_id)
+        if cached is not None and cached[0] == received:
+            return cached[1]
+
+        hasher = hashlib.sha256()
+        with open(self.data_path(upload_id), 'rb') as f:
+            remaining = received
+            while remaining > 0:
+                block = f.read(min(STREAM_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                hasher.update(block)
+                remaining -= len(block)
+        return hasher
+
+    def write_chunk(self, upload_id: str, user_id: int, offset: int, stream, length: Optional[int] = None, chunk_sha256: Optional[str] = None) -> Dict[str, Any]:
+        """청크 기록 (offset은 지금까지 받은 크기와 같아야 함)"""
+        with self._lock_for(upload_id):
+            session = self.get_session(upload_id)
+            if session['user_id'] != user_id:
+                raise UploadError('Permission denied', 403)
+            if offset != session['received']:
+                # 클라이언트는 응답의 received 값부터 다시 전송
+                raise UploadError(f"Unexpected offset {offset}, expected {session['received']}", 409)
+            if length is not None and length > MAX_CHUNK_SIZE:
+                raise UploadError('Chunk too large', 413)
+
+            hasher = self._get_hasher(upload_id, session['received']).copy()
+            chunk_hasher = hashlib.sha256()
+            limit = min(MAX_CHUNK_SIZE, session['total_size'] - offset)
+            written = 0
+
+            data_path = self.data_path(upload_id)
+            with open(data_path, 'r+b') as f:
+                f.seek(offset)
+                while True:
+                    block = stream.read(STREAM_BLOCK_SIZE)
+                    if not block:
+                        break
+                    written += len(block)
+                    if written > limit:
+                        f.truncate(offset)
+                        raise UploadError('Chunk exceeds declared total_size', 413)
+                    f.write(block)
+                    hasher.update(block)
+                    chunk_hasher.update(block)
+                f.truncate(offset + written)
+
+            if chunk_sha256 and chunk_hasher.hexdigest() != chunk_sha256.lower():
+                # 손상된 청크는 버리고 같은 offset부터 다시 받음
+                with open(data_path, 'r+b') as f:
+                    f.truncate(offset)
+                raise UploadError('Chunk checksum mismatch', 422)
+
+            self._hashers[upload_id] = (offset + written, hasher)
+            session['received'] = offset + written
+            session['updated_at'] = time.time()
+            self._save_session(session)
+            return session
+
+    def finalize(self, upload_id: str, user_id: int, expected_sha256: Optional[str] = None) -> Dict[str, Any]:
+        """업로드 완료 확인 후 세션 정보 + 데이터 파일 경로 + SHA-256 반환"""
+        with self._lock_for(upload_id):
+            session = self.get_session(upload_id)
+            if session['user_id'] != user_id:
+                raise UploadError('Permission denied', 403)
+            if session['received'] != session['total_size']:
+                raise UploadError(f"Upload incomplete ({session['received']}/{session['total_size']})", 409)
+
+            digest = self._get_hasher(upload_id, session['received']).hexdigest()
+            if expected_sha256 and digest != expected_sha256.lower():
+                raise UploadError('File checksum mismatch', 422)
+
+            session['sha256'] = digest
+            session['data_path'] = self.data_path(upload_id)
+            return session
+
+    def discard(self, upload_id: str):
+        """세션 및 임시 파일 삭제"""
+        self._hashers.pop(upload_id, None)
+        with self._locks_guard:
+            self._locks.pop(upload_id, None)
+        session_dir = self._session_dir(upload_id)
+        if os.path.exists(session_dir):
+            shutil.rmtree(session_dir)
+
+    def cleanup_expired(self):
+        """오래된 세션 정리"""
+        if not os.path.exists(self.upload_dir):
+            return
+        now = time.time()
+        for upload_id in os.listdir(self.upload_dir):
+            try:
+                session = self.get_session(upload_id)
+                expired = now - session.get('updated_at', 0) > UPLOAD_SESSION_TTL
+            except (UploadError, OSError, ValueError):
+                # session.json 이 없거나 읽을 수 없는 폴더: create_session 이 폴더를 만들고 session.json 을 쓰기 전일 수 있으므로
+                # 폴더 수정 시각도 오래된 경우에만 만료로 봄
+                try:
+                    expired = now - os.path.getmtime(os.path.join(self.upload_dir, upload_id)) > UPLOAD_SESSION_TTL
+                except OSError:
+                    expired = False
+            if expired:
+                try:
+                    self.discard(upload_id)
+                    print(f"🧹 만료된 업로드 세션 삭제: {upload_id}")
+                except (UploadError, OSError) as e:
+                    print(f"⚠️ 업로드 세션 삭제 실패: {upload_id}, {e}")
+
+
+# 전역 분할 업로드 매니저 인스턴스
+chunked_upload_manager = ChunkedUploadManager(UPLOAD_DIR)
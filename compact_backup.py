@@ -0,0 +1,157 @@
+"""
+컴팩트 백업 형식 (테이블별 NDJSON + 압축)
+- database 를 backup_info.json 하나에 들여쓰기 JSON 으로 담지 않고 테이블마다 database/<키>.ndjson[.gz|.zst] 항목으로 기록
+  · 첫 줄은 컬럼 이름 배열, 이후 한 줄에 한 행(값 배열) -> 행마다 키 이름을 반복하지 않음
+- 압축: zstd (zstandard 패키지가 있을 때), gzip, none
+  · 이미 압축한 데이터이므로 ZIP 에는 STORED 로 넣음 (두 번 압축하지 않음)
+- 인코딩/디코딩 모두 스트리밍 (테이블 전체를 메모리에 올리지 않음)
+  · 백업 ZIP 을 보내는 동안 DB 연결을 잡고 있지 않도록 테이블은 먼저 임시 파일(spool_table)에 압축해 둠
+- backup_info.json 에는 메타데이터, 테이블 목록(tables), 라이브러리 파일 목록만 기록
+"""
+
+import io
+import os
+import json
+import zlib
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BACKUP_FORMATS = ('compact', 'json')
+COMPACT_FORMAT = 'compact'
+COMPACT_FORMAT_VERSION = '2.0'
+
+# 압축 방식 -> ZIP 항목 확장자
+COMPRESSION_EXTENSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+DEFAULT_COMPRESSION = os.environ.get('BACKUP_COMPRESSION') or ('zstd' if zstandard is not None else 'gzip')
+GZIP_LEVEL = int(os.environ.get('BACKUP_GZIP_LEVEL', 6))
+ZSTD_LEVEL = int(os.environ.get('BACKUP_ZSTD_LEVEL', 3))
+ENCODE_CHUNK_SIZE = 1024 * 1024  # 이만큼 모일 때마다 압축하여 내보냄
+DECODE_CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_MEMORY = int(os.environ.get('BACKUP_SPOOL_MAX_MEMORY', 8 * 1024 * 1024))  # 이보다 큰 테이블은 디스크에 임시 저장
+
+
+def available_compressions() -> List[str]:
+    return [name for name in COMPRESSION_EXTENSIONS if name != 'zstd' or zstandard is not None]
+
+
+def resolve_compression(name: Optional[str]) -> str:
+    """압축 방식 이름 확인 (없으면 기본값), 지원하지 않으면 ValueError"""
+    name = (name or DEFAULT_COMPRESSION).lower()
+    if name not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f'지원하지 않는 압축 방식입니다: {name}')
+    if name == 'zstd' and zstandard is None:
+        raise ValueError('zstd 압축을 사용하려면 zstandard 패키지가 필요합니다.')
+    return name
+
+
+def table_member_name(key: str, compression: str) -> str:
+    return f'database/{key}.ndjson{COMPRESSION_EXTENSIONS[compression]}'
+
+
+def _compressor(compression: str):
+    if compression == 'gzip':
+        # wbits 31: gzip 헤더/트레일러 포함 (gzip 모듈, zcat 으로 읽을 수 있음)
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    return None
+
+
+def encode_table(columns: List[str], rows: Iterable[Dict[str, Any]], compression: str,
+                 on_row: Optional[Callable[[], None]] = None) -> Iterator[bytes]:
+    """테이블 행을 NDJSON 으로 인코딩하여 (압축된) 바이트 청크로 반환
+
+    rows  : 컬럼 이름 -> 값 (datetime 등은 미리 직렬화)
+    on_row: 행 하나를 인코딩할 때마다 호출 (행 수 집계용)
+    """
+    compressor = _compressor(compression)
+    lines = [json.dumps(columns, ensure_ascii=False, separators=(',', ':'))]
+    size = len(lines[0])
+
+    def flush():
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        lines.clear()
+        return compressor.compress(data) if compressor is not None else data
+
+    for row in rows:
+        line = json.dumps([row.get(column) for column in columns], ensure_ascii=False, separators=(',', ':'))
+        lines.append(line)
+        size += len(line) + 1
+        if on_row is not None:
+            on_row()
+        if size >= ENCODE_CHUNK_SIZE:
+            size = 0
+            chunk = flush()
+            if chunk:
+                yield chunk
+    if lines:
+        chunk = flush()
+        if chunk:
+            yield chunk
+    if compressor is not None:
+        chunk = compressor.flush()
+        if chunk:
+            yield chunk
+
+
+def spool_table(columns: List[str], rows: Iterable[Dict[str, Any]], compression: str,
+                on_row: Optional[Callable[[], None]] = None):
+    """encode_table 결과를 임시 파일(SPOOL_MAX_MEMORY 까지는 메모리)에 모두 기록하고 처음 위치로 되감아 반환"""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    try:
+        for chunk in encode_table(columns, rows, compression, on_row=on_row):
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def iter_spool(spool, block_size: int = ENCODE_CHUNK_SIZE) -> Iterator[bytes]:
+    """spool_table 로 만든 임시 파일을 청크로 읽고 다 읽으면 닫음"""
+    try:
+        while True:
+            block = spool.read(block_size)
+            if not block:
+                break
+            yield block
+    finally:
+        spool.close()
+
+
+def decode_table(stream, compression: str) -> Iterator[Dict[str, Any]]:
+    """encode_table 로 기록한 바이트 스트림에서 행(dict)을 하나씩 읽기"""
+    if compression == 'gzip':
+        import gzip
+        raw = gzip.GzipFile(fileobj=stream, mode='rb')
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ValueError('zstd 로 압축된 백업을 읽으려면 zstandard 패키지가 필요합니다.')
+        raw = zstandard.ZstdDecompressor().stream_reader(stream, read_size=DECODE_CHUNK_SIZE)
+    elif compression == 'none':
+        raw = stream
+    else:
+        raise ValueError(f'지원하지 않는 압축 방식입니다: {compression}')
+
+    text = io.TextIOWrapper(io.BufferedReader(raw, DECODE_CHUNK_SIZE) if compression == 'zstd' else raw,
+                            encoding='utf-8')
+    header = text.readline()
+    if not header:
+        return
+    columns = json.loads(header)
+    while True:
+        # 줄마다 json.loads 를 부르지 않고 DECODE_CHUNK_SIZE 만큼의 줄을 배열 하나로 묶어 파싱
+        lines = text.readlines(DECODE_CHUNK_SIZE)
+        if not lines:
+            return
+        lines = [line for line in lines if line.strip()]
+        if not lines:
+            continue
+        for values in json.loads('[' + ','.join(lines) + ']'):
+            yield dict(zip(columns, values))
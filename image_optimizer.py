@@ -0,0 +1,218 @@
+"""
+라이브러리 이미지 최적화
+- 업로드 시 PNG 무손실 재압축 (색상 수가 256개 이하면 팔레트로 변환)
+- WebP / AVIF 대체 이미지 생성 (AVIF는 Pillow 플러그인이 있을 때만)
+- 손실 압축 결과는 PSNR 품질 기준을 통과한 경우에만 채택
+- 서빙 시 Accept 헤더에 맞는 가장 작은 변형 선택
+"""
+
+import io
+import os
+import json
+import math
+from typing import Dict, Any, Optional
+
+from PIL import Image, ImageChops, ImageStat
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+# 환경 변수 설정
+IMAGE_OPTIMIZE_ENABLED = os.environ.get('IMAGE_OPTIMIZE', 'true').lower() == 'true'
+IMAGE_OPTIMIZE_MIN_PSNR = float(os.environ.get('IMAGE_OPTIMIZE_MIN_PSNR', '40'))
+IMAGE_OPTIMIZE_WEBP_QUALITY = int(os.environ.get('IMAGE_OPTIMIZE_WEBP_QUALITY', '90'))
+IMAGE_OPTIMIZE_AVIF_QUALITY = int(os.environ.get('IMAGE_OPTIMIZE_AVIF_QUALITY', '80'))
+
+# 라이브러리 images 폴더 옆에 생성되는 변형 폴더 이름
+VARIANTS_DIR = 'variants'
+
+OPTIMIZABLE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'bmp', 'webp'}
+
+# RGBA 로 바꿔도 픽셀 값이 그대로 보존되는 모드 (16비트/정수/실수 모드 등은 원본 교체 안 함)
+LOSSLESS_RGBA_MODES = {'1', 'L', 'LA', 'P', 'PA', 'RGB', 'RGBA'}
+
+# Accept 헤더 우선순위 (앞쪽이 우선)
+VARIANT_MIMETYPES = [
+    ('avif', 'image/avif'),
+    ('webp', 'image/webp'),
+]
+
+
+def get_variants_path(images_path: str) -> str:
+    """images 폴더에 대응하는 변형 이미지 폴더 경로"""
+    return os.path.join(os.path.dirname(images_path), VARIANTS_DIR)
+
+
+def _variant_filename(filename: str, fmt: str) -> str:
+    return f"{filename}.{fmt}"
+
+
+def _manifest_path(variants_path: str, filename: str) -> str:
+    return os.path.join(variants_path, f"{filename}.json")
+
+
+def compute_psnr(original: Image.Image, candidate: Image.Image) -> float:
+    """두 이미지의 PSNR(dB) 계산 (RGBA 기준)"""
+    diff = ImageChops.difference(original.convert('RGBA'), candidate.convert('RGBA'))
+    stat = ImageStat.Stat(diff)
+    pixel_count = original.size[0] * original.size[1]
+    mse = sum(stat.sum2) / (pixel_count * len(stat.sum2))
+    if mse == 0:
+        return float('inf')
+    return 10 * math.log10((255 ** 2) / mse)
+
+
+def _encode(img: Image.Image, fmt: str, **params) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def recompress_png(img: Image.Image) -> Optional[bytes]:
+    """PNG 무손실 재압축 (가능하면 팔레트 양자화)"""
+    candidates = [_encode(img, 'PNG', optimize=True)]
+
+    # 256색 이하인 경우 팔레트로 변환 후 원본과 완전히 같은지 확인
+    if img.getcolors(256) is not None:
+        source = img.convert('RGBA')
+        paletted = source.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        if ImageChops.difference(paletted.convert('RGBA'), source).getbbox() is None:
+            candidates.append(_encode(paletted, 'PNG', optimize=True))
+
+    return min(candidates, key=len)
+
+
+def _lossy_variant(img: Image.Image, fmt: str, quality: int, min_psnr: float) -> Optional[bytes]:
+    """손실 압축 변형 생성 후 품질 기준 검사 (기준 미달 시 무손실로 재시도)"""
+    data = _encode(img, fmt, quality=quality)
+    with Image.open(io.BytesIO(data)) as decoded:
+        if compute_psnr(img, decoded) >= min_psnr:
+            return data
+    if fmt == 'WEBP':
+        return _encode(img, fmt, lossless=True, method=6)
+    return None
+
+
+def optimize_library_image(file_path: str, min_psnr: float = None) -> Dict[str, Any]:
+    """업로드된 라이브러리 이미지 최적화
+
+    - 원본 PNG는 더 작아지는 경우에만 무손실 재압축 결과로 교체 (RGBA 로 손실 없이 바뀌는 모드만)
+    - WebP/AVIF 변형은 원본보다 작을 때만 variants 폴더에 저장
+    - 결과는 variants/<filename>.json 에 기록
+    """
+    if not IMAGE_OPTIMIZE_ENABLED:
+        return {}
+
+    filename = os.path.basename(file_path)
+    ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if ext not in OPTIMIZABLE_EXTENSIONS:
+        return {}
+
+    if min_psnr is None:
+        min_psnr = IMAGE_OPTIMIZE_MIN_PSNR
+
+    variants_path = get_variants_path(os.path.dirname(file_path))
+    os.makedirs(variants_path, exist_ok=True)
+    remove_variants(os.path.dirname(file_path), filename)
+
+    original_size = os.path.getsize(file_path)
+    result = {'original_size': original_size, 'variants': {}}
+
+    with Image.open(file_path) as img:
+        if getattr(img, 'is_animated', False):
+            return {}
+        img.load()
+        mode = img.mode
+        source = img.convert('RGBA') if mode not in ('RGB', 'RGBA') else img.copy()
+
+    # PNG 무손실 재압축
+    if ext == 'png' and mode in LOSSLESS_RGBA_MODES:
+        data = recompress_png(source)
+        if data and len(data) < original_size:
+            tmp_path = file_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, file_path)
+            print(f"🗜️ PNG 재압축: {filename} {original_size} -> {len(data)} bytes")
+        result['size'] = os.path.getsize(file_path)
+    else:
+        if ext == 'png':
+            print(f"ℹ️ PNG 재압축 건너뜀 ({mode} 모드는 RGBA 로 바꾸면 손실): {filename}")
+        result['size'] = original_size
+
+    # WebP / AVIF 변형 생성
+    formats = [('webp', 'WEBP', IMAGE_OPTIMIZE_WEBP_QUALITY)]
+    if 'AVIF' in Image.SAVE:
+        formats.insert(0, ('avif', 'AVIF', IMAGE_OPTIMIZE_AVIF_QUALITY))
+
+    for key, fmt, quality in formats:
+        if key == ext:
+            continue
+        try:
+            data = _lossy_variant(source, fmt, quality, min_psnr)
+        except Exception as e:
+            print(f"⚠️ {fmt} 변형 생성 실패: {filename}, {e}")
+            continue
+        if data and len(data) < result['size']:
+            with open(os.path.join(variants_path, _variant_filename(filename, key)), 'wb') as f:
+                f.write(data)
+            result['variants'][key] = len(data)
+
+    with open(_manifest_path(variants_path, filename), 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+    print(f"✅ 이미지 최적화 완료: {filename} {result}")
+    return result
+
+
+def remove_variants(images_path: str, filename: str):
+    """이미지 삭제/덮어쓰기 시 변형 파일 정리"""
+    variants_path = get_variants_path(images_path)
+    targets = [_manifest_path(variants_path, filename)]
+    targets += [os.path.join(variants_path, _variant_filename(filename, key)) for key, _ in VARIANT_MIMETYPES]
+    for path in targets:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def accepted_variants(accept_header: str) -> tuple:
+    """Accept 헤더가 받는 변형 형식 (VARIANT_MIMETYPES 순서, 예: ('avif', 'webp'), 없으면 ())
+
+    형식을 명시한 항목만 인정하고 (*/*, image/* 는 디코딩 지원을 뜻하지 않음) q=0 은 거부로 처리
+    브라우저마다 Accept 헤더 문자열이 달라도 결과는 몇 가지뿐이므로 조회 결과 메모의 키로 사용
+    """
+    if not accept_header:
+        return ()
+    qualities: Dict[str, float] = {}
+    for value, quality in parse_accept_header(accept_header, MIMEAccept):
+        value = value.lower()
+        qualities[value] = min(quality, qualities.get(value, quality))
+    return tuple(key for key, mimetype in VARIANT_MIMETYPES if qualities.get(mimetype, 0) > 0)
+
+
+def select_variant(images_path: str, filename: str, accepted: tuple):
+    """받을 수 있는 변형 형식(accepted_variants 결과) 중 원본보다 작은 가장 작은 변형 선택
+
+    크기는 최적화 시 기록한 variants/<파일>.json 에서 읽음 (없으면 원본 전송)
+    반환값: (directory, filename, mimetype) 또는 원본을 보내야 하면 None
+    """
+    variants_path = get_variants_path(images_path)
+    try:
+        with open(_manifest_path(variants_path, filename), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        original_size = manifest['size']
+        sizes = manifest['variants']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    mimetypes = dict(VARIANT_MIMETYPES)
+    best = None
+    for key in accepted:
+        size = sizes.get(key)
+        if size is None or size >= original_size or (best and size >= best[0]):
+            continue
+        variant = _variant_filename(filename, key)
+        if os.path.exists(os.path.join(variants_path, variant)):
+            best = (size, variant, mimetypes[key])
+    if best is None:
+        return None
+    return variants_path, best[1], best[2]
@@ -0,0 +1,347 @@
+"""
+증분 백업 (기준 백업 + 증분 체인)
+- 백업 저장소(backups/incremental/)의 manifest.json 에 파일 해시와 테이블별 기준 시각(watermark)을 기록
+- 증분 아카이브에는 새로 생기거나 바뀐 파일(해시 기준)과 행(updated_at 기준)만 저장
+  · watermark 는 백업 시작 시각(UTC)에서 WATERMARK_MARGIN_SECONDS 를 뺀 값
+    (updated_at 은 커밋보다 먼저 찍히므로 max(updated_at) 을 쓰면 늦게 커밋된 행을 놓침)
+  · 따라서 연속한 증분 사이에 margin 만큼 겹쳐 같은 행이 다시 저장될 수 있으나,
+    복구 시 id 기준으로 덮어쓰므로 결과는 같음 (margin 보다 오래 열린 트랜잭션의 행만 놓칠 수 있음)
+  · 같은 내용의 파일이 이미 체인에 있으면 다시 저장하지 않고 위치만 참조
+  · 파일 해시는 (크기, mtime) 이 같으면 다시 계산하지 않음
+  · 삭제를 반영하기 위해 각 아카이브는 전체 파일 목록과 테이블별 전체 id 목록을 가짐
+    (복구 시 체인에 나온 library 폴더에서 마지막 파일 목록에 없는 파일은 지움)
+- 복구는 기준 백업부터 지정한 증분까지 순서대로 적용 (테이블 적재는 bulk_restore, 한 트랜잭션)
+- 체인이 MAX_CHAIN_LENGTH 를 넘으면 자동으로 새 기준 백업 생성
+"""
+
+import os
+import json
+import uuid
+import zipfile
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Callable, List, Optional
+
+from sqlalchemy import select, DateTime
+
+from asset_server import asset_server, compute_file_hash
+from streaming_zip import write_zip
+from library_scanner import LibraryScanner
+from bulk_restore import bulk_restore
+
+INCREMENTAL_BACKUP_DIR = os.environ.get(
+    'INCREMENTAL_BACKUP_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backups', 'incremental')
+)
+MAX_CHAIN_LENGTH = int(os.environ.get('INCREMENTAL_BACKUP_MAX_CHAIN', 14))  # 기준 백업 뒤에 붙는 최대 증분 수
+# watermark 를 백업 시작 시각보다 이만큼 앞당김 (이보다 오래 걸리는 트랜잭션은 없다고 가정)
+WATERMARK_MARGIN_SECONDS = float(os.environ.get('INCREMENTAL_BACKUP_WATERMARK_MARGIN', 300))
+
+MANIFEST_FILENAME = 'manifest.json'
+ARCHIVE_MANIFEST = 'backup_manifest.json'
+MANIFEST_VERSION = 1
+
+
+class BackupError(Exception):
+    """증분 백업/복구 오류"""
+
+
+def serialize_row(table, row) -> Dict[str, Any]:
+    data = dict(row._mapping)
+    for column in table.columns:
+        value = data.get(column.name)
+        if isinstance(value, datetime):
+            data[column.name] = value.isoformat()
+    return data
+
+
+def deserialize_row(table, data: Dict[str, Any]) -> Dict[str, Any]:
+    row = {}
+    for column in table.columns:
+        if column.name not in data:
+            continue
+        value = data[column.name]
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        row[column.name] = value
+    return row
+
+
+class IncrementalBackupStore:
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        self._lock = threading.Lock()
+
+    # 매니페스트
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.store_dir, MANIFEST_FILENAME)
+
+    def load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': MANIFEST_VERSION, 'archives': [], 'head': None, 'tables': {}, 'files': {}, 'blobs': {}}
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    # 아카이브 조회
+    def archive_path(self, name: str) -> str:
+        if not name or os.path.basename(name) != name or not name.endswith('.zip'):
+            raise BackupError('Invalid backup name')
+        return os.path.join(self.store_dir, name)
+
+    def list_archives(self) -> List[Dict[str, Any]]:
+        manifest = self.load_manifest()
+        archives = []
+        for record in manifest['archives']:
+            record = dict(record)
+            record['available'] = os.path.exists(os.path.join(self.store_dir, record['name']))
+            archives.append(record)
+        archives.sort(key=lambda r: r['created_at'], reverse=True)
+        return archives
+
+    def chain(self, name: str) -> List[Dict[str, Any]]:
+        """기준 백업부터 name 까지의 아카이브 목록"""
+        records = {record['name']: record for record in self.load_manifest()['archives']}
+        chain = []
+        while name:
+            record = records.get(name)
+            if record is None:
+                raise BackupError(f'Backup not found: {name}')
+            if not os.path.exists(self.archive_path(name)):
+                raise BackupError(f'Backup file is missing: {name}')
+            chain.append(record)
+            name = record.get('parent')
+        chain.reverse()
+        return chain
+
+    # 백업
+    def create(self, session, models: List, projects_dir: str, full: bool = False,
+               on_progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, Any]:
+        """백업 아카이브 생성 (체인이 없거나 full 이면 기준 백업)
+
+        models: 부모 테이블이 먼저 오도록 정렬된 SQLAlchemy 모델 목록
+        """
+        progress = on_progress or (lambda message, percentage: None)
+        with self._lock:
+            manifest = self.load_manifest()
+            head = manifest.get('head')
+            chain_length = 0
+            if head:
+                try:
+                    chain_length = len(self.chain(head))
+                except BackupError:
+                    head = None
+            is_base = full or not head or chain_length > MAX_CHAIN_LENGTH
+
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            name = f"backup_{timestamp}_{'base' if is_base else 'incr'}_{uuid.uuid4().hex[:6]}.zip"
+            blobs = {} if is_base else dict(manifest['blobs'])
+            entries = []
+
+            # 테이블: updated_at 이 있는 테이블은 마지막 백업 이후 바뀐 행만
+            progress('데이터베이스 변경 사항을 수집하고 있습니다...', 10)
+            tables_info = {}
+            watermarks = {}
+            # 행을 읽기 전에 정함 (updated_at 과 같은 기준인 UTC)
+            watermark = (datetime.utcnow() - timedelta(seconds=WATERMARK_MARGIN_SECONDS)).isoformat()
+            for model in models:
+                table = model.__table__
+                previous = manifest['tables'].get(table.name, {})
+                query = select(table)
+                since = None
+                if 'updated_at' in table.columns:
+                    watermarks[table.name] = watermark
+                    if not is_base and previous.get('watermark'):
+                        since = previous['watermark']
+                        query = query.where(table.c.updated_at >= datetime.fromisoformat(since))
+                rows = [serialize_row(table, row) for row in session.execute(query.order_by(*table.primary_key.columns))]
+                ids = [row[0] for row in session.execute(select(*table.primary_key.columns).order_by(*table.primary_key.columns))]
+                tables_info[table.name] = {'since': since, 'rows': len(rows), 'ids': ids}
+                entries.append((f'tables/{table.name}.json', json.dumps(rows, ensure_ascii=False).encode('utf-8')))
+
+            # 파일: 해시 기준으로 체인에 없는 내용만 저장
+            progress('라이브러리 파일 변경 사항을 확인하고 있습니다...', 30)
+            file_cache = manifest['files']
+            new_file_cache = {}
+            files_info = {}
+            stored = 0
+            stored_bytes = 0
+            for file in LibraryScanner(projects_dir).iter_files(use_cache=False):
+                arcname, file_path, size = file['arcname'], file['file_path'], file['size']
+                cached = file_cache.get(arcname)
+                if cached and cached['size'] == size and cached['mtime_ns'] == file['mtime_ns']:
+                    sha256 = cached['sha256']
+                else:
+                    try:
+                        sha256 = compute_file_hash(file_path)
+                    except OSError as e:
+                        print(f"⚠️ 백업 파일 확인 실패: {file_path}, {e}")
+                        continue
+                new_file_cache[arcname] = {'size': size, 'mtime_ns': file['mtime_ns'], 'sha256': sha256}
+
+                location = blobs.get(sha256)
+                if location is None:
+                    location = {'archive': name, 'member': f'files/{sha256[:2]}/{sha256}'}
+                    blobs[sha256] = location
+                    entries.append((location['member'], file_path))
+                    stored += 1
+                    stored_bytes += size
+                files_info[arcname] = {'sha256': sha256, 'size': size, **location}
+
+            archive_manifest = {
+                'version': MANIFEST_VERSION,
+                'name': name,
+                'type': 'base' if is_base else 'incremental',
+                'parent': None if is_base else head,
+                'created_at': datetime.now().isoformat(),
+                'tables': tables_info,
+                'files': files_info
+            }
+            entries.insert(0, (ARCHIVE_MANIFEST, json.dumps(archive_manifest, ensure_ascii=False).encode('utf-8')))
+
+            progress(f'백업 파일을 기록하고 있습니다... (새 파일 {stored}개)', 50)
+            total_entries = len(entries)
+            written_entries = {'count': 0}
+
+            def on_entry(arcname, error):
+                if error:
+                    raise BackupError(f'백업 파일 추가 실패: {arcname}, {error}')
+                written_entries['count'] += 1
+                if written_entries['count'] % 50 == 0:
+                    progress(f"백업 파일을 기록하고 있습니다... ({written_entries['count']}/{total_entries})",
+                             50 + written_entries['count'] * 45 // total_entries)
+
+            os.makedirs(self.store_dir, exist_ok=True)
+            size = write_zip(self.archive_path(name), entries, on_entry=on_entry)
+
+            record = {
+                'name': name,
+                'type': archive_manifest['type'],
+                'parent': archive_manifest['parent'],
+                'created_at': archive_manifest['created_at'],
+                'size': size,
+                'files': len(files_info),
+                'files_stored': stored,
+                'files_stored_bytes': stored_bytes,
+                'rows': {table_name: info['rows'] for table_name, info in tables_info.items()}
+            }
+            manifest['archives'].append(record)
+            manifest['head'] = name
+            manifest['tables'] = {table_name: {'watermark': watermark} for table_name, watermark in watermarks.items()}
+            manifest['files'] = new_file_cache
+            manifest['blobs'] = blobs
+            self._save_manifest(manifest)
+
+        kind = '기준' if is_base else '증분'
+        print(f"💾 {kind} 백업 생성: {name} ({size / 1024 / 1024:.2f}MB, 새 파일 {stored}개)")
+        return record
+
+    # 복구
+    def restore(self, name: str, session, models: List, projects_dir: str,
+                restore_database: bool = True, restore_libraries: bool = True,
+                on_progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, Any]:
+        """기준 백업부터 name 까지 순서대로 적용하여 복구
+
+        반환값: {'chain': [...], 'rows': {table: n}, 'files': n, 'libraries': [복구한 library 폴더]}
+        """
+        progress = on_progress or (lambda message, percentage: None)
+        chain = self.chain(name)
+        archives = {}
+        try:
+            for record in chain:
+                archives[record['name']] = zipfile.ZipFile(self.archive_path(record['name']), 'r')
+            final = json.loads(archives[name].read(ARCHIVE_MANIFEST))
+            result = {'chain': [record['name'] for record in chain], 'rows': {}, 'files': 0, 'libraries': []}
+
+            if restore_database:
+                progress(f'데이터베이스를 복구하고 있습니다... (아카이브 {len(chain)}개)', 30)
+                result['rows'] = self._restore_tables(session, models, chain, archives, final)
+
+            if restore_libraries:
+                progress('라이브러리 파일들을 복구하고 있습니다...', 70)
+                result['files'], result['libraries'] = self._restore_files(projects_dir, chain, archives, final)
+            return result
+        finally:
+            for archive in archives.values():
+                archive.close()
+
+    def _restore_tables(self, session, models, chain, archives, final) -> Dict[str, int]:
+        # 체인 순서대로 행을 덮어쓴 뒤 마지막 백업 시점에 있던 id 만 남김
+        tables = {}
+        for model in models:
+            table = model.__table__
+            rows = {}
+            for record in chain:
+                member = f'tables/{table.name}.json'
+                if member not in archives[record['name']].namelist():
+                    continue
+                for row in json.loads(archives[record['name']].read(member)):
+                    rows[row[table.primary_key.columns.keys()[0]]] = row
+            final_ids = set(final['tables'].get(table.name, {}).get('ids', []))
+            tables[table.name] = [deserialize_row(table, row) for row_id, row in rows.items() if row_id in final_ids]
+
+        return bulk_restore(session, [(model.__table__, tables[model.__table__.name]) for model in models])
+
+    def _restore_files(self, projects_dir, chain, archives, final):
+        # 마지막 백업의 파일을 쓴 뒤, 체인에 나온 library 폴더에서 마지막 백업에 없는 파일(그 사이 삭제된 파일)을 지움
+        root = os.path.dirname(os.path.realpath(projects_dir))
+        projects_root = os.path.realpath(projects_dir)
+        libraries = set()
+        for record in chain:
+            for arcname in json.loads(archives[record['name']].read(ARCHIVE_MANIFEST))['files']:
+                parts = arcname.split('/')
+                libraries.add(os.path.join(projects_root, parts[1], parts[2], 'library'))
+        count = 0
+        for arcname, info in final['files'].items():
+            target_path = os.path.realpath(os.path.join(root, arcname))
+            if not target_path.startswith(projects_root + os.sep):
+                print(f"⚠️ 잘못된 백업 경로 건너뜀: {arcname}")
+                continue
+            archive = archives.get(info['archive'])
+            if archive is None:
+                raise BackupError(f"Backup file is missing: {info['archive']}")
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            # 임시 파일에 쓴 뒤 교체 (mmap 으로 보내는 중인 파일을 제자리에서 자르지 않음)
+            tmp_path = target_path + '.tmp'
+            try:
+                with archive.open(info['member']) as source, open(tmp_path, 'wb') as target:
+                    while True:
+                        block = source.read(1024 * 1024)
+                        if not block:
+                            break
+                        target.write(block)
+                os.replace(tmp_path, target_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            count += 1
+
+        removed = 0
+        for file in LibraryScanner(projects_dir).iter_files(use_cache=False):
+            file_path = os.path.realpath(file['file_path'])
+            if file['arcname'] in final['files'] or not any(file_path.startswith(library + os.sep) for library in libraries):
+                continue
+            try:
+                os.remove(file_path)
+                removed += 1
+            except OSError as e:
+                print(f"⚠️ 삭제된 라이브러리 파일 정리 실패: {file_path}, {e}")
+        if removed:
+            print(f"🧹 백업 이후 삭제된 라이브러리 파일 {removed}개 제거")
+        for library in libraries:
+            asset_server.invalidate_prefix(library)
+        return count, sorted(libraries)
+
+
+# 전역 증분 백업 저장소 인스턴스
+incremental_backups = IncrementalBackupStore(INCREMENTAL_BACKUP_DIR)
@@ -0,0 +1,145 @@
+"""
+JSON 스트리밍(pull) 파서
+- 큰 JSON 문서(백업의 backup_info.json)를 통째로 json.loads 하지 않고 앞에서부터 필요한 만큼만 읽음
+- 객체는 키 단위(iter_object), 배열은 원소 단위(iter_array)로 순회하고, 나머지 값은 read_value 로 한 번에 디코딩
+  (메모리 사용량은 배열 원소 하나, 예: 테이블 행 하나 크기 수준)
+- 표준 라이브러리 json.JSONDecoder.raw_decode 만 사용 (추가 의존성 없음)
+"""
+
+import json
+from typing import Any, Iterator, TextIO
+
+READ_CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARS = frozenset('0123456789+-.eE')
+
+
+class JsonStreamReader:
+    """텍스트 스트림에서 JSON 값을 순서대로 읽는 pull 파서
+
+    iter_object 가 키를 내준 뒤 호출 측이 값을 읽지 않으면 다음 키로 넘어갈 때 자동으로 건너뜀
+    (중첩 순회를 중간에 멈추는 것은 지원하지 않음)
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = READ_CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._pending = False  # iter_object 가 내준 키의 값을 아직 읽지 않음
+
+    def _fill(self, size: int = 0) -> bool:
+        """스트림에서 size(기본 chunk_size)만큼 더 읽어 버퍼에 추가 (읽은 부분은 버림), 더 읽을 것이 없으면 False"""
+        if self._eof:
+            return False
+        chunk = self._stream.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """다음 공백이 아닌 문자 (문서 끝이면 '')"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f'JSON 형식 오류: {char!r} 가 필요하지만 {found!r} 를 만남 (위치 {self._pos})')
+        self._pos += 1
+
+    def _may_continue(self, value: Any, end: int) -> bool:
+        """디코딩한 값이 버퍼 경계에서 잘렸을 수 있는지
+
+        숫자는 뒤에 숫자가 아닌 문자가 나와야 끝난 것 (남은 버퍼가 모두 숫자 구성 문자면 아직 모름)
+        """
+        if end == len(self._buffer):
+            return True
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return all(char in NUMBER_CHARS for char in self._buffer[end:])
+        return False
+
+    def read_value(self) -> Any:
+        """다음 값 하나를 통째로 디코딩"""
+        self._pending = False
+        if not self._peek():
+            raise ValueError('JSON 형식 오류: 값이 없음')
+        # 다시 디코딩할 때마다 처음부터 파싱하므로, 읽는 양을 두 배씩 늘려 큰 값도 전체 비용이 값 크기에 비례하도록 함
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # 값이 버퍼 경계에서 잘림
+                size = max(size, len(self._buffer) - self._pos)
+                if self._fill(size):
+                    size *= 2
+                    continue
+                raise
+            if not self._eof and self._may_continue(value, end) and self._fill(size):
+                size *= 2
+                # 버퍼 끝에서 끝난 값이나 '2.' / '-3e' / '1.25e-' 처럼 잘렸을 수 있는 숫자는 더 읽고 다시 디코딩
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        """배열 원소를 하나씩 디코딩하여 반환"""
+        self._pending = False
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f'JSON 형식 오류: 배열 구분자 {separator!r} (위치 {self._pos - 1})')
+
+    def iter_object(self) -> Iterator[str]:
+        """객체의 키를 하나씩 반환 (값은 호출 측이 read_value/iter_array/iter_object/skip_value 로 읽음)"""
+        self._pending = False
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError('JSON 형식 오류: 객체 키가 문자열이 아님')
+            self._expect(':')
+            self._pending = True
+            yield key
+            if self._pending:
+                self.skip_value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f'JSON 형식 오류: 객체 구분자 {separator!r} (위치 {self._pos - 1})')
+
+    def skip_value(self):
+        """다음 값을 건너뜀 (배열/객체는 원소 단위로 읽고 버림)"""
+        char = self._peek()
+        if char == '[':
+            for _ in self.iter_array():
+                pass
+        elif char == '{':
+            for _ in self.iter_object():
+                pass
+        else:
+            self.read_value()
@@ -0,0 +1,274 @@
+"""
+라이브러리 가비지 컬렉터
+- projects/ 폴더를 돌며 DB와 에셋 참조 인덱스에 대응하지 않는 파일/폴더를 찾아 보고하거나 삭제
+  · 삭제된 사용자/프로젝트, 이름이 바뀐 프로젝트의 폴더 (폴더 이름은 프로젝트 이름 slug)
+  · 원본이 없는 썸네일, 시퀀스 썸네일, 이미지 변형(variants)
+  · sprite.png 또는 meta.json 이 없는 시퀀스 폴더
+  · (선택) 어떤 오브젝트도 참조하지 않는 라이브러리 이미지/시퀀스
+- 기본은 dry-run (보고만 함), 백그라운드 스레드에서 한 번에 하나의 작업만 실행
+- 파일 시스템 작업(stat/삭제) 횟수를 초당 제한하여 송출 중 디스크 부하를 줄임
+- 최근에 수정된 항목은 건너뜀 (GC 도중 생성/업로드 중인 파일 보호)
+"""
+
+import os
+import time
+import shutil
+import threading
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+
+from library_index import library_index
+from image_optimizer import VARIANTS_DIR, VARIANT_MIMETYPES, remove_variants
+from asset_server import asset_server
+
+PROJECTS_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'projects')
+
+GC_OPS_PER_SECOND = int(os.environ.get('LIBRARY_GC_OPS_PER_SECOND', 200))  # 초당 최대 stat/삭제 횟수
+GC_MIN_AGE = int(os.environ.get('LIBRARY_GC_MIN_AGE', 60 * 60))  # 이보다 최근에 수정된 항목은 건너뜀 (초)
+GC_REPORT_LIMIT = 1000  # 보고서에 포함하는 최대 항목 수
+
+# 항목 분류
+CATEGORIES = (
+    'orphan_user_folder',
+    'orphan_project_folder',
+    'orphan_thumbnail',
+    'orphan_sequence_thumbnail',
+    'orphan_variant',
+    'broken_sequence',
+    'unreferenced_image',
+    'unreferenced_sequence',
+)
+
+
+class LibraryGarbageCollector:
+    def __init__(self, projects_root: str):
+        self.projects_root = projects_root
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._job: Dict[str, Any] = {'status': 'idle'}
+        self._cancel = threading.Event()
+
+    # 작업 관리
+    def start(self, options: Dict[str, Any], build_snapshot: Callable[[], Dict[str, Any]],
+              is_live: Callable[[int, str], bool], context: Callable) -> Dict[str, Any]:
+        """백그라운드 GC 시작 (이미 실행 중이면 None)
+
+        options       : dry_run(기본 True), include_unreferenced, ops_per_second, min_age
+        build_snapshot: {'users': {user_id}, 'projects': {user_id: {slug: project_id}},
+                         'referenced': {project_id: {'image': {...}, 'sequence': {...}}}}
+        is_live       : (user_id, slug) -> 폴더를 쓰는 프로젝트가 있는지 (삭제 직전 재확인)
+        context       : 스레드에서 DB 조회에 사용할 앱 컨텍스트 팩토리
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return None
+            self._cancel.clear()
+            self._job = {
+                'status': 'running',
+                'options': options,
+                'started_at': datetime.utcnow().isoformat(),
+                'scanned': 0
+            }
+            self._thread = threading.Thread(
+                target=self._run_job, args=(options, build_snapshot, is_live, context), daemon=True
+            )
+            self._thread.start()
+            return dict(self._job)
+
+    def cancel(self) -> bool:
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        self._cancel.set()
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        return dict(self._job)
+
+    def _run_job(self, options, build_snapshot, is_live, context):
+        try:
+            with context():
+                snapshot = build_snapshot()
+                report = self.run(snapshot, is_live, **options)
+            self._job.update(report)
+            self._job['status'] = 'cancelled' if report['cancelled'] else 'completed'
+            action = '정리 가능' if report['dry_run'] else '정리 완료'
+            print(f"🧹 라이브러리 GC {action}: {sum(report['counts'].values())}개, {report['bytes'] / 1024 / 1024:.1f}MB")
+        except Exception as e:
+            self._job['status'] = 'failed'
+            self._job['error'] = str(e)
+            print(f"❌ 라이브러리 GC 오류: {e}")
+        finally:
+            self._job['finished_at'] = datetime.utcnow().isoformat()
+
+    # GC 본체
+    def run(self, snapshot: Dict[str, Any], is_live: Callable[[int, str], bool], dry_run: bool = True,
+            include_unreferenced: bool = False, ops_per_second: int = GC_OPS_PER_SECOND,
+            min_age: int = GC_MIN_AGE) -> Dict[str, Any]:
+        self._report = {
+            'dry_run': dry_run,
+            'items': [],
+            'counts': {category: 0 for category in CATEGORIES},
+            'bytes': 0,  # dry-run이면 정리 가능한 크기, 아니면 실제로 정리한 크기
+            'errors': [],
+            'cancelled': False
+        }
+        self._dry_run = dry_run
+        self._interval = 1.0 / ops_per_second if ops_per_second and ops_per_second > 0 else 0
+        self._cutoff = time.time() - min_age
+
+        for user_entry in self._scandir(self.projects_root):
+            if self._cancel.is_set():
+                self._report['cancelled'] = True
+                break
+            if not user_entry.is_dir(follow_symlinks=False) or not user_entry.name.startswith('user_'):
+                # 사용자 id 없는 예전 폴더 구조는 대상에서 제외
+                continue
+            try:
+                user_id = int(user_entry.name[len('user_'):])
+            except ValueError:
+                continue
+
+            if user_id not in snapshot['users']:
+                self._collect(user_entry.path, 'orphan_user_folder',
+                              recheck=lambda: is_live(user_id, None))
+                continue
+
+            projects = snapshot['projects'].get(user_id, {})
+            for project_entry in self._scandir(user_entry.path):
+                if self._cancel.is_set():
+                    break
+                if not project_entry.is_dir(follow_symlinks=False):
+                    continue
+                slug = project_entry.name
+                if slug not in projects:
+                    self._collect(project_entry.path, 'orphan_project_folder',
+                                  recheck=lambda: is_live(user_id, slug))
+                    continue
+                referenced = snapshot['referenced'].get(projects[slug]) if include_unreferenced else None
+                self._collect_library(os.path.join(project_entry.path, 'library'), referenced)
+
+        report = self._report
+        report['scanned'] = self._job.get('scanned', 0)
+        report['truncated'] = len(report['items']) >= GC_REPORT_LIMIT
+        return report
+
+    def _collect_library(self, library_path: str, referenced: Optional[Dict[str, set]]):
+        """프로젝트 라이브러리 내부의 고아 파일 수집"""
+        images_path = os.path.join(library_path, 'images')
+        sequences_path = os.path.join(library_path, 'sequences')
+        images = {entry.name for entry in self._scandir(images_path) if entry.is_file()}
+        sequences = {entry.name for entry in self._scandir(sequences_path) if entry.is_dir()}
+        image_stems = {os.path.splitext(name)[0] for name in images}
+
+        # 원본이 없는 썸네일
+        for entry in self._scandir(os.path.join(library_path, 'thumbnails')):
+            if entry.is_file() and os.path.splitext(entry.name)[0] not in image_stems:
+                self._collect(entry.path, 'orphan_thumbnail')
+        for entry in self._scandir(os.path.join(library_path, 'sequence_thumbnails')):
+            if entry.is_file() and os.path.splitext(entry.name)[0] not in sequences:
+                self._collect(entry.path, 'orphan_sequence_thumbnail')
+
+        # 원본이 없는 변형 (<filename>.webp, <filename>.avif, <filename>.json)
+        suffixes = tuple(f'.{key}' for key, _ in VARIANT_MIMETYPES) + ('.json',)
+        for entry in self._scandir(os.path.join(library_path, VARIANTS_DIR)):
+            if not entry.is_file():
+                continue
+            source = next((entry.name[:-len(s)] for s in suffixes if entry.name.endswith(s)), None)
+            if source is not None and source not in images:
+                self._collect(entry.path, 'orphan_variant')
+
+        # 업로드가 중간에 끊겨 필수 파일이 없는 시퀀스 폴더
+        for sequence_name in sorted(sequences):
+            folder = os.path.join(sequences_path, sequence_name)
+            if not (os.path.exists(os.path.join(folder, 'sprite.png')) and os.path.exists(os.path.join(folder, 'meta.json'))):
+                self._collect(folder, 'broken_sequence',
+                              on_delete=lambda name=sequence_name: library_index.remove_sequence(library_path, name))
+                sequences.discard(sequence_name)
+
+        if referenced is None:
+            return
+
+        # 어떤 오브젝트도 참조하지 않는 에셋 (썸네일/변형/인덱스 항목도 함께 정리)
+        for filename in sorted(images - referenced.get('image', set())):
+            self._collect(os.path.join(images_path, filename), 'unreferenced_image',
+                          on_delete=lambda name=filename: self._remove_image_extras(library_path, name))
+        for sequence_name in sorted(sequences - referenced.get('sequence', set())):
+            self._collect(os.path.join(sequences_path, sequence_name), 'unreferenced_sequence',
+                          on_delete=lambda name=sequence_name: self._remove_sequence_extras(library_path, name))
+
+    def _remove_image_extras(self, library_path: str, filename: str):
+        remove_variants(os.path.join(library_path, 'images'), filename)
+        thumb_path = os.path.join(library_path, 'thumbnails', f"{os.path.splitext(filename)[0]}.webp")
+        if os.path.exists(thumb_path):
+            os.remove(thumb_path)
+        library_index.remove_image(library_path, filename)
+
+    def _remove_sequence_extras(self, library_path: str, sequence_name: str):
+        thumb_path = os.path.join(library_path, 'sequence_thumbnails', f"{sequence_name}.webp")
+        if os.path.exists(thumb_path):
+            os.remove(thumb_path)
+        library_index.remove_sequence(library_path, sequence_name)
+
+    # 파일 시스템 헬퍼 (모든 작업은 속도 제한을 거침)
+    def _throttle(self):
+        self._job['scanned'] = self._job.get('scanned', 0) + 1
+        if self._interval:
+            time.sleep(self._interval)
+
+    def _scandir(self, path: str) -> List[os.DirEntry]:
+        self._throttle()
+        try:
+            with os.scandir(path) as entries:
+                return sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            return []
+
+    def _measure(self, path: str):
+        """(크기, 최근 수정 시각) 계산 (폴더는 하위 전체)"""
+        self._throttle()
+        stat = os.stat(path, follow_symlinks=False)
+        if not os.path.isdir(path):
+            return stat.st_size, stat.st_mtime
+        size, mtime = 0, stat.st_mtime
+        for entry in self._scandir(path):
+            entry_size, entry_mtime = self._measure(entry.path)
+            size += entry_size
+            mtime = max(mtime, entry_mtime)
+        return size, mtime
+
+    def _collect(self, path: str, category: str, recheck: Optional[Callable[[], bool]] = None,
+                 on_delete: Optional[Callable[[], None]] = None):
+        """고아 항목 기록 (dry-run이 아니면 삭제)"""
+        report = self._report
+        try:
+            size, mtime = self._measure(path)
+            if mtime > self._cutoff:
+                return
+            if not self._dry_run:
+                # 스냅샷 이후 같은 이름의 프로젝트가 생겼으면 유지
+                if recheck is not None and recheck():
+                    return
+                self._throttle()
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+                if on_delete is not None:
+                    on_delete()
+                asset_server.invalidate_prefix(path)
+        except OSError as e:
+            report['errors'].append({'path': os.path.relpath(path, self.projects_root), 'error': str(e)})
+            return
+
+        report['counts'][category] += 1
+        report['bytes'] += size
+        if len(report['items']) < GC_REPORT_LIMIT:
+            report['items'].append({
+                'path': os.path.relpath(path, self.projects_root),
+                'category': category,
+                'size': size
+            })
+
+
+# 전역 라이브러리 GC 인스턴스
+library_gc = LibraryGarbageCollector(PROJECTS_ROOT)
@@ -0,0 +1,431 @@
+"""
+프로젝트 라이브러리 인덱스
+- 프로젝트 library 폴더의 이미지/시퀀스 목록을 library/index.json 에 저장
+- 업로드/삭제 API에서 항목 단위로 갱신 (폴더 전체 스캔 없음)
+- 목록 조회는 메모리 캐시 또는 index.json 한 번 읽기로 처리
+- 인덱스가 없거나 손상되면 폴더를 스캔하여 재생성
+- 이미지 메타데이터(크기, 알파, 애니메이션 프레임 수, 대표 색상)는 백그라운드에서 추출
+- 항목마다 콘텐츠 해시 버전을 기록 (immutable URL의 ?v= 값)
+  전체 재생성 시에는 (크기, 수정 시각) 기반 임시 버전으로 먼저 저장하고 해시는 백그라운드 워커가 채움
+- 잠금은 라이브러리별로 분리 (한 라이브러리의 재생성이 다른 프로젝트 조회를 막지 않음)
+- 항목 갱신 시 해당 파일들의 에셋 서빙 캐시와 라이브러리 스캔 캐시도 함께 무효화
+"""
+
+import os
+import json
+import queue
+import threading
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+
+from PIL import Image
+
+from sequence_pack import describe_sequence
+from asset_server import asset_server
+from library_scanner import library_scanner
+
+INDEX_FILENAME = 'index.json'
+INDEX_VERSION = 3
+
+# 메타데이터 워커가 한 번에 처리하는 최대 항목 수 (인덱스 저장 횟수 절감)
+METADATA_BATCH_SIZE = 100
+
+
+def extract_image_metadata(file_path: str) -> Dict[str, Any]:
+    """이미지 메타데이터 추출 (크기, 알파 사용 여부, 프레임 수, 대표 색상)"""
+    with Image.open(file_path) as img:
+        width, height = img.size
+        frame_count = getattr(img, 'n_frames', 1)
+
+        rgba = img.convert('RGBA')
+        has_alpha = rgba.getchannel('A').getextrema()[0] < 255
+
+        # 64x64로 축소 후 불투명 픽셀을 32단계 버킷으로 묶어 가장 많은 색상 선택
+        rgba.thumbnail((64, 64))
+        buckets = Counter()
+        sums = {}
+        for count, (r, g, b, a) in rgba.getcolors(64 * 64) or []:
+            if a < 128:
+                continue
+            key = (r >> 5, g >> 5, b >> 5)
+            buckets[key] += count
+            total = sums.setdefault(key, [0, 0, 0])
+            total[0] += r * count
+            total[1] += g * count
+            total[2] += b * count
+
+        dominant_color = None
+        if buckets:
+            key, count = buckets.most_common(1)[0]
+            dominant_color = '#{:02x}{:02x}{:02x}'.format(*(c // count for c in sums[key]))
+
+    return {
+        'width': width,
+        'height': height,
+        'has_alpha': has_alpha,
+        'frame_count': frame_count,
+        'dominant_color': dominant_color
+    }
+
+
+class LibraryIndex:
+    def __init__(self):
+        # 구조: {library_path: {'mtime': float, 'data': {...}}}
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        # 라이브러리별 잠금 (잠금 사전 자체는 _locks_guard로 보호)
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+
+        # 메타데이터 추출 백그라운드 워커
+        self._metadata_queue: queue.Queue = queue.Queue()
+        self._metadata_thread = None
+
+    # 경로 헬퍼
+    @staticmethod
+    def index_path(library_path: str) -> str:
+        return os.path.join(library_path, INDEX_FILENAME)
+
+    def _library_lock(self, library_path: str) -> threading.RLock:
+        with self._locks_guard:
+            lock = self._locks.get(library_path)
+            if lock is None:
+                lock = self._locks[library_path] = threading.RLock()
+            return lock
+
+    # 항목 생성
+    @staticmethod
+    def _version(file_path: str, content_hash: bool) -> Optional[str]:
+        """파일 버전 문자열 (content_hash=False면 해시 없이 크기/수정 시각으로 만든 임시 값)
+
+        임시 값은 '-'를 포함하므로 해시 접두사와 일치하지 않아 immutable 캐시가 적용되지 않음
+        """
+        if content_hash:
+            return asset_server.asset_version(file_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+    def build_image_entry(self, library_path: str, filename: str, content_hash: bool = True) -> Optional[Dict[str, Any]]:
+        """이미지 파일 하나의 인덱스 항목 생성"""
+        file_path = os.path.join(library_path, 'images', filename)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        entry = {
+            'name': filename,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'width': None,
+            'height': None,
+            'has_alpha': None,
+            'frame_count': None,
+            'dominant_color': None,
+            'metadata_pending': True,
+            'version': self._version(file_path, content_hash),
+            'thumbnail': None,
+            'thumbnail_version': None
+        }
+
+        # 크기는 헤더만 읽어 즉시 기록, 나머지는 백그라운드 워커가 채움
+        try:
+            with Image.open(file_path) as img:
+                entry['width'], entry['height'] = img.size
+        except Exception as e:
+            print(f"⚠️ 이미지 크기 확인 실패: {file_path}, {e}")
+
+        thumb_name = f"{os.path.splitext(filename)[0]}.webp"
+        thumb_path = os.path.join(library_path, 'thumbnails', thumb_name)
+        if os.path.exists(thumb_path):
+            entry['thumbnail'] = thumb_name
+            entry['thumbnail_version'] = self._version(thumb_path, content_hash)
+        return entry
+
+    def build_sequence_entry(self, library_path: str, sequence_name: str, content_hash: bool = True) -> Optional[Dict[str, Any]]:
+        """시퀀스 폴더 하나의 인덱스 항목 생성"""
+        sequences_path = os.path.join(library_path, 'sequences')
+        seq_path = os.path.join(sequences_path, sequence_name)
+        if not os.path.isdir(seq_path):
+            return None
+
+        entry = describe_sequence(sequences_path, sequence_name)
+        size = 0
+        mtime = os.stat(seq_path).st_mtime
+        with os.scandir(seq_path) as it:
+            for item in it:
+                if item.is_file():
+                    item_stat = item.stat()
+                    size += item_stat.st_size
+                    mtime = max(mtime, item_stat.st_mtime)
+
+        entry['size'] = size
+        entry['mtime'] = mtime
+        entry.setdefault('frame_count', None)
+        # 스프라이트/팩 파일별 버전 (immutable URL용)
+        entry['versions'] = {}
+        for name in ('sprite.png', 'sequence.pack'):
+            file_path = os.path.join(seq_path, name)
+            if os.path.exists(file_path):
+                entry['versions'][name] = self._version(file_path, content_hash)
+        thumb_name = f"{sequence_name}.webp"
+        thumb_path = os.path.join(library_path, 'sequence_thumbnails', thumb_name)
+        entry['thumbnail'] = thumb_name if os.path.exists(thumb_path) else None
+        entry['thumbnail_version'] = self._version(thumb_path, content_hash) if entry['thumbnail'] else None
+        return entry
+
+    # 로드 / 저장
+    def rebuild(self, library_path: str) -> Dict[str, Any]:
+        """library 폴더를 스캔하여 인덱스 재생성 (파일 해시는 계산하지 않고 백그라운드 워커에 맡김)"""
+        with self._library_lock(library_path):
+            data = {'version': INDEX_VERSION, 'images': {}, 'sequences': {}}
+
+            images_path = os.path.join(library_path, 'images')
+            if os.path.isdir(images_path):
+                with os.scandir(images_path) as it:
+                    for item in it:
+                        if item.is_file():
+                            entry = self.build_image_entry(library_path, item.name, content_hash=False)
+                            if entry:
+                                data['images'][item.name] = entry
+
+            sequences_path = os.path.join(library_path, 'sequences')
+            if os.path.isdir(sequences_path):
+                with os.scandir(sequences_path) as it:
+                    for item in it:
+                        if item.is_dir():
+                            entry = self.build_sequence_entry(library_path, item.name, content_hash=False)
+                            if entry:
+                                data['sequences'][item.name] = entry
+
+            print(f"📇 라이브러리 인덱스 재생성: {library_path} (이미지 {len(data['images'])}개, 시퀀스 {len(data['sequences'])}개)")
+            self._save(library_path, data)
+            for filename in data['images']:
+                self.schedule_metadata(library_path, filename)
+            for sequence_name in data['sequences']:
+                self.schedule_sequence_versions(library_path, sequence_name)
+            return data
+
+    def load(self, library_path: str) -> Dict[str, Any]:
+        """인덱스 조회 (캐시 -> index.json -> 재생성 순)"""
+        with self._library_lock(library_path):
+            path = self.index_path(library_path)
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                self._cache.pop(library_path, None)
+                if not os.path.isdir(library_path):
+                    return {'version': INDEX_VERSION, 'images': {}, 'sequences': {}}
+                return self.rebuild(library_path)
+
+            cached = self._cache.get(library_path)
+            if cached and cached['mtime'] == mtime:
+                return cached['data']
+
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') != INDEX_VERSION:
+                    return self.rebuild(library_path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 라이브러리 인덱스 읽기 실패, 재생성: {path}, {e}")
+                return self.rebuild(library_path)
+
+            self._cache[library_path] = {'mtime': mtime, 'data': data}
+            return data
+
+    def generation(self, library_path: str) -> Optional[float]:
+        """인덱스 변경 여부 판단용 값 (index.json 수정 시각)"""
+        try:
+            return os.stat(self.index_path(library_path)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _save(self, library_path: str, data: Dict[str, Any]):
+        if not os.path.isdir(library_path):
+            return
+        path = self.index_path(library_path)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._cache[library_path] = {'mtime': os.stat(path).st_mtime, 'data': data}
+
+    def invalidate(self, library_path: str):
+        """인덱스 무효화 (다음 조회 시 재생성)"""
+        asset_server.invalidate_prefix(library_path)
+        library_scanner.invalidate(library_path)
+        with self._library_lock(library_path):
+            self._cache.pop(library_path, None)
+            path = self.index_path(library_path)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # 증분 갱신
+    @staticmethod
+    def _invalidate_image_assets(library_path: str, filename: str):
+        """이미지 원본/썸네일/변형 파일의 에셋 캐시 제거"""
+        stem = os.path.splitext(filename)[0]
+        for path in (os.path.join('images', filename),
+                     os.path.join('thumbnails', f"{stem}.webp"),
+                     os.path.join('variants', f"{filename}.webp"),
+                     os.path.join('variants', f"{filename}.avif")):
+            asset_server.invalidate_prefix(os.path.join(library_path, path))
+        library_scanner.invalidate(library_path)
+
+    @staticmethod
+    def _invalidate_sequence_assets(library_path: str, sequence_name: str):
+        """시퀀스 폴더와 시퀀스 썸네일의 에셋 캐시 제거"""
+        asset_server.invalidate_prefix(os.path.join(library_path, 'sequences', sequence_name))
+        asset_server.invalidate_prefix(os.path.join(library_path, 'sequence_thumbnails', f"{sequence_name}.webp"))
+        library_scanner.invalidate(library_path)
+
+    def upsert_image(self, library_path: str, filename: str):
+        self._invalidate_image_assets(library_path, filename)
+        with self._library_lock(library_path):
+            data = self.load(library_path)
+            entry = self.build_image_entry(library_path, filename)
+            if entry:
+                data['images'][filename] = entry
+            else:
+                data['images'].pop(filename, None)
+            self._save(library_path, data)
+        if entry:
+            self.schedule_metadata(library_path, filename)
+
+    def remove_image(self, library_path: str, filename: str):
+        self._invalidate_image_assets(library_path, filename)
+        with self._library_lock(library_path):
+            data = self.load(library_path)
+            if data['images'].pop(filename, None) is not None:
+                self._save(library_path, data)
+
+    def upsert_sequence(self, library_path: str, sequence_name: str):
+        self._invalidate_sequence_assets(library_path, sequence_name)
+        with self._library_lock(library_path):
+            data = self.load(library_path)
+            entry = self.build_sequence_entry(library_path, sequence_name)
+            if entry:
+                data['sequences'][sequence_name] = entry
+            else:
+                data['sequences'].pop(sequence_name, None)
+            self._save(library_path, data)
+
+    def remove_sequence(self, library_path: str, sequence_name: str):
+        self._invalidate_sequence_assets(library_path, sequence_name)
+        with self._library_lock(library_path):
+            data = self.load(library_path)
+            if data['sequences'].pop(sequence_name, None) is not None:
+                self._save(library_path, data)
+
+    # 백그라운드 메타데이터 추출 / 해시 버전 계산
+    def _start_worker(self):
+        if self._metadata_thread is None or not self._metadata_thread.is_alive():
+            self._metadata_thread = threading.Thread(target=self._metadata_loop, daemon=True)
+            self._metadata_thread.start()
+
+    def schedule_metadata(self, library_path: str, filename: str):
+        """이미지 메타데이터 추출 작업 등록 (워커 스레드는 처음 사용할 때 시작)"""
+        self._start_worker()
+        self._metadata_queue.put(('images', library_path, filename))
+
+    def schedule_sequence_versions(self, library_path: str, sequence_name: str):
+        """시퀀스 파일들의 해시 버전 계산 작업 등록"""
+        self._start_worker()
+        self._metadata_queue.put(('sequences', library_path, sequence_name))
+
+    def _metadata_loop(self):
+        while True:
+            batch = [self._metadata_queue.get()]
+            while len(batch) < METADATA_BATCH_SIZE:
+                try:
+                    batch.append(self._metadata_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._process_metadata_batch(batch)
+            except Exception as e:
+                print(f"❌ 메타데이터 추출 오류: {e}")
+            finally:
+                for _ in batch:
+                    self._metadata_queue.task_done()
+
+    def _image_updates(self, library_path: str, filename: str) -> Tuple[float, Dict[str, Any]]:
+        """이미지 항목에 반영할 메타데이터와 해시 버전"""
+        file_path = os.path.join(library_path, 'images', filename)
+        mtime = os.stat(file_path).st_mtime
+        updates = {'version': asset_server.asset_version(file_path)}
+        try:
+            updates.update(extract_image_metadata(file_path))
+            updates['metadata_pending'] = False
+        except Exception as e:
+            # 메타데이터를 읽지 못해도 해시 버전은 반영
+            print(f"⚠️ 메타데이터 추출 실패: {file_path}, {e}")
+        thumb_path = os.path.join(library_path, 'thumbnails', f"{os.path.splitext(filename)[0]}.webp")
+        if os.path.exists(thumb_path):
+            updates['thumbnail_version'] = asset_server.asset_version(thumb_path)
+        return mtime, updates
+
+    def _sequence_updates(self, library_path: str, sequence_name: str) -> Tuple[float, Dict[str, Any]]:
+        """시퀀스 항목에 반영할 해시 버전 (항목 mtime은 그대로 두고 비교에만 사용)"""
+        entry = self.build_sequence_entry(library_path, sequence_name)
+        if entry is None:
+            raise OSError(f"시퀀스 폴더 없음: {sequence_name}")
+        return entry['mtime'], {'versions': entry['versions'], 'thumbnail_version': entry['thumbnail_version']}
+
+    def _process_metadata_batch(self, batch: List[Tuple[str, str, str]]):
+        # 파일 읽기/해시는 잠금 밖에서 수행하고 인덱스 반영만 잠금 안에서 처리
+        results: Dict[str, List[Tuple[str, str, float, Dict[str, Any]]]] = {}
+        for kind, library_path, name in set(batch):
+            try:
+                if kind == 'images':
+                    mtime, updates = self._image_updates(library_path, name)
+                else:
+                    mtime, updates = self._sequence_updates(library_path, name)
+            except Exception as e:
+                print(f"⚠️ 메타데이터 추출 실패: {os.path.join(library_path, kind, name)}, {e}")
+                continue
+            results.setdefault(library_path, []).append((kind, name, mtime, updates))
+
+        # 라이브러리별로 한 번만 인덱스 저장
+        for library_path, items in results.items():
+            with self._library_lock(library_path):
+                data = self.load(library_path)
+                changed = False
+                for kind, name, mtime, updates in items:
+                    entry = data[kind].get(name)
+                    # 추출 도중 파일이 교체되었으면 새 작업에 맡김
+                    if not entry or entry['mtime'] != mtime:
+                        continue
+                    entry.update(updates)
+                    changed = True
+                if changed:
+                    self._save(library_path, data)
+
+    # 목록 조회
+    @staticmethod
+    def _page(entries: List[Dict[str, Any]], query: Optional[str], offset: int, limit: Optional[int]) -> Tuple[List[Dict[str, Any]], int]:
+        if query:
+            query = query.lower()
+            entries = [e for e in entries if query in e['name'].lower()]
+        total = len(entries)
+        end = offset + limit if limit is not None else None
+        return entries[offset:end], total
+
+    def list_images(self, library_path: str, query: str = None, offset: int = 0, limit: int = None):
+        """이미지 목록 (이름순, 검색/페이지네이션)"""
+        data = self.load(library_path)
+        entries = sorted(data['images'].values(), key=lambda e: e['name'])
+        return self._page(entries, query, offset, limit)
+
+    def list_sequences(self, library_path: str, query: str = None, offset: int = 0, limit: int = None):
+        """시퀀스 목록 (이름순, 검색/페이지네이션)"""
+        data = self.load(library_path)
+        entries = sorted(data['sequences'].values(), key=lambda e: e['name'])
+        return self._page(entries, query, offset, limit)
+
+
+# 전역 라이브러리 인덱스 인스턴스
+library_index = LibraryIndex()
@@ -0,0 +1,145 @@
+"""
+프로젝트 라이브러리 스캐너
+- projects/<user>/<project>/library/ 아래 모든 파일의 크기와 mtime 을 os.scandir 한 번의 순회로 수집
+- 백업, /api/admin/libraries/info, 관리자 통계가 같은 스캔 결과를 사용 (폴더별 os.path.getsize 반복 없음)
+- 폴더 단위 캐시: 폴더 mtime 이 그대로면 다시 읽지 않음 (폴더마다 stat 한 번)
+- 파일을 제자리에서 덮어쓰면 폴더 mtime 이 바뀌지 않으므로 라이브러리 갱신 시 invalidate() 호출
+  (백업처럼 정확해야 하는 경우 use_cache=False)
+"""
+
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+PROJECTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'projects')
+
+# (이름, 폴더 여부, 크기, mtime_ns)
+ScanEntry = Tuple[str, bool, int, int]
+
+
+class LibraryScanner:
+    def __init__(self, projects_dir: str):
+        self.projects_dir = projects_dir
+        # 폴더별 캐시 {정규화된 경로: (폴더 mtime_ns, [ScanEntry, ...])}
+        self._dirs: Dict[str, Tuple[int, List[ScanEntry]]] = {}
+        self._lock = threading.Lock()
+        self._stats = {'scans': 0, 'dirs_read': 0, 'dirs_cached': 0}
+
+    def _read_dir(self, path: str, use_cache: bool) -> List[ScanEntry]:
+        key = os.path.normpath(path)
+        try:
+            dir_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+        if use_cache:
+            cached = self._dirs.get(key)
+            if cached is not None and cached[0] == dir_mtime:
+                self._stats['dirs_cached'] += 1
+                return cached[1]
+
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            entries.append((entry.name, True, 0, 0))
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            entries.append((entry.name, False, stat.st_size, stat.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        entries.sort()
+        self._stats['dirs_read'] += 1
+        with self._lock:
+            self._dirs[key] = (dir_mtime, entries)
+        return entries
+
+    def _walk_files(self, path: str, prefix: str, use_cache: bool) -> Iterator[Tuple[str, int, int]]:
+        """(폴더 기준 상대 경로, 크기, mtime_ns)"""
+        for name, is_dir, size, mtime_ns in self._read_dir(path, use_cache):
+            relative_path = f'{prefix}{name}'
+            if is_dir:
+                yield from self._walk_files(os.path.join(path, name), relative_path + '/', use_cache)
+            else:
+                yield relative_path, size, mtime_ns
+
+    def scan(self, use_cache: bool = True) -> Dict[str, Any]:
+        """전체 라이브러리 스캔
+
+        반환값: {
+            'projects': {'user_1/proj': {'user_dir', 'project_dir', 'library_path', 'has_library',
+                                         'files': [{'path': 'images/a.png', 'size', 'mtime_ns'}], 'size'}},
+            'total_files', 'total_size', 'scanned_at'
+        }
+        """
+        self._stats['scans'] += 1
+        projects = {}
+        total_files = 0
+        total_size = 0
+        for user_dir, user_is_dir, _, _ in self._read_dir(self.projects_dir, use_cache):
+            if not user_is_dir:
+                continue
+            user_path = os.path.join(self.projects_dir, user_dir)
+            for project_dir, project_is_dir, _, _ in self._read_dir(user_path, use_cache):
+                if not project_is_dir:
+                    continue
+                project_path = os.path.join(user_path, project_dir)
+                library_path = os.path.join(project_path, 'library')
+                has_library = any(name == 'library' and is_dir for name, is_dir, _, _ in self._read_dir(project_path, use_cache))
+                files = []
+                if has_library:
+                    files = [{'path': path, 'size': size, 'mtime_ns': mtime_ns}
+                             for path, size, mtime_ns in self._walk_files(library_path, '', use_cache)]
+                project_size = sum(f['size'] for f in files)
+                projects[f'{user_dir}/{project_dir}'] = {
+                    'user_dir': user_dir,
+                    'project_dir': project_dir,
+                    'library_path': library_path,
+                    'has_library': has_library,
+                    'files': files,
+                    'size': project_size
+                }
+                total_files += len(files)
+                total_size += project_size
+        return {
+            'projects': projects,
+            'total_files': total_files,
+            'total_size': total_size,
+            'scanned_at': datetime.utcnow().isoformat()
+        }
+
+    def iter_files(self, scan: Optional[Dict[str, Any]] = None, use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+        """백업용 파일 목록 (arcname = projects/<user>/<project>/library/<path>)"""
+        scan = scan or self.scan(use_cache)
+        for project_key, project in scan['projects'].items():
+            for file in project['files']:
+                yield {
+                    'project_key': project_key,
+                    'arcname': f"projects/{project_key}/library/{file['path']}",
+                    'file_path': os.path.join(project['library_path'], *file['path'].split('/')),
+                    'size': file['size'],
+                    'mtime_ns': file['mtime_ns']
+                }
+
+    def invalidate(self, path: Optional[str] = None):
+        """캐시 무효화 (path 가 파일이면 그 파일이 있는 폴더, 폴더면 하위 전체)"""
+        with self._lock:
+            if path is None:
+                self._dirs.clear()
+                return
+            key = os.path.normpath(path)
+            parent = os.path.dirname(key)
+            for cached in list(self._dirs):
+                if cached == key or cached == parent or cached.startswith(key + os.sep):
+                    del self._dirs[cached]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, 'cached_dirs': len(self._dirs)}
+
+
+# 전역 라이브러리 스캐너 인스턴스
+library_scanner = LibraryScanner(PROJECTS_DIR)
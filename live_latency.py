@@ -0,0 +1,187 @@
+"""
+라이브 송출 지연 추적 (운영자 조작 -> 오버레이 화면 반영)
+- 라이브 제어 API 요청마다 trace id 를 만들고, 그 요청에서 보내는 라이브 이벤트 payload 에 trace_id 를 붙임
+- 오버레이는 이벤트를 화면에 반영한 뒤(다음 페인트 이후) live_ack 로 trace_id 와 렌더 시간(수신 -> 페인트)을 돌려보냄
+- 서버와 오버레이의 시계가 달라도 되도록 서버 쪽 시간(perf_counter)만으로 계산
+  · server: 요청 시작 -> 마지막 emit 완료
+  · delivery: 오버레이 룸으로 emit -> 오버레이 수신 (왕복 시간에서 렌더 시간을 빼고 반으로 나눈 추정값)
+  · render: 오버레이 수신 -> 페인트 (오버레이 보고값)
+  · end_to_end: 요청 시작 -> 페인트 (ack 도착 시각에서 돌아오는 구간 추정값을 뺌)
+- 채널(오버레이가 참여한 룸)별로 최근 LIVE_LATENCY_HISTORY 개 샘플을 보관하고 p50/p95/p99 계산
+- ack 를 기다리는 trace 는 LIVE_TRACE_TTL 초 후 버림
+"""
+
+import os
+import re
+import math
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+LIVE_TRACE_TTL = float(os.environ.get('LIVE_TRACE_TTL', 30))  # ack 를 기다리는 시간 (초)
+LIVE_TRACE_MAX_PENDING = int(os.environ.get('LIVE_TRACE_MAX_PENDING', 5000))  # ack 대기 trace 최대 개수
+LIVE_LATENCY_HISTORY = int(os.environ.get('LIVE_LATENCY_HISTORY', 1000))  # 채널별 보관 샘플 수
+
+# 클라이언트가 X-Trace-Id 헤더로 지정하는 trace id
+TRACE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_.:-]{1,64}$')
+
+LATENCY_FIELDS = ('end_to_end', 'server', 'delivery', 'render')
+PERCENTILES = (50, 95, 99)
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """nearest-rank 백분위수 (정렬된 값)"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(p * len(sorted_values) / 100), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LiveTrace:
+    """라이브 제어 요청 하나"""
+
+    __slots__ = ('trace_id', 'source', 'started', 'room_emits', 'first_emit', 'last_emit_done', 'acked')
+
+    def __init__(self, trace_id: str, source: str, started: float):
+        self.trace_id = trace_id
+        self.source = source
+        self.started = started
+        self.room_emits: Dict[str, float] = {}  # 룸 -> 처음 emit 시작 시각
+        self.first_emit: Optional[float] = None
+        self.last_emit_done: Optional[float] = None
+        self.acked = set()  # ack 를 보낸 오버레이 sid (여러 룸으로 받은 같은 이벤트는 한 번만 집계)
+
+
+class ChannelLatency:
+    __slots__ = ('samples', 'last_ack') + LATENCY_FIELDS
+
+    def __init__(self, history: int):
+        self.samples = 0
+        self.last_ack: Optional[float] = None
+        for field in LATENCY_FIELDS:
+            setattr(self, field, deque(maxlen=history))
+
+
+class LiveLatencyTracker:
+    def __init__(self, ttl: float = LIVE_TRACE_TTL, max_pending: int = LIVE_TRACE_MAX_PENDING,
+                 history: int = LIVE_LATENCY_HISTORY):
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self.history = history
+        self._pending: 'OrderedDict[str, LiveTrace]' = OrderedDict()
+        self._overlay_rooms: Dict[str, str] = {}  # 오버레이 sid -> 참여한 룸 (채널)
+        self._channels: Dict[str, ChannelLatency] = {}
+        self.traces = 0
+        self.acks = 0
+        self.unmatched_acks = 0
+
+    # 오버레이 연결 (핸들러에서 호출)
+    def overlay_joined(self, sid: str, room: str):
+        self._overlay_rooms[sid] = room
+
+    def overlay_left(self, sid: str):
+        self._overlay_rooms.pop(sid, None)
+
+    def is_overlay(self, sid: str) -> bool:
+        """오버레이 룸에 참여한 소켓인지 (live_ack 는 오버레이에서만 받음)"""
+        return sid in self._overlay_rooms
+
+    # 서버 쪽 기록
+    def start(self, source: str, trace_id: Optional[str] = None, started: Optional[float] = None) -> LiveTrace:
+        """라이브 제어 요청 시작 (trace_id 가 형식에 맞지 않으면 새로 만듦)"""
+        now = time.perf_counter()
+        self._prune(now)
+        if not trace_id or not TRACE_ID_PATTERN.match(trace_id) or trace_id in self._pending:
+            trace_id = new_trace_id()
+        trace = LiveTrace(trace_id, source, started if started is not None else now)
+        self._pending[trace_id] = trace
+        self.traces += 1
+        return trace
+
+    def emitted(self, trace: LiveTrace, room: Optional[str], started: float, finished: float):
+        """trace 의 라이브 이벤트 emit 하나 기록 (room=None 은 전체 전송)"""
+        if trace.first_emit is None:
+            trace.first_emit = started
+        trace.room_emits.setdefault(room, started)
+        trace.last_emit_done = finished
+
+    def _prune(self, now: float):
+        while self._pending:
+            trace = next(iter(self._pending.values()))
+            if now - trace.started < self.ttl and len(self._pending) < self.max_pending:
+                break
+            self._pending.popitem(last=False)
+
+    # 오버레이 ack
+    def ack(self, sid: str, trace_id: Any, render_ms: Any) -> Optional[Dict[str, float]]:
+        """오버레이가 trace 이벤트를 화면에 반영했음 -> 지연 샘플 (ms) 반환, 알 수 없는/중복 ack 면 None"""
+        now = time.perf_counter()
+        trace = self._pending.get(trace_id) if isinstance(trace_id, str) else None
+        if trace is None or trace.first_emit is None:
+            self.unmatched_acks += 1
+            return None
+        if sid in trace.acked:
+            return None
+        trace.acked.add(sid)
+
+        room = self._overlay_rooms.get(sid)
+        emitted = trace.room_emits.get(room, trace.room_emits.get(None, trace.first_emit))
+        round_trip = max(now - emitted, 0.0)
+        try:
+            render = min(max(float(render_ms) / 1000, 0.0), round_trip)
+        except (TypeError, ValueError):
+            render = 0.0
+        delivery = (round_trip - render) / 2
+        sample = {
+            'end_to_end': (now - trace.started - delivery) * 1000,
+            'server': (trace.last_emit_done - trace.started) * 1000,
+            'delivery': delivery * 1000,
+            'render': render * 1000
+        }
+
+        channel = self._channels.get(room or 'unknown')
+        if channel is None:
+            channel = self._channels[room or 'unknown'] = ChannelLatency(self.history)
+        for field in LATENCY_FIELDS:
+            getattr(channel, field).append(sample[field])
+        channel.samples += 1
+        channel.last_ack = time.time()
+        self.acks += 1
+        return sample
+
+    def reset(self):
+        self._channels.clear()
+        self.acks = 0
+        self.unmatched_acks = 0
+
+    # 조회
+    def channel_stats(self) -> Dict[str, Dict[str, Any]]:
+        channels = {}
+        for name, channel in sorted(self._channels.items()):
+            stats = {'samples': channel.samples, 'window': len(channel.end_to_end), 'last_ack': channel.last_ack}
+            for field in LATENCY_FIELDS:
+                values = sorted(getattr(channel, field))
+                stats[f'{field}_ms'] = {f'p{p}': round(percentile(values, p), 2) for p in PERCENTILES}
+            channels[name] = stats
+        return channels
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'traces': self.traces,
+            'pending': len(self._pending),
+            'acks': self.acks,
+            'unmatched_acks': self.unmatched_acks,
+            'overlays': len(self._overlay_rooms),
+            'ttl': self.ttl,
+            'history': self.history,
+            'channels': self.channel_stats()
+        }
+
+
+# 전역 라이브 지연 추적 인스턴스
+live_latency = LiveLatencyTracker()
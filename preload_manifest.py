@@ -0,0 +1,235 @@
+"""
+오버레이 프리로드 매니페스트
+- 프로젝트의 씬/오브젝트가 참조하는 에셋 URL 목록 (크기, 콘텐츠 해시, 우선순위 포함)
+- 씬+오브젝트를 한 번의 쿼리로 읽어 생성하고, 프로젝트 버전별로 캐시
+- 프로젝트 버전은 씬/오브젝트 변경 시(SQLAlchemy flush 이벤트) 증가
+- 라이브러리 인덱스가 바뀌면(업로드/삭제) 크기와 해시가 달라지므로 캐시 키에 함께 포함
+"""
+
+import json
+import re
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+# /projects/<project>/library/<kind>/<path> 또는 /users/<user>/projects/<project>/library/<kind>/<path>
+LIBRARY_URL_PATTERN = re.compile(
+    r'^(?:/users/(?P<username>[^/]+))?/projects/(?P<project>[^/]+)/library/(?P<kind>images|sequences)/(?P<path>.+)$'
+)
+
+# 오브젝트 타입별로 에셋 URL을 담는 속성
+ASSET_PROPERTIES = {
+    'image': ('src',),
+    'sequence': ('spriteUrl', 'packUrl', 'metaUrl'),
+}
+
+
+def parse_asset_url(url: str) -> Optional[Dict[str, Any]]:
+    """라이브러리 에셋 URL 해석 (라이브러리 에셋이 아니면 None)
+
+    반환값: {'kind': 'image'|'sequence', 'project': ..., 'username': ..., 'name': ..., 'file': ...}
+        image   : name = 파일명
+        sequence: name = 시퀀스 이름, file = 시퀀스 폴더 안의 파일명
+    """
+    if not url or not isinstance(url, str):
+        return None
+    match = LIBRARY_URL_PATTERN.match(urlparse(url).path)
+    if not match:
+        return None
+
+    path = unquote(match.group('path'))
+    ref = {
+        'kind': 'image' if match.group('kind') == 'images' else 'sequence',
+        'project': unquote(match.group('project')),
+        'username': unquote(match.group('username')) if match.group('username') else None,
+    }
+    if ref['kind'] == 'image':
+        ref['name'] = path
+        ref['file'] = path
+    else:
+        ref['name'], _, ref['file'] = path.partition('/')
+    return ref
+
+
+def extract_object_assets(obj_type: str, properties: Dict[str, Any]) -> List[str]:
+    """오브젝트 속성에서 에셋 URL 추출"""
+    urls = []
+    for key in ASSET_PROPERTIES.get(obj_type, ()):
+        value = properties.get(key)
+        if isinstance(value, str) and value and value not in urls:
+            urls.append(value)
+    return urls
+
+
+def versioned_url(url: str, version: Optional[str]) -> str:
+    """immutable 캐시용 ?v=<해시> 추가"""
+    if not version:
+        return url
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}v={version}"
+
+
+def describe_asset(url: str, ref: Optional[Dict[str, Any]], library: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """라이브러리 인덱스 기준 에셋 정보 (크기, 해시, 오버레이가 실제로 요청할 URL)"""
+    asset = {'url': url, 'kind': 'external', 'size': None, 'hash': None, 'exists': None}
+    if not ref:
+        return asset
+
+    asset['kind'] = ref['kind']
+    asset['name'] = ref['name']
+    if library is None:
+        return asset
+
+    if ref['kind'] == 'image':
+        entry = library['images'].get(ref['name'])
+        asset['exists'] = entry is not None
+        if entry:
+            asset['size'] = entry.get('size')
+            asset['hash'] = entry.get('version')
+        return asset
+
+    entry = library['sequences'].get(ref['name'])
+    asset['exists'] = entry is not None
+    if not entry:
+        return asset
+
+    versions = entry.get('versions') or {}
+    pack = entry.get('pack')
+    if ref['file'] == 'sprite.png' and pack:
+        # 오버레이는 sprite.png 대신 sequence.pack 을 먼저 로드
+        asset['kind'] = 'sequence_pack'
+        asset['url'] = re.sub(r'sprite\.png(\?.*)?$', r'sequence.pack\1', url)
+        asset['fallback_url'] = url
+        asset['size'] = pack.get('size')
+        asset['hash'] = versions.get('sequence.pack')
+    else:
+        asset['hash'] = versions.get(ref['file'])
+        if ref['file'] == 'sprite.png':
+            asset['size'] = entry.get('size')
+    return asset
+
+
+class PreloadManifestCache:
+    def __init__(self):
+        # 프로젝트 버전 {project_id: int}, 씬 -> 프로젝트 {scene_id: project_id}
+        self._versions: Dict[int, int] = {}
+        self._scene_projects: Dict[int, int] = {}
+        # 캐시 {project_id: (version, {library_path: generation}, manifest)}
+        self._manifests: Dict[int, Tuple[int, Dict[str, Any], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    # 버전 관리
+    def version(self, project_id: int) -> int:
+        return self._versions.get(project_id, 0)
+
+    def bump_project(self, project_id: int):
+        with self._lock:
+            self._versions[project_id] = self._versions.get(project_id, 0) + 1
+            self._manifests.pop(project_id, None)
+
+    def bump_scene(self, scene_id: int):
+        """씬의 프로젝트 버전 증가 (매니페스트를 만든 적 없는 씬이면 캐시된 것도 없으므로 무시)"""
+        project_id = self._scene_projects.get(scene_id)
+        if project_id is not None:
+            self.bump_project(project_id)
+
+    def clear(self):
+        """전체 캐시 초기화 (데이터베이스 복원 등)"""
+        with self._lock:
+            self._manifests.clear()
+            self._scene_projects.clear()
+            for project_id in self._versions:
+                self._versions[project_id] += 1
+
+    # 캐시
+    def get(self, project_id: int, generation: Callable[[str], Any]) -> Optional[Dict[str, Any]]:
+        """캐시된 매니페스트 (프로젝트 버전과 참조한 라이브러리 인덱스가 모두 그대로일 때만)"""
+        cached = self._manifests.get(project_id)
+        if not cached or cached[0] != self.version(project_id):
+            return None
+        for library_path, library_generation in cached[1].items():
+            if generation(library_path) != library_generation:
+                return None
+        return cached[2]
+
+    def put(self, project_id: int, version: int, generations: Dict[str, Any], manifest: Dict[str, Any]):
+        with self._lock:
+            # 생성 중에 변경된 경우 저장하지 않음
+            if version != self._versions.get(project_id, 0):
+                return
+            for scene in manifest['scenes']:
+                self._scene_projects[scene['id']] = project_id
+            self._manifests[project_id] = (version, generations, manifest)
+
+    # 생성
+    @staticmethod
+    def build(project: Dict[str, Any], rows: List[Tuple], load_library: Callable[[str], Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """매니페스트 생성
+
+        project  : {'id', 'name'}
+        rows     : (scene_id, scene_name, scene_order, object_id, object_type, object_properties) 목록
+                   (씬 순서대로 정렬, 오브젝트가 없는 씬은 object_id가 None)
+        load_library: URL의 프로젝트 이름 -> 라이브러리 인덱스 데이터
+        """
+        libraries: Dict[str, Optional[Dict[str, Any]]] = {}
+        scenes: List[Dict[str, Any]] = []
+        scene_by_id: Dict[int, Dict[str, Any]] = {}
+        assets: Dict[str, Dict[str, Any]] = {}
+
+        for scene_id, scene_name, scene_order, object_id, object_type, object_properties in rows:
+            scene = scene_by_id.get(scene_id)
+            if scene is None:
+                scene = {'id': scene_id, 'name': scene_name, 'order': scene_order, 'assets': [], 'objects': []}
+                scene_by_id[scene_id] = scene
+                scenes.append(scene)
+            if object_id is None:
+                continue
+
+            try:
+                properties = json.loads(object_properties) if object_properties else {}
+            except ValueError:
+                properties = {}
+            scene['objects'].append({'id': object_id, 'type': object_type, 'properties': properties})
+
+            for url in extract_object_assets(object_type, properties):
+                asset = assets.get(url)
+                if asset is None:
+                    ref = parse_asset_url(url)
+                    library = None
+                    if ref:
+                        if ref['project'] not in libraries:
+                            libraries[ref['project']] = load_library(ref['project'])
+                        library = libraries[ref['project']]
+                    asset = describe_asset(url, ref, library)
+                    asset['versioned_url'] = versioned_url(asset['url'], asset['hash'])
+                    # 우선순위: 처음 등장하는 씬의 순번 (0이 가장 먼저 필요한 에셋)
+                    asset['priority'] = len(scenes) - 1
+                    asset['scenes'] = []
+                    asset['objects'] = []
+                    assets[url] = asset
+                if scene_id not in asset['scenes']:
+                    asset['scenes'].append(scene_id)
+                asset['objects'].append(object_id)
+                if asset['url'] not in scene['assets']:
+                    scene['assets'].append(asset['url'])
+
+        asset_list = sorted(assets.values(), key=lambda a: (a['priority'], a['kind'] != 'image', a['url']))
+        # 에셋 해시와 씬/오브젝트 데이터가 같으면 같은 버전 (ETag)
+        digest = hashlib.sha256(json.dumps(
+            [[(a['url'], a['hash']) for a in asset_list], scenes], sort_keys=True, default=str
+        ).encode('utf-8')).hexdigest()[:16]
+
+        return {
+            'project': project,
+            'version': digest,
+            'assets': asset_list,
+            'total_size': sum(a['size'] or 0 for a in asset_list),
+            'scenes': scenes,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
+
+# 전역 프리로드 매니페스트 캐시 인스턴스
+preload_manifests = PreloadManifestCache()
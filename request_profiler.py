@@ -0,0 +1,119 @@
+"""
+요청별 SQL 프로파일러 (기본 꺼짐, REQUEST_PROFILING=true 로 사용)
+- 요청마다 SQL 문장 수와 DB 시간 합계를 세어 Server-Timing 헤더로 응답에 붙임 (브라우저 개발자 도구 Timing 탭에 표시)
+- 느린 쿼리(SLOW_QUERY_MS 이상)는 호출한 앱 코드 위치(스택)와 함께 기록
+- 느리거나(SLOW_REQUEST_MS 이상) 쿼리가 많은(PROFILE_MAX_QUERIES 초과) 요청은 가장 많이 반복된 문장과 함께 기록 (N+1 확인용)
+- 스트리밍 응답의 본문 생성 중 실행되는 쿼리는 응답 헤더를 보낸 뒤이므로 포함되지 않음
+- 기록 문구만 만들고 실제 로그 출력은 호출하는 쪽(app.logger)에서 함
+"""
+
+import os
+import sys
+from collections import Counter
+from typing import Any, Dict, Optional
+
+REQUEST_PROFILING = os.environ.get('REQUEST_PROFILING', 'false').lower() == 'true'
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', 500))  # 이 시간 이상 걸린 요청 기록
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))  # 이 시간 이상 걸린 쿼리 기록
+PROFILE_MAX_QUERIES = int(os.environ.get('PROFILE_MAX_QUERIES', 30))  # 요청 하나의 쿼리 수가 이보다 많으면 기록
+PROFILE_STACK_DEPTH = 3  # 느린 쿼리 기록에 남길 앱 코드 프레임 수
+
+# 앱 코드 판별 (이 폴더 안의 파일, 가상환경/설치 패키지 제외)
+APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+LIBRARY_MARKERS = ('site-packages', 'dist-packages', f'{os.sep}.venv{os.sep}', f'{os.sep}venv{os.sep}')
+
+
+def is_app_frame(filename: str) -> bool:
+    return (filename.startswith(APP_ROOT) and filename != __file__
+            and not any(marker in filename for marker in LIBRARY_MARKERS))
+
+
+def query_origin(skip: int = 2, depth: int = PROFILE_STACK_DEPTH) -> str:
+    """쿼리를 실행한 앱 코드 위치 ('app.py:123 project_to_dict <- app.py:456 get_project')
+
+    skip: 건너뛸 안쪽 프레임 수 (이 함수를 부른 프로파일러/리스너)
+    """
+    frame = sys._getframe(skip)
+    origins = []
+    while frame is not None and len(origins) < depth:
+        code = frame.f_code
+        if is_app_frame(code.co_filename):
+            origins.append(f'{os.path.relpath(code.co_filename, APP_ROOT)}:{frame.f_lineno} {code.co_name}')
+        frame = frame.f_back
+    return ' <- '.join(origins) if origins else '<unknown>'
+
+
+def shorten_sql(statement: str, limit: int = 200) -> str:
+    text = ' '.join(statement.split())
+    return text if len(text) <= limit else text[:limit] + '...'
+
+
+class RequestProfile:
+    """요청 하나의 SQL 집계"""
+
+    __slots__ = ('queries', 'db_seconds', 'statements')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements = Counter()
+
+
+class RequestProfiler:
+    def __init__(self, enabled: bool = REQUEST_PROFILING, slow_request_ms: float = SLOW_REQUEST_MS,
+                 slow_query_ms: float = SLOW_QUERY_MS, max_queries: int = PROFILE_MAX_QUERIES):
+        self.enabled = enabled
+        self.slow_request_seconds = slow_request_ms / 1000
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.max_queries = max_queries
+        self.slow_requests = 0
+        self.slow_queries = 0
+
+    def start(self) -> RequestProfile:
+        return RequestProfile()
+
+    def record_query(self, profile: Optional[RequestProfile], statement: str, seconds: float) -> Optional[str]:
+        """쿼리 하나 기록 (요청 밖의 쿼리는 profile=None), 느린 쿼리면 로그 문구 반환
+
+        SQLAlchemy after_cursor_execute 리스너에서 바로 호출해야 스택 위치가 맞음
+        """
+        if profile is not None:
+            profile.queries += 1
+            profile.db_seconds += seconds
+            profile.statements[statement] += 1
+        if seconds < self.slow_query_seconds:
+            return None
+        self.slow_queries += 1
+        return f"🐢 느린 쿼리 {seconds * 1000:.1f}ms [{query_origin(skip=3)}] {shorten_sql(statement)}"
+
+    def server_timing(self, profile: RequestProfile, seconds: float) -> str:
+        """Server-Timing 헤더 값 (db: SQL 시간 합계와 문장 수, app: 요청 전체 처리 시간)"""
+        return (f'db;dur={profile.db_seconds * 1000:.2f};desc="{profile.queries} queries", '
+                f'app;dur={seconds * 1000:.2f}')
+
+    def finish_request(self, profile: RequestProfile, method: str, path: str, seconds: float) -> Optional[str]:
+        """느리거나 쿼리가 많은 요청이면 로그 문구 반환"""
+        if seconds < self.slow_request_seconds and profile.queries <= self.max_queries:
+            return None
+        self.slow_requests += 1
+        message = (f"🐢 느린 요청 {method} {path} {seconds * 1000:.1f}ms, "
+                   f"쿼리 {profile.queries}개 {profile.db_seconds * 1000:.1f}ms")
+        if profile.statements:
+            statement, count = profile.statements.most_common(1)[0]
+            if count > 1:
+                message += f", 가장 많이 반복된 쿼리 {count}회: {shorten_sql(statement)}"
+        return message
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'slow_request_ms': self.slow_request_seconds * 1000,
+            'slow_query_ms': self.slow_query_seconds * 1000,
+            'max_queries': self.max_queries,
+            'slow_requests': self.slow_requests,
+            'slow_queries': self.slow_queries
+        }
+
+
+# 전역 요청 프로파일러 인스턴스
+request_profiler = RequestProfiler()
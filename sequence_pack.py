@@ -0,0 +1,251 @@
+"""
+시퀀스 팩 (packed frame atlas + binary index)
+- 업로드 시 sprite.png + meta.json 을 하나의 컨테이너(sequence.pack)로 변환
+- 프레임들을 최대 MAX_ATLAS_SIZE 크기의 아틀라스 텍스처 여러 장에 배치
+- 프레임 인덱스(아틀라스 번호, 위치, 크기, 표시 시간)를 바이너리로 저장
+- 오버레이는 sequence.pack 한 번의 요청으로 전체 시퀀스를 로드
+
+파일 구조 (little-endian):
+    HEADER  : magic 'EOSQ', version, atlas_count, frame_count, frame_width, frame_height, fps
+    ATLAS[] : offset, length, width, height        (atlas_count 개)
+    FRAME[] : atlas, x, y, width, height, duration_ms (frame_count 개)
+    BLOB[]  : 아틀라스 PNG 데이터 (ATLAS 테이블의 offset/length 로 참조)
+"""
+
+import io
+import os
+import json
+import struct
+from typing import Dict, Any, List, Optional, Tuple
+
+from PIL import Image
+
+PACK_FILENAME = 'sequence.pack'
+PACK_MAGIC = b'EOSQ'
+PACK_VERSION = 1
+
+# 브라우저/GPU 텍스처 한계를 고려한 아틀라스 최대 크기
+MAX_ATLAS_SIZE = 4096
+DEFAULT_FPS = 24
+
+HEADER = struct.Struct('<4sHHIHHf')
+ATLAS_ENTRY = struct.Struct('<IIHH')
+FRAME_ENTRY = struct.Struct('<HHHHHH')
+
+
+def _meta_value(meta: Dict[str, Any], *keys, default=None):
+    """snake_case / camelCase 메타 키를 모두 허용"""
+    for key in keys:
+        if meta.get(key) is not None:
+            return meta[key]
+    return default
+
+
+def get_frame_sizes(meta: Dict[str, Any], sprite_size: Tuple[int, int]) -> List[Dict[str, int]]:
+    """메타데이터에서 세로 스프라이트의 프레임 크기 목록 계산"""
+    frame_sizes = _meta_value(meta, 'frame_sizes', 'frameSizes')
+    if frame_sizes:
+        return [{'width': int(f['width']), 'height': int(f['height'])} for f in frame_sizes]
+
+    sprite_width, sprite_height = sprite_size
+    frame_width = int(_meta_value(meta, 'frame_width', 'frameWidth', default=sprite_width))
+    frame_height = int(_meta_value(meta, 'frame_height', 'frameHeight', default=0))
+    frame_count = int(_meta_value(meta, 'frame_count', 'frameCount', default=0))
+
+    if not frame_height and frame_count:
+        frame_height = sprite_height // frame_count
+    if not frame_count and frame_height:
+        frame_count = sprite_height // frame_height
+    if not frame_count or not frame_height:
+        # 프레임 정보가 없으면 스프라이트 전체를 한 프레임으로 취급
+        return [{'width': sprite_width, 'height': sprite_height}]
+
+    return [{'width': frame_width, 'height': frame_height} for _ in range(frame_count)]
+
+
+def get_frame_durations(meta: Dict[str, Any], frame_count: int) -> Tuple[float, List[int]]:
+    """프레임별 표시 시간(ms) 계산"""
+    fps = float(_meta_value(meta, 'fps', default=DEFAULT_FPS) or DEFAULT_FPS)
+    durations = _meta_value(meta, 'frame_durations', 'frameDurations')
+    if durations and len(durations) == frame_count:
+        return fps, [max(1, min(int(d), 0xFFFF)) for d in durations]
+    default_duration = max(1, int(round(1000 / fps)))
+    return fps, [default_duration] * frame_count
+
+
+def layout_frames(frame_sizes: List[Dict[str, int]], max_size: int = MAX_ATLAS_SIZE):
+    """셸프(shelf) 방식으로 프레임을 아틀라스에 배치
+
+    프레임 하나가 max_size 보다 크면 아틀라스 한계(와 uint16 좌표)를 넘으므로 배치 전에 ValueError
+    반환값: (placements, atlas_sizes)
+        placements  : 프레임별 (atlas, x, y)
+        atlas_sizes : 아틀라스별 (width, height)
+    """
+    if not 0 < max_size <= 0xFFFF:
+        raise ValueError(f'Invalid atlas size: {max_size}')
+    for index, size in enumerate(frame_sizes):
+        if not (0 < size['width'] <= max_size and 0 < size['height'] <= max_size):
+            raise ValueError(f"Frame {index} is {size['width']}x{size['height']}px; "
+                             f"sequence pack frames must be 1-{max_size}px on each side")
+
+    placements = []
+    atlas_sizes = []
+    atlas = 0
+    x = y = row_height = used_width = 0
+
+    for size in frame_sizes:
+        w, h = size['width'], size['height']
+
+        # 현재 행에 들어가지 않으면 다음 행으로
+        if x > 0 and x + w > max_size:
+            y += row_height
+            x = row_height = 0
+
+        # 현재 아틀라스에 들어가지 않으면 다음 아틀라스로
+        if y > 0 and y + h > max_size:
+            atlas_sizes.append((used_width, y))
+            atlas += 1
+            x = y = row_height = used_width = 0
+
+        placements.append((atlas, x, y))
+        x += w
+        row_height = max(row_height, h)
+        used_width = max(used_width, x)
+
+    if placements:
+        atlas_sizes.append((used_width, y + row_height))
+
+    return placements, atlas_sizes
+
+
+def build_sequence_pack(sequence_folder: str, sprite_name: str = 'sprite.png', meta_name: str = 'meta.json') -> Optional[Dict[str, Any]]:
+    """sprite.png + meta.json 으로 sequence.pack 생성 후 meta.json 에 팩 정보 기록"""
+    sprite_path = os.path.join(sequence_folder, sprite_name)
+    meta_path = os.path.join(sequence_folder, meta_name)
+    if not os.path.exists(sprite_path):
+        print(f"⚠️ 시퀀스 팩 생성 건너뜀 (스프라이트 없음): {sprite_path}")
+        return None
+
+    meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+    with Image.open(sprite_path) as sprite:
+        # 프레임 크기 검사(layout_frames)를 픽셀 디코딩보다 먼저 수행
+        frame_sizes = get_frame_sizes(meta, sprite.size)
+        fps, durations = get_frame_durations(meta, len(frame_sizes))
+        placements, atlas_sizes = layout_frames(frame_sizes)
+
+        if sprite.mode != 'RGBA':
+            sprite = sprite.convert('RGBA')
+
+        # 세로 스프라이트에서 프레임을 잘라 아틀라스에 배치
+        atlases = [Image.new('RGBA', size, (0, 0, 0, 0)) for size in atlas_sizes]
+        src_y = 0
+        for size, (atlas, x, y) in zip(frame_sizes, placements):
+            frame = sprite.crop((0, src_y, size['width'], src_y + size['height']))
+            atlases[atlas].paste(frame, (x, y))
+            src_y += size['height']
+
+    blobs = []
+    for atlas_image in atlases:
+        buffer = io.BytesIO()
+        atlas_image.save(buffer, 'PNG')
+        blobs.append(buffer.getvalue())
+
+    frame_width = max(s['width'] for s in frame_sizes)
+    frame_height = max(s['height'] for s in frame_sizes)
+    header = HEADER.pack(PACK_MAGIC, PACK_VERSION, len(blobs), len(frame_sizes), frame_width, frame_height, fps)
+
+    frames = b''.join(
+        FRAME_ENTRY.pack(atlas, x, y, size['width'], size['height'], duration)
+        for size, (atlas, x, y), duration in zip(frame_sizes, placements, durations)
+    )
+
+    offset = HEADER.size + ATLAS_ENTRY.size * len(blobs) + len(frames)
+    atlas_table = []
+    for blob, (width, height) in zip(blobs, atlas_sizes):
+        atlas_table.append(ATLAS_ENTRY.pack(offset, len(blob), width, height))
+        offset += len(blob)
+
+    pack_path = os.path.join(sequence_folder, PACK_FILENAME)
+    tmp_path = pack_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(b''.join(atlas_table))
+        f.write(frames)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, pack_path)
+
+    pack_info = {
+        'file': PACK_FILENAME,
+        'version': PACK_VERSION,
+        'size': offset,
+        'atlas_count': len(blobs),
+        'frame_count': len(frame_sizes),
+        'frame_width': frame_width,
+        'frame_height': frame_height,
+        'fps': fps
+    }
+    meta['pack'] = pack_info
+    meta.setdefault('frame_count', len(frame_sizes))
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ 시퀀스 팩 생성 완료: {pack_path} ({len(frame_sizes)} 프레임, {len(blobs)} 아틀라스, {offset} bytes)")
+    return pack_info
+
+
+def read_pack_index(pack_path: str) -> Dict[str, Any]:
+    """sequence.pack 의 헤더와 인덱스만 읽기 (아틀라스 데이터는 읽지 않음)"""
+    with open(pack_path, 'rb') as f:
+        magic, version, atlas_count, frame_count, frame_width, frame_height, fps = HEADER.unpack(f.read(HEADER.size))
+        if magic != PACK_MAGIC:
+            raise ValueError(f'Invalid sequence pack: {pack_path}')
+
+        atlases = [
+            dict(zip(('offset', 'length', 'width', 'height'), ATLAS_ENTRY.unpack(f.read(ATLAS_ENTRY.size))))
+            for _ in range(atlas_count)
+        ]
+        frames = [
+            dict(zip(('atlas', 'x', 'y', 'width', 'height', 'duration'), FRAME_ENTRY.unpack(f.read(FRAME_ENTRY.size))))
+            for _ in range(frame_count)
+        ]
+
+    return {
+        'version': version,
+        'frame_width': frame_width,
+        'frame_height': frame_height,
+        'fps': fps,
+        'atlases': atlases,
+        'frames': frames
+    }
+
+
+def describe_sequence(sequences_path: str, sequence_name: str) -> Dict[str, Any]:
+    """라이브러리 목록용 시퀀스 정보 (meta.json 한 번만 읽고 프레임 폴더는 스캔하지 않음)"""
+    seq_path = os.path.join(sequences_path, sequence_name)
+    meta_path = os.path.join(seq_path, 'meta.json')
+
+    meta = None
+    if os.path.exists(meta_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 시퀀스 메타 읽기 실패: {meta_path}, {e}")
+
+    if meta and meta.get('pack'):
+        frames = sorted(['meta.json', meta.get('sprite', 'sprite.png'), meta['pack']['file']])
+        return {
+            'name': sequence_name,
+            'frames': frames,
+            'frame_count': meta['pack']['frame_count'],
+            'pack': meta['pack']
+        }
+
+    # 팩이 없는 기존 시퀀스는 폴더 스캔으로 하위 호환
+    frames = sorted(f for f in os.listdir(seq_path) if os.path.isfile(os.path.join(seq_path, f)))
+    return {'name': sequence_name, 'frames': frames}
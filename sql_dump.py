@@ -0,0 +1,124 @@
+"""
+스트리밍 SQL 덤프 / 덤프 문장 읽기
+- 테이블 행을 yield_per(서버 측 커서)로 나눠 읽으면서 바로 파일에 기록 (덤프 전체를 메모리에 만들지 않음)
+- 값은 DB 방언(dialect)의 literal processor 로 SQL 리터럴 변환 (따옴표/개행/불리언/날짜 처리를 직접 하지 않음)
+- SQL_DUMP_BATCH_SIZE 행마다 다중 행 INSERT ... VALUES (...), (...); 한 문장으로 기록 (복구 시 문장 수가 1/배치 크기)
+- PostgreSQL 덤프는 끝에 id 시퀀스를 max(id) 로 맞추는 문장 포함
+- iter_sql_statements: 덤프를 한 줄씩 읽어 문장 단위로 나눔 (문자열 리터럴 안의 ; 와 개행, -- 주석 처리)
+"""
+
+import os
+import re
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from sqlalchemy import Integer, Table
+
+SQL_DUMP_BATCH_SIZE = int(os.environ.get('SQL_DUMP_BATCH_SIZE', 500))  # INSERT 문 하나에 넣을 행 수
+
+# 문장 경계 판단에 필요한 토큰 (문자열 리터럴, 따옴표 식별자, 주석, 세미콜론)
+SQL_TOKEN_PATTERN = re.compile(r"'|\"|--|;")
+
+
+def literal_encoders(table: Table, dialect) -> List[Callable]:
+    """컬럼별 값 -> SQL 리터럴 변환 함수 (방언의 literal processor, None 은 NULL)"""
+    encoders = []
+    for column in table.columns:
+        processor = column.type.literal_processor(dialect)
+        if processor is None:
+            raise ValueError(f'{table.name}.{column.name} 컬럼 타입은 SQL 리터럴로 기록할 수 없습니다: {column.type}')
+        encoders.append(lambda value, processor=processor: 'NULL' if value is None else processor(value))
+    return encoders
+
+
+def sequence_reset_statement(table: Table, dialect) -> Optional[str]:
+    """PostgreSQL id 시퀀스 재설정 문장 (정수 단일 기본 키가 아니거나 다른 DB 면 None)"""
+    primary_keys = list(table.primary_key.columns)
+    if dialect.name != 'postgresql' or len(primary_keys) != 1 or not isinstance(primary_keys[0].type, Integer):
+        return None
+    preparer = dialect.identifier_preparer
+    table_name = preparer.format_table(table)
+    column = preparer.quote(primary_keys[0].name)
+    return (f"SELECT setval(pg_get_serial_sequence('{table_name}', '{primary_keys[0].name}'), "
+            f"COALESCE(MAX({column}), 1), MAX({column}) IS NOT NULL) FROM {table_name};")
+
+
+def write_sql_dump(session, tables: List[Table], out: TextIO, batch_size: int = SQL_DUMP_BATCH_SIZE,
+                   on_table: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+    """tables 의 행을 SQL 문으로 out 에 기록 (부모 테이블 먼저), {테이블 이름: 행 수} 반환
+
+    on_table: 테이블 하나를 기록한 뒤 호출 (테이블 이름, 행 수)
+    """
+    dialect = session.get_bind().dialect
+    preparer = dialect.identifier_preparer
+    out.write("-- EditOnair Database Backup\n")
+    out.write(f"-- Generated: {datetime.now().isoformat()}\n")
+    out.write(f"-- Dialect: {dialect.name}, {batch_size} rows per INSERT\n\n")
+
+    counts = {}
+    for table in tables:
+        table_name = preparer.format_table(table)
+        columns = ', '.join(preparer.quote(column.name) for column in table.columns)
+        encoders = literal_encoders(table, dialect)
+        prefix = f"INSERT INTO {table_name} ({columns}) VALUES\n"
+
+        out.write(f"-- {table.name} Table\n")
+        out.write(f"DELETE FROM {table_name};\n")
+        result = session.execute(
+            table.select().order_by(*table.primary_key.columns).execution_options(yield_per=batch_size)
+        )
+        count = 0
+        for batch in result.partitions():
+            values = ',\n'.join(
+                '(' + ', '.join(encode(value) for encode, value in zip(encoders, row)) + ')' for row in batch
+            )
+            out.write(prefix + values + ';\n')
+            count += len(batch)
+        counts[table.name] = count
+        out.write('\n')
+        if on_table is not None:
+            on_table(table.name, count)
+
+    resets = [statement for statement in (sequence_reset_statement(table, dialect) for table in tables) if statement]
+    if resets:
+        out.write("-- Sequences\n" + '\n'.join(resets) + '\n')
+    return counts
+
+
+def iter_sql_statements(lines: Iterable[str]) -> Iterator[str]:
+    """SQL 텍스트를 문장 단위로 나눔 (끝의 ; 제외)
+
+    '...' 문자열(''/개행 포함)과 "..." 식별자 안의 ; 와 -- 는 문장 경계/주석으로 보지 않음
+    """
+    statement = []
+    quote = None
+    for line in lines:
+        start = 0
+        position = 0
+        while True:
+            match = SQL_TOKEN_PATTERN.search(line, position)
+            if match is None:
+                break
+            token = match.group()
+            position = match.end()
+            if quote is not None:
+                if token == quote:
+                    quote = None
+            elif token in ("'", '"'):
+                quote = token
+            elif token == '--':
+                # 줄 끝까지 주석
+                statement.append(line[start:match.start()] + '\n')
+                start = len(line)
+                break
+            else:
+                statement.append(line[start:match.start()])
+                start = position
+                text = ''.join(statement).strip()
+                statement = []
+                if text:
+                    yield text
+        statement.append(line[start:])
+    text = ''.join(statement).strip()
+    if text:
+        yield text
@@ -0,0 +1,342 @@
+"""
+스트리밍 ZIP 생성 / 병렬 압축 해제
+- ZIP 전체를 메모리(BytesIO)에 만들지 않고, 만들어지는 대로 청크 단위로 내보냄
+- HTTP 응답 본문(제너레이터) 또는 디스크 파일에 바로 기록 (메모리 사용량은 블록 크기 수준으로 제한)
+- 파일 크기를 미리 알려 주므로 4GB 이상 파일은 자동으로 ZIP64 항목으로 기록
+- 항목 데이터는 파일 경로, bytes, 바이트 청크 반복자(생성 중인 데이터) 중 하나, 항목별 압축 방식 지정 가능
+- 압축 정책: 이미 압축된 형식(PNG/WebP/JPEG/ZIP 등)은 STORED 로 그대로 기록하고, 나머지 파일은
+  스레드 풀에서 미리 deflate 한 뒤 압축된 데이터를 그대로 항목으로 기록 (여러 코어 사용, 기록 순서는 유지)
+  · 미리 압축 중인 파일 크기 합계는 PRECOMPRESS_MAX_INFLIGHT 이하로 제한 (파일 하나가 더 크면 그 파일만, 메모리 사용량 상한)
+  · 압축된 데이터를 그대로 기록하는 데 쓰는 zipfile 내부 속성이 없으면 미리 압축하지 않고 zipf.open(..., 'w') 로 기록
+- 압축 해제는 항목마다 자체 파일 핸들로 읽으므로 (ZipFile 객체/락 공유 없음) 여러 스레드에서 동시에 실행
+"""
+
+import os
+import time
+import zlib
+import struct
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+ZIP_BLOCK_SIZE = 1024 * 1024  # 파일을 읽고 내보내는 단위 (1MB)
+EXTRACT_WORKERS = int(os.environ.get('ZIP_EXTRACT_WORKERS', 4))  # 동시에 압축 해제할 최대 항목 수
+COMPRESS_WORKERS = int(os.environ.get('ZIP_COMPRESS_WORKERS', os.cpu_count() or 4))  # 동시에 압축할 최대 파일 수
+PRECOMPRESS_MAX_SIZE = int(os.environ.get('ZIP_PRECOMPRESS_MAX_SIZE', 4 * 1024 * 1024))  # 이보다 큰 파일은 기록하면서 압축
+PRECOMPRESS_MAX_INFLIGHT = int(os.environ.get('ZIP_PRECOMPRESS_MAX_INFLIGHT', 16 * 1024 * 1024))  # 동시에 미리 압축할 파일 크기 합계
+DEFLATE_LEVEL = 6  # zipfile ZIP_DEFLATED 기본값 (zlib 기본 수준)
+
+# 다시 압축해도 거의 줄지 않는 형식 (STORED 로 기록)
+STORED_EXTENSIONS = frozenset([
+    '.png', '.jpg', '.jpeg', '.webp', '.avif', '.gif', '.heic',
+    '.zip', '.gz', '.tgz', '.zst', '.bz2', '.xz', '.7z',
+    '.mp4', '.webm', '.mov', '.mp3', '.ogg', '.m4a', '.woff', '.woff2'
+])
+
+LOCAL_HEADER_SIZE = 30
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+# (ZIP 내부 경로, 파일 경로 / bytes 데이터 / bytes 청크 반복자[, 항목 압축 방식])
+ZipSource = Union[str, bytes, Iterable[bytes]]
+ZipEntry = Union[Tuple[str, ZipSource], Tuple[str, ZipSource, int]]
+
+
+class ZipChunkBuffer:
+    """zipfile 이 기록한 데이터를 모아 두었다가 청크로 꺼내는 쓰기 전용 스트림 (seek 불가)"""
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+def compress_type_for(arcname: str, compression: int = zipfile.ZIP_DEFLATED) -> int:
+    """압축 정책: 이미 압축된 형식은 ZIP_STORED, 나머지는 compression"""
+    if compression != zipfile.ZIP_STORED and os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return compression
+
+
+def deflate_file(path: str, block_size: int = ZIP_BLOCK_SIZE) -> Tuple[bytes, int, int]:
+    """파일을 raw deflate 로 압축 -> (압축 데이터, CRC, 원본 크기) (스레드 풀에서 실행, zlib 은 GIL 을 놓음)"""
+    compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15)
+    parts = []
+    crc = 0
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            parts.append(compressor.compress(block))
+    parts.append(compressor.flush())
+    return b''.join(parts), crc, size
+
+
+def can_write_compressed(zipf: zipfile.ZipFile) -> bool:
+    """write_compressed_member 가 쓰는 zipfile 내부 속성이 있는지 (파이썬 버전에 따라 바뀔 수 있음)"""
+    return callable(getattr(zipf, '_writecheck', None)) and all(
+        hasattr(zipf, name) for name in ('_writing', '_didModify', 'start_dir', 'fp', 'filelist', 'NameToInfo')
+    )
+
+
+def write_compressed_member(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, data: bytes, crc: int, size: int):
+    """미리 deflate 한 데이터를 ZIP 항목으로 기록
+
+    zipfile 에는 압축된 데이터를 그대로 넣는 공개 API 가 없으므로 ZipFile._open_to_write /
+    _ZipWriteFile.close 와 같은 순서로 로컬 헤더, 데이터, 목록을 기록 (크기/CRC 를 미리 알므로 데이터 디스크립터 없음)
+    호출하기 전에 can_write_compressed 로 확인해야 함
+    """
+    if zipf._writing:
+        raise ValueError('다른 ZIP 항목을 기록하는 중입니다.')
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.flag_bits = 0x00
+    zinfo.CRC = crc
+    zinfo.file_size = size
+    zinfo.compress_size = len(data)
+    if not zinfo.external_attr:
+        zinfo.external_attr = 0o600 << 16
+    zip64 = size > zipfile.ZIP64_LIMIT or len(data) > zipfile.ZIP64_LIMIT
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zipf.fp.write(zinfo.FileHeader(zip64))
+    zipf.fp.write(data)
+    zipf.start_dir = zipf.fp.tell()
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+
+
+def stream_zip(entries: Iterable[ZipEntry], compression: int = zipfile.ZIP_DEFLATED,
+               block_size: int = ZIP_BLOCK_SIZE,
+               on_entry: Optional[Callable[[str, Optional[Exception]], None]] = None,
+               workers: int = COMPRESS_WORKERS) -> Iterator[bytes]:
+    """ZIP 바이트 청크 생성기
+
+    entries : (arcname, source[, compress_type]) 반복자. source 가 str 이면 파일 경로, bytes 이면 데이터,
+              그 밖의 반복자는 bytes 청크 (크기를 모르므로 2GB 미만이어야 함, 데이터로 넣을 문자열은 미리 encode)
+              compress_type 을 주지 않으면 압축 정책(compress_type_for) 적용
+    on_entry: 항목 하나를 기록한 뒤 호출 (arcname, 오류 또는 None)
+    workers : 파일을 미리 압축할 스레드 수 (entries 를 최대 workers * 2 항목까지 앞서 읽음,
+              단 청크 반복자 항목 뒤의 항목은 그 데이터를 다 기록한 뒤에 읽음)
+              미리 압축 중인 파일 크기 합계가 PRECOMPRESS_MAX_INFLIGHT 를 넘으면 앞 항목을 기록할 때까지 기다림
+    """
+    buffer = ZipChunkBuffer()
+    executor = native_executor(workers) if workers > 1 and compression == zipfile.ZIP_DEFLATED else None
+    window = max(workers, 1) * 2
+    iterator = iter(entries)
+    pending = []  # [[arcname, source, compress_type, 미리 압축할 파일 크기 또는 None, future 또는 None]]
+    inflight = 0  # 미리 압축을 시작했고 아직 기록하지 않은 파일 크기 합계
+    exhausted = False
+
+    def fill():
+        nonlocal exhausted
+        while not exhausted and len(pending) < window:
+            if pending and not isinstance(pending[-1][1], (str, bytes)):
+                break
+            try:
+                entry = next(iterator)
+            except StopIteration:
+                exhausted = True
+                break
+            arcname, source = entry[0], entry[1]
+            compress_type = entry[2] if len(entry) > 2 else compress_type_for(arcname, compression)
+            size = None
+            if executor is not None and isinstance(source, str) and compress_type == zipfile.ZIP_DEFLATED:
+                try:
+                    size = os.path.getsize(source)
+                except OSError:
+                    pass  # 기록할 때 오류 보고
+                if size is not None and size > PRECOMPRESS_MAX_SIZE:
+                    size = None
+            pending.append([arcname, source, compress_type, size, None])
+        schedule()
+
+    def schedule():
+        # 기록 순서대로, 크기 합계 한도 안에서 미리 압축 시작 (진행 중인 것이 없으면 한도와 관계없이 하나는 시작)
+        nonlocal inflight
+        for item in pending:
+            size = item[3]
+            if size is None or item[4] is not None:
+                continue
+            if inflight and inflight + size > PRECOMPRESS_MAX_INFLIGHT:
+                break
+            item[4] = executor.submit(deflate_file, item[1], block_size)
+            inflight += size
+
+    def copy_file(zipf, arcname, source, compress_type):
+        with open(source, 'rb') as src:
+            zinfo = zipfile.ZipInfo.from_file(source, arcname)
+            zinfo.compress_type = compress_type
+            with zipf.open(zinfo, 'w') as dst:
+                while True:
+                    block = src.read(block_size)
+                    if not block:
+                        break
+                    dst.write(block)
+                    if buffer.size >= block_size:
+                        yield buffer.drain()
+
+    try:
+        with zipfile.ZipFile(buffer, 'w', compression) as zipf:
+            if executor is not None and not can_write_compressed(zipf):
+                executor.shutdown()
+                executor = None
+            fill()
+            while pending:
+                arcname, source, compress_type, size, future = pending.pop(0)
+                if future is not None:
+                    inflight -= size
+                error = None
+                if isinstance(source, bytes):
+                    zipf.writestr(arcname, source, compress_type=compress_type)
+                elif isinstance(source, str):
+                    try:
+                        if future is not None:
+                            data, crc, size = future.result()
+                            if len(data) < size:
+                                write_compressed_member(zipf, zipfile.ZipInfo.from_file(source, arcname), data, crc, size)
+                            else:
+                                # 압축해도 줄지 않으면 원본 그대로 기록
+                                yield from copy_file(zipf, arcname, source, zipfile.ZIP_STORED)
+                            del data
+                        else:
+                            yield from copy_file(zipf, arcname, source, compress_type)
+                    except OSError as e:
+                        error = e
+                else:
+                    zinfo = zipfile.ZipInfo(arcname, time.localtime()[:6])
+                    zinfo.compress_type = compress_type
+                    zinfo.external_attr = 0o644 << 16
+                    with zipf.open(zinfo, 'w') as dst:
+                        for block in source:
+                            dst.write(block)
+                            if buffer.size >= block_size:
+                                yield buffer.drain()
+                if on_entry is not None:
+                    on_entry(arcname, error)
+                if buffer.size:
+                    yield buffer.drain()
+                fill()
+        # 중앙 디렉터리
+        yield buffer.drain()
+    finally:
+        if executor is not None:
+            for item in pending:
+                if item[4] is not None:
+                    item[4].cancel()
+            executor.shutdown()
+
+
+def write_zip(path: str, entries: Iterable[ZipEntry], compression: int = zipfile.ZIP_DEFLATED,
+              on_entry: Optional[Callable[[str, Optional[Exception]], None]] = None) -> int:
+    """ZIP 을 디스크에 스트리밍 기록 (임시 파일에 쓴 뒤 교체), 기록한 크기 반환"""
+    tmp_path = path + '.tmp'
+    written = 0
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in stream_zip(entries, compression, on_entry=on_entry):
+                f.write(chunk)
+                written += len(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+
+
+def native_executor(workers: int):
+    """스레드 풀 생성 (gevent 로 threading 이 패치된 경우 실제 OS 스레드를 쓰는 gevent 스레드 풀)"""
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+            return NativeThreadPoolExecutor(workers)
+    except ImportError:
+        pass
+    return ThreadPoolExecutor(workers)
+
+
+def extract_member(archive_path: str, info: zipfile.ZipInfo, target_path: str, block_size: int = ZIP_BLOCK_SIZE):
+    """ZIP 항목 하나를 target_path 에 풀기 (STORED/DEFLATED, CRC 확인 후 os.replace 로 교체)"""
+    if info.flag_bits & 0x1:
+        raise zipfile.BadZipFile(f'암호화된 항목은 지원하지 않습니다: {info.filename}')
+    if info.compress_type == zipfile.ZIP_DEFLATED:
+        decompressor = zlib.decompressobj(-15)
+    elif info.compress_type == zipfile.ZIP_STORED:
+        decompressor = None
+    else:
+        raise ValueError(f'지원하지 않는 압축 방식입니다: {info.filename} ({info.compress_type})')
+
+    with open(archive_path, 'rb') as source:
+        source.seek(info.header_offset)
+        header = source.read(LOCAL_HEADER_SIZE)
+        if len(header) != LOCAL_HEADER_SIZE or header[:4] != LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f'잘못된 로컬 헤더: {info.filename}')
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        source.seek(name_length + extra_length, os.SEEK_CUR)
+
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        # 임시 파일에 풀고 CRC 를 확인한 뒤 교체 (mmap 으로 보내는 중인 파일을 제자리에서 자르지 않고,
+        # 실패하면 기존 파일을 그대로 둠)
+        tmp_path = target_path + '.tmp'
+        try:
+            crc = 0
+            remaining = info.compress_size
+            with open(tmp_path, 'wb') as target:
+                while remaining > 0:
+                    block = source.read(min(block_size, remaining))
+                    if not block:
+                        raise zipfile.BadZipFile(f'항목 데이터가 잘렸습니다: {info.filename}')
+                    remaining -= len(block)
+                    data = decompressor.decompress(block) if decompressor is not None else block
+                    crc = zlib.crc32(data, crc)
+                    target.write(data)
+                if decompressor is not None:
+                    data = decompressor.flush()
+                    crc = zlib.crc32(data, crc)
+                    target.write(data)
+            if crc != info.CRC:
+                raise zipfile.BadZipFile(f'CRC 불일치: {info.filename}')
+            os.replace(tmp_path, target_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def extract_members(archive_path: str, items: List[Tuple[zipfile.ZipInfo, str]],
+                    workers: int = EXTRACT_WORKERS) -> Iterator[Tuple[zipfile.ZipInfo, str, Optional[Exception]]]:
+    """(ZipInfo, 대상 경로) 목록을 병렬로 풀고 입력 순서대로 (ZipInfo, 대상 경로, 오류 또는 None) 반환
+
+    동시에 처리 중인 항목은 workers * 2 개로 제한, 결과는 호출한 스레드에서 반환
+    """
+    def run(item):
+        info, target_path = item
+        try:
+            extract_member(archive_path, info, target_path)
+            return info, target_path, None
+        except Exception as e:
+            return info, target_path, e
+
+    window = max(workers, 1) * 2
+    executor = native_executor(max(workers, 1))
+    try:
+        for start in range(0, len(items), window):
+            yield from executor.map(run, items[start:start + window])
+    finally:
+        executor.shutdown()
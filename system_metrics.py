@@ -0,0 +1,204 @@
+"""
+시스템 메트릭 샘플러
+- 백그라운드 스레드가 SYSTEM_METRICS_INTERVAL 초마다 샘플을 수집하여 링 버퍼(최근 SYSTEM_METRICS_HISTORY 개)에 보관
+- 수집 항목: 프로세스 RSS/메모리 비율, 프로세스 CPU 사용률, 열린 소켓 수, 접속 클라이언트/오버레이 수,
+  라이브 이벤트 초당 전송 수, 프로젝트 폴더 디스크 사용량 (디스크는 DISK_SAMPLE_EVERY 샘플마다)
+- 조회(latest/series)는 버퍼만 읽으므로 요청을 막지 않음
+- psutil 이 설치되어 있으면 사용하고, 없으면 /proc (Linux) 와 os.times 로 계산
+"""
+
+import os
+import time
+import shutil
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+SYSTEM_METRICS_INTERVAL = float(os.environ.get('SYSTEM_METRICS_INTERVAL', 5))  # 샘플 간격 (초)
+SYSTEM_METRICS_HISTORY = int(os.environ.get('SYSTEM_METRICS_HISTORY', 720))  # 보관할 샘플 수 (기본 1시간)
+DISK_SAMPLE_EVERY = int(os.environ.get('SYSTEM_METRICS_DISK_EVERY', 12))  # 디스크 사용량은 이 샘플 수마다 다시 계산
+
+
+def read_rss_bytes() -> Optional[int]:
+    """현재 프로세스 RSS (바이트)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_memory_total() -> Optional[int]:
+    """시스템 전체 메모리 (바이트)"""
+    if psutil is not None:
+        return psutil.virtual_memory().total
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemTotal:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def count_open_sockets() -> Optional[int]:
+    """현재 프로세스가 연 소켓 수 (/proc/self/fd 에서 socket: 링크 수)"""
+    try:
+        names = os.listdir('/proc/self/fd')
+    except OSError:
+        if psutil is not None:
+            try:
+                return len(psutil.Process().connections(kind='all'))
+            except psutil.Error:
+                return None
+        return None
+    count = 0
+    for name in names:
+        try:
+            if os.readlink(f'/proc/self/fd/{name}').startswith('socket:'):
+                count += 1
+        except OSError:
+            continue
+    return count
+
+
+def format_percent(value: Optional[float]) -> str:
+    return f'{value:.0f}%' if value is not None else 'N/A'
+
+
+class SystemMetricsSampler:
+    def __init__(self, interval: float = SYSTEM_METRICS_INTERVAL, history: int = SYSTEM_METRICS_HISTORY):
+        self.interval = interval
+        self._samples: deque = deque(maxlen=history)
+        self._thread: Optional[threading.Thread] = None
+        self._started = False
+        self._projects_dir: Optional[str] = None
+        self._projects_size: Optional[Callable[[], int]] = None
+
+        # 소켓 연결 / 오버레이 (Socket.IO sid)
+        self._clients = set()
+        self._overlays = set()
+        self._live_events = 0
+
+        # 직전 샘플 기준값 (CPU / 이벤트 비율 계산)
+        self._last_wall = None
+        self._last_cpu = None
+        self._last_live_events = 0
+        self._memory_total = read_memory_total()
+        self._disk = {}
+        self._sample_count = 0
+
+    def configure(self, projects_dir: Optional[str] = None, projects_size: Optional[Callable[[], int]] = None):
+        """projects_dir: 디스크 사용량을 볼 폴더, projects_size: 프로젝트 폴더 전체 크기 (바이트) 계산 함수"""
+        self._projects_dir = projects_dir
+        self._projects_size = projects_size
+
+    def ensure_started(self):
+        """샘플러 스레드 시작 (처음 한 번, 첫 샘플도 스레드에서 수집하므로 호출한 쪽을 막지 않음)"""
+        if self._started:
+            return
+        self._started = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        print(f"📈 시스템 메트릭 샘플러 시작 ({self.interval:g}초 간격, 최근 {self._samples.maxlen}개 보관)")
+
+    # 소켓 이벤트 기록 (핸들러에서 호출)
+    def client_connected(self, sid: str):
+        self._clients.add(sid)
+
+    def client_disconnected(self, sid: str):
+        self._clients.discard(sid)
+        self._overlays.discard(sid)
+
+    def overlay_joined(self, sid: str):
+        self._overlays.add(sid)
+
+    def count_live_event(self, count: int = 1):
+        self._live_events += count
+
+    # 샘플 수집
+    def _loop(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"시스템 메트릭 샘플 수집 실패: {e}")
+            time.sleep(self.interval)
+
+    def _sample_disk(self) -> Dict[str, Any]:
+        disk = {}
+        if self._projects_size is not None:
+            try:
+                disk['projects_bytes'] = self._projects_size()
+            except Exception as e:
+                print(f"프로젝트 폴더 크기 계산 실패: {e}")
+        if self._projects_dir and os.path.isdir(self._projects_dir):
+            usage = shutil.disk_usage(self._projects_dir)
+            disk.update({'disk_total_bytes': usage.total, 'disk_free_bytes': usage.free,
+                         'disk_percent': round(usage.used * 100 / usage.total, 1) if usage.total else None})
+        return disk
+
+    def sample(self) -> Dict[str, Any]:
+        now = time.time()
+        times = os.times()
+        cpu = times.user + times.system
+        live_events = self._live_events
+
+        cpu_percent = None
+        live_rate = None
+        if self._last_wall is not None and now > self._last_wall:
+            elapsed = now - self._last_wall
+            # 한 코어 기준 (여러 코어를 쓰면 100% 초과 가능, top/psutil 과 같은 기준)
+            cpu_percent = round((cpu - self._last_cpu) * 100 / elapsed, 1)
+            live_rate = round((live_events - self._last_live_events) / elapsed, 2)
+        self._last_wall, self._last_cpu, self._last_live_events = now, cpu, live_events
+
+        if self._sample_count % max(DISK_SAMPLE_EVERY, 1) == 0:
+            self._disk = self._sample_disk()
+        self._sample_count += 1
+
+        rss = read_rss_bytes()
+        sample = {
+            'timestamp': datetime.utcfromtimestamp(now).isoformat(),
+            'rss_bytes': rss,
+            'memory_percent': round(rss * 100 / self._memory_total, 1) if rss and self._memory_total else None,
+            'cpu_percent': cpu_percent,
+            'open_sockets': count_open_sockets(),
+            'connected_clients': len(self._clients),
+            'connected_overlays': len(self._overlays),
+            'live_events_total': live_events,
+            'live_events_per_second': live_rate,
+            **self._disk
+        }
+        self._samples.append(sample)
+        return sample
+
+    # 조회
+    def latest(self) -> Optional[Dict[str, Any]]:
+        return self._samples[-1] if self._samples else None
+
+    def series(self, limit: int = 60) -> List[Dict[str, Any]]:
+        """최근 limit 개 샘플 (오래된 것부터)"""
+        samples = list(self._samples)
+        return samples[-limit:] if limit > 0 else []
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'interval': self.interval,
+            'samples': len(self._samples),
+            'history': self._samples.maxlen,
+            'source': 'psutil' if psutil is not None else 'procfs'
+        }
+
+
+# 전역 시스템 메트릭 샘플러 인스턴스
+system_metrics = SystemMetricsSampler()
@@ -0,0 +1,76 @@
+"""앱 통합 테스트 공통 설정
+
+- 앱은 임시 SQLite DB / 증분 백업 폴더 / 분할 업로드 폴더로 한 번만 불러옴 (환경 변수는 import 전에 지정)
+- 프로젝트 폴더는 앱과 같은 ../projects 를 쓰므로 테스트 프로젝트 이름은 겹치지 않게 만들고 끝나면 지움
+"""
+
+import io
+import os
+import sys
+import uuid
+import shutil
+import tempfile
+import contextlib
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+TEST_DIR = tempfile.mkdtemp(prefix='editonair_test_')
+
+
+def quiet(fn, *args, **kwargs):
+    """앱의 print 출력 없이 호출"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(TEST_DIR, 'test.db')
+    os.environ['INCREMENTAL_BACKUP_DIR'] = os.path.join(TEST_DIR, 'incremental')
+    os.environ['CHUNKED_UPLOAD_DIR'] = os.path.join(TEST_DIR, 'uploads')
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+        with app.app.app_context():
+            app.db.create_all()
+    yield app
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope='session')
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def register(client, username):
+    response = quiet(client.post, '/api/auth/register', json={'username': username, 'password': 'pw'})
+    assert response.status_code == 201, response.get_data(as_text=True)
+    data = response.get_json()
+    return data['user']['id'], {'Authorization': f"Bearer {data['token']}"}
+
+
+@pytest.fixture
+def admin_headers(client):
+    """admin 로그인 토큰 (복구 테스트가 사용자 테이블을 바꿀 수 있으므로 테스트마다 새로 로그인)"""
+    response = quiet(client.post, '/api/auth/login', json={'username': 'admin', 'password': 'pw'})
+    if response.status_code != 200:
+        return register(client, 'admin')[1]
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+@pytest.fixture
+def project(app_module, client):
+    """새 사용자와 씬 하나가 있는 프로젝트 {'user_id', 'headers', 'name', 'scene_id', 'folder'}"""
+    user_id, headers = register(client, f'user_{uuid.uuid4().hex[:8]}')
+    name = f'pytest_{uuid.uuid4().hex[:8]}'
+    response = quiet(client.post, '/api/projects', json={'name': name, 'scenes': [{'name': 's1', 'order': 0}]},
+                     headers=headers)
+    assert response.status_code == 201, response.get_data(as_text=True)
+    with app_module.app.app_context():
+        project = app_module.Project.query.filter_by(name=name, user_id=user_id).one()
+        scene_id = project.scenes[0].id
+    folder = app_module.get_project_folder(name, user_id)
+    yield {'user_id': user_id, 'headers': headers, 'name': name, 'scene_id': scene_id, 'folder': folder}
+    shutil.rmtree(folder, ignore_errors=True)
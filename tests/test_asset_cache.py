@@ -0,0 +1,61 @@
+"""라이브러리 에셋 HTTP 캐시: ETag / Range / immutable 버전 URL"""
+
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from conftest import quiet
+
+
+@pytest.fixture
+def image(app_module, client, project):
+    """업로드한 이미지의 (URL, 파일 내용, 버전)"""
+    upload = io.BytesIO()
+    Image.effect_noise((64, 64), 50).convert('RGB').save(upload, 'PNG')
+    response = quiet(client.post, f"/api/projects/{project['name']}/upload/image", headers=project['headers'],
+                     data={'file': (io.BytesIO(upload.getvalue()), 'noise.png')}, content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_data(as_text=True)
+    path = os.path.join(project['folder'], 'library', 'images', 'noise.png')
+    with open(path, 'rb') as f:
+        data = f.read()
+    url = f"/projects/{project['name']}/library/images/noise.png?user_id={project['user_id']}"
+    return url, data, app_module.asset_server.asset_version(path)
+
+
+def test_etag_and_conditional_get(client, image):
+    url, data, _ = image
+    response = quiet(client.get, url)
+    assert response.status_code == 200 and response.data == data
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    etag = response.headers['ETag']
+    assert etag and response.headers['Last-Modified']
+
+    response = quiet(client.get, url, headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.data == b''
+    response = quiet(client.get, url, headers={'If-None-Match': '"other"'})
+    assert response.status_code == 200
+
+
+def test_range_requests(client, image):
+    url, data, _ = image
+    response = quiet(client.get, url, headers={'Range': 'bytes=0-9'})
+    assert response.status_code == 206
+    assert response.data == data[:10]
+    assert response.headers['Content-Range'] == f'bytes 0-9/{len(data)}'
+
+    response = quiet(client.get, url, headers={'Range': 'bytes=-5'})
+    assert response.status_code == 206 and response.data == data[-5:]
+
+    response = quiet(client.get, url, headers={'Range': f'bytes={len(data) + 10}-'})
+    assert response.status_code == 416
+
+
+def test_versioned_url_is_immutable(client, image):
+    url, _, version = image
+    response = quiet(client.get, f'{url}&v={version}')
+    assert 'immutable' in response.headers['Cache-Control']
+    response = quiet(client.get, f'{url}&v=0000000000000000')
+    assert response.headers['Cache-Control'] == 'no-cache'
@@ -0,0 +1,66 @@
+"""전체 백업 ZIP(/api/admin/backup) -> /api/admin/restore 왕복 (compact / json 형식)"""
+
+import io
+import os
+import shutil
+
+import pytest
+from PIL import Image
+
+from conftest import quiet
+
+TEXTS = ["100%", "it's; -- \"quoted\"", "줄\n바꿈", "{\"nested\": [1, 2]}"]
+
+
+@pytest.fixture
+def spool_cleanup(app_module):
+    """복구 업로드 임시 폴더(backups/restore)는 테스트가 만들었으면 지움"""
+    existed = os.path.exists(app_module.RESTORE_SPOOL_DIR)
+    yield
+    if not existed:
+        shutil.rmtree(app_module.RESTORE_SPOOL_DIR, ignore_errors=True)
+
+
+def snapshot(app_module):
+    with app_module.app.app_context():
+        objects = [(o.id, o.name, o.type, o.order, o.properties, o.scene_id, o.created_at, o.updated_at)
+                   for o in app_module.Object.query.order_by(app_module.Object.id)]
+        scenes = [(s.id, s.name, s.order, s.project_id) for s in app_module.Scene.query.order_by(app_module.Scene.id)]
+        users = [(u.id, u.username, u.password) for u in app_module.User.query.order_by(app_module.User.id)]
+    return objects, scenes, users
+
+
+@pytest.mark.parametrize('backup_format', ['compact', 'json'])
+def test_full_backup_round_trip(app_module, client, admin_headers, project, spool_cleanup, backup_format):
+    for text in TEXTS:
+        response = quiet(client.post, f"/api/scenes/{project['scene_id']}/objects",
+                         json={'name': text, 'type': 'text', 'properties': {'text': text}}, headers=project['headers'])
+        assert response.status_code == 201
+    upload = io.BytesIO()
+    Image.new('RGB', (32, 32), (10, 20, 30)).save(upload, 'PNG')
+    response = quiet(client.post, f"/api/projects/{project['name']}/upload/image", headers=project['headers'],
+                     data={'file': (io.BytesIO(upload.getvalue()), 'keep.png')}, content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_data(as_text=True)
+    image_path = os.path.join(project['folder'], 'library', 'images', 'keep.png')
+    with open(image_path, 'rb') as f:
+        library_data = f.read()
+    before = snapshot(app_module)
+
+    response = quiet(client.post, '/api/admin/backup', json={'format': backup_format}, headers=admin_headers)
+    assert response.status_code == 200
+    archive = quiet(lambda: response.data)
+
+    # 백업 이후 변경: 객체 삭제, 씬 이름 변경, 라이브러리 파일 삭제
+    with app_module.app.app_context():
+        app_module.Object.query.filter_by(scene_id=project['scene_id']).delete()
+        app_module.db.session.get(app_module.Scene, project['scene_id']).name = 'changed'
+        app_module.db.session.commit()
+    os.remove(image_path)
+
+    response = quiet(client.post, '/api/admin/restore', headers=admin_headers, content_type='multipart/form-data',
+                     data={'backup_file': (io.BytesIO(archive), 'backup.zip'),
+                           'restore_database': 'true', 'restore_libraries': 'true'})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert snapshot(app_module) == before
+    with open(image_path, 'rb') as f:
+        assert f.read() == library_data
@@ -0,0 +1,55 @@
+"""bulk_restore: 배치 적재와 실패 시 전체 롤백"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bulk_restore import BulkRestoreError, bulk_restore
+
+metadata = MetaData()
+parents = Table('parents', metadata, Column('id', Integer, primary_key=True), Column('name', String(20), nullable=False))
+children = Table('children', metadata,
+                 Column('id', Integer, primary_key=True),
+                 Column('parent_id', Integer, ForeignKey('parents.id'), nullable=False),
+                 Column('label', String(20), nullable=False, default='none'),
+                 Column('created_at', DateTime),
+                 Index('ix_children_parent', 'parent_id'))
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(parents.insert(), [{'id': 1, 'name': 'old'}])
+        session.commit()
+        yield session
+
+
+def test_batches_replace_rows(session):
+    progress = []
+    rows = [{'id': i, 'parent_id': 1 + i % 2, 'created_at': '2024-01-02T03:04:05'} for i in range(1, 6)]
+    restored = bulk_restore(session, [(parents, [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]), (children, rows)],
+                            batch_size=2, on_progress=lambda table, count: progress.append((table, count)))
+    assert restored == {'parents': 2, 'children': 5}
+    assert progress == [('parents', 2), ('children', 2), ('children', 4), ('children', 5)]
+    assert session.execute(select(parents.c.name).order_by(parents.c.id)).scalars().all() == ['a', 'b']
+    assert session.execute(select(children.c.label).distinct()).scalars().all() == ['none']  # 컬럼 기본값
+    index_names = [row[1] for row in session.connection().exec_driver_sql("PRAGMA index_list('children')")]
+    assert 'ix_children_parent' in index_names  # 적재 후 다시 생성
+
+
+def test_failure_rolls_back_everything(session):
+    rows = [{'id': 1, 'parent_id': 1}, {'id': 1, 'parent_id': 1}]  # 기본 키 중복
+    with pytest.raises(BulkRestoreError) as info:
+        bulk_restore(session, [(parents, [{'id': 1, 'name': 'new'}]), (children, rows)])
+    assert info.value.table == 'children'
+    assert session.execute(select(parents.c.name)).scalars().all() == ['old']
+    assert session.execute(select(children.c.id)).scalars().all() == []
+    index_names = [row[1] for row in session.connection().exec_driver_sql("PRAGMA index_list('children')")]
+    assert 'ix_children_parent' in index_names
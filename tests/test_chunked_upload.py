@@ -0,0 +1,49 @@
+"""분할 업로드: 시퀀스 이름 정리와 경로 검사"""
+
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from conftest import quiet
+
+
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new('RGBA', (8, 16), (0, 255, 0, 255)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def init_sequence_upload(client, project, sequence_name, size):
+    return quiet(client.post, f"/api/projects/{project['name']}/uploads", headers=project['headers'],
+                 json={'kind': 'sequence', 'total_size': size, 'sequence_name': sequence_name,
+                       'meta': {'frame_width': 8, 'frame_height': 8, 'frame_count': 2}})
+
+
+@pytest.mark.parametrize('sequence_name', ['..', '.', '', '/'])
+def test_init_rejects_sequence_name_outside_sequences(client, project, sequence_name):
+    response = init_sequence_upload(client, project, sequence_name, 100)
+    assert response.status_code == 400
+
+
+def test_traversal_name_stays_under_sequences(client, project):
+    library = os.path.join(project['folder'], 'library')
+    os.makedirs(os.path.join(library, 'images'), exist_ok=True)
+    keep = os.path.join(library, 'images', 'keep.txt')
+    with open(keep, 'w') as f:
+        f.write('keep')
+
+    data = png_bytes()
+    response = init_sequence_upload(client, project, '../images', len(data))
+    assert response.status_code == 201, response.get_data(as_text=True)
+    upload_id = response.get_json()['upload_id']
+    response = quiet(client.put, f'/api/uploads/{upload_id}?offset=0', data=data, headers=project['headers'])
+    assert response.status_code in (200, 201), response.get_data(as_text=True)
+    response = quiet(client.post, f'/api/uploads/{upload_id}/finalize', json={}, headers=project['headers'])
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+    sequence_name = response.get_json()['sequence_name']
+    assert sequence_name == '..images'
+    assert os.path.exists(keep)
+    assert os.path.exists(os.path.join(library, 'sequences', sequence_name, 'sprite.png'))
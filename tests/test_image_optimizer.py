@@ -0,0 +1,48 @@
+"""image_optimizer: Accept 헤더 해석과 변형 선택"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from image_optimizer import accepted_variants, select_variant
+
+
+def test_accepted_variants_parses_quality():
+    assert accepted_variants('image/avif,image/webp,*/*') == ('avif', 'webp')
+    assert accepted_variants('image/webp;q=0.8, IMAGE/AVIF') == ('avif', 'webp')
+    assert accepted_variants('image/avif;q=0, image/webp') == ('webp',)
+    assert accepted_variants('image/avif;q=0.0') == ()
+    assert accepted_variants('image/*, */*;q=0.8') == ()
+    assert accepted_variants('') == ()
+
+
+def make_library(tmp_path, size, variants):
+    images = tmp_path / 'library' / 'images'
+    variants_dir = tmp_path / 'library' / 'variants'
+    images.mkdir(parents=True)
+    variants_dir.mkdir()
+    (images / 'a.png').write_bytes(b'x' * size)
+    for key, variant_size in variants.items():
+        (variants_dir / f'a.png.{key}').write_bytes(b'x' * variant_size)
+    (variants_dir / 'a.png.json').write_text(json.dumps({'size': size, 'variants': variants}))
+    return str(images)
+
+
+def test_select_smallest_variant(tmp_path):
+    images = make_library(tmp_path, 1000, {'avif': 700, 'webp': 500})
+    assert select_variant(images, 'a.png', ('avif', 'webp'))[1:] == ('a.png.webp', 'image/webp')
+    assert select_variant(images, 'a.png', ('avif',))[1:] == ('a.png.avif', 'image/avif')
+    assert select_variant(images, 'a.png', ()) is None
+
+
+def test_select_skips_variant_not_smaller_than_original(tmp_path):
+    images = make_library(tmp_path, 1000, {'avif': 1200})
+    assert select_variant(images, 'a.png', ('avif', 'webp')) is None
+
+
+def test_select_without_manifest_sends_original(tmp_path):
+    images = make_library(tmp_path, 1000, {'webp': 500})
+    os.remove(os.path.join(os.path.dirname(images), 'variants', 'a.png.json'))
+    assert select_variant(images, 'a.png', ('webp',)) is None
@@ -0,0 +1,94 @@
+"""증분 백업: watermark 와 체인 복구"""
+
+import io
+import json
+import os
+import zipfile
+from datetime import timedelta
+
+from PIL import Image
+
+from conftest import quiet
+
+
+def create_backup(client, headers, full=False):
+    response = quiet(client.post, '/api/admin/backups/incremental', json={'full': full}, headers=headers)
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return response.get_json()['backup']
+
+
+def archive_rows(app_module, name, table_name):
+    with zipfile.ZipFile(app_module.incremental_backups.archive_path(name)) as archive:
+        return json.loads(archive.read(f'tables/{table_name}.json'))
+
+
+def add_object(app_module, scene_id, name, updated_at=None):
+    with app_module.app.app_context():
+        obj = app_module.Object(name=name, type='text', order=0, properties='{}', in_motion='{}',
+                                out_motion='{}', timing='{}', scene_id=scene_id, updated_at=updated_at)
+        app_module.db.session.add(obj)
+        app_module.db.session.commit()
+        return obj.id, obj.updated_at
+
+
+def test_late_commit_with_older_updated_at_is_captured(app_module, client, admin_headers, project):
+    _, updated_at = add_object(app_module, project['scene_id'], 'before')
+    create_backup(client, admin_headers, full=True)
+
+    # 백업 전에 updated_at 이 찍혔지만 백업 후에 커밋된 행
+    object_id, _ = add_object(app_module, project['scene_id'], 'late', updated_at - timedelta(seconds=1))
+
+    record = create_backup(client, admin_headers)
+    assert record['type'] == 'incremental'
+    assert object_id in [row['id'] for row in archive_rows(app_module, record['name'], 'objects')]
+
+
+def upload_image(client, project, filename, color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (16, 16), color).save(buffer, 'PNG')
+    response = quiet(client.post, f"/api/projects/{project['name']}/upload/image", headers=project['headers'],
+                     data={'file': (io.BytesIO(buffer.getvalue()), filename)}, content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+
+def object_names(app_module, scene_id):
+    with app_module.app.app_context():
+        return sorted(o.name for o in app_module.Object.query.filter_by(scene_id=scene_id))
+
+
+def restore(client, headers, name):
+    response = quiet(client.post, f'/api/admin/backups/incremental/{name}/restore', headers=headers,
+                     json={'restore_database': True, 'restore_libraries': True})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+
+def test_chain_restore(app_module, client, admin_headers, project):
+    images = os.path.join(project['folder'], 'library', 'images')
+    upload_image(client, project, 'first.png', (255, 0, 0))
+    first_id, _ = add_object(app_module, project['scene_id'], 'first')
+    base = create_backup(client, admin_headers, full=True)
+
+    # 증분 1: 파일 추가/삭제, 행 추가/삭제
+    upload_image(client, project, 'second.png', (0, 255, 0))
+    response = quiet(client.delete, f"/api/projects/{project['name']}/library/images/first.png", headers=project['headers'])
+    assert response.status_code == 200, response.get_data(as_text=True)
+    add_object(app_module, project['scene_id'], 'second')
+    with app_module.app.app_context():
+        app_module.db.session.delete(app_module.db.session.get(app_module.Object, first_id))
+        app_module.db.session.commit()
+    incremental = create_backup(client, admin_headers)
+    assert incremental['parent'] == base['name']
+
+    # 백업 이후 변경은 복구로 되돌아가야 함
+    add_object(app_module, project['scene_id'], 'after')
+    upload_image(client, project, 'after.png', (0, 0, 255))
+
+    result = restore(client, admin_headers, incremental['name'])
+    assert result['chain'] == [base['name'], incremental['name']]
+    assert object_names(app_module, project['scene_id']) == ['second']
+    assert sorted(os.listdir(images)) == ['second.png']
+
+    restore(client, admin_headers, base['name'])
+    assert object_names(app_module, project['scene_id']) == ['first']
+    assert sorted(os.listdir(images)) == ['first.png']
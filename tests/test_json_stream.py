@@ -0,0 +1,63 @@
+"""json_stream.JsonStreamReader: 버퍼 경계가 어디에 오더라도 json.loads 와 같은 결과"""
+
+import io
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from json_stream import JsonStreamReader
+
+DOCUMENT = json.dumps({
+    'metadata': {'version': '2.0', 'ratio': 2.5},
+    'rows': [2.5, -3e5, 1.25e-3, 1E+10, 0, -0.5, 12345678901234567890, 'a.b', True, False, None,
+             {'x': -1.5e-7, 'y': [10, 20.25]}, [], {}],
+    'tail': 7
+})
+
+
+def read_document(chunk_size):
+    reader = JsonStreamReader(io.StringIO(DOCUMENT), chunk_size=chunk_size)
+    result = {}
+    for key in reader.iter_object():
+        result[key] = list(reader.iter_array()) if key == 'rows' else reader.read_value()
+    return result
+
+
+@pytest.mark.parametrize('chunk_size', range(1, len(DOCUMENT) + 2))
+def test_chunk_boundaries(chunk_size):
+    assert read_document(chunk_size) == json.loads(DOCUMENT)
+
+
+@pytest.mark.parametrize('text', ['[2.5]', '[-3e5]', '[1.25e-3]', '[7]'])
+def test_numbers_split_at_every_position(text):
+    for chunk_size in range(1, len(text) + 1):
+        reader = JsonStreamReader(io.StringIO(text), chunk_size=chunk_size)
+        assert list(reader.iter_array()) == json.loads(text)
+
+
+def test_large_value_time_is_linear():
+    # 큰 값 하나(백업의 libraries_files 같은)를 read_value 로 읽는 시간이 json.loads 와 같은 차수여야 함
+    # (청크마다 처음부터 다시 디코딩하면 크기의 제곱에 비례)
+    text = json.dumps({'files': {f'project_{i}': {'images': [{'filename': f'{i}.png', 'size': i}]}
+                                 for i in range(60000)}})
+    assert len(text) > 4 * 1024 * 1024
+
+    def best_of(fn, rounds=3):
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def stream():
+        reader = JsonStreamReader(io.StringIO(text))
+        for _ in reader.iter_object():
+            reader.read_value()
+
+    assert best_of(stream) < best_of(lambda: json.loads(text)) * 4 + 0.1
@@ -0,0 +1,37 @@
+"""library_index: 재생성 시 해시 없이 임시 버전으로 저장하고 백그라운드 워커가 해시 버전을 채움"""
+
+import os
+import sys
+import threading
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from asset_server import asset_server
+from library_index import library_index
+
+
+# app_module: 워커 스레드가 gevent 패치 전에 시작되지 않도록 앱을 먼저 불러옴
+def test_rebuild_defers_hashing(app_module, tmp_path, monkeypatch):
+    library = tmp_path / 'library'
+    (library / 'images').mkdir(parents=True)
+    (library / 'sequences' / 'walk').mkdir(parents=True)
+    Image.new('RGBA', (20, 10), (255, 0, 0, 128)).save(library / 'images' / 'a.png')
+    Image.new('RGB', (4, 4)).save(library / 'sequences' / 'walk' / 'sprite.png')
+
+    hashed = []
+    original = asset_server.asset_version
+    monkeypatch.setattr(asset_server, 'asset_version', lambda path: hashed.append(threading.get_ident()) or original(path))
+
+    data = library_index.load(str(library))
+    assert threading.get_ident() not in hashed  # 목록 요청 안에서는 파일을 해시하지 않음
+    assert '-' in data['images']['a.png']['version']
+    assert '-' in data['sequences']['walk']['versions']['sprite.png']
+
+    library_index._metadata_queue.join()
+    data = library_index.load(str(library))
+    image = data['images']['a.png']
+    assert image['version'] == original(str(library / 'images' / 'a.png'))
+    assert image['metadata_pending'] is False and image['has_alpha'] is True
+    assert data['sequences']['walk']['versions']['sprite.png'] == original(str(library / 'sequences' / 'walk' / 'sprite.png'))
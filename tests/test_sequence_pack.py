@@ -0,0 +1,37 @@
+"""sequence_pack: 아틀라스 배치와 크기 한계"""
+
+import json
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sequence_pack import MAX_ATLAS_SIZE, PACK_FILENAME, build_sequence_pack, layout_frames
+
+
+def test_layout_stays_within_atlas():
+    frames = [{'width': 1500, 'height': 1000}] * 20
+    placements, atlas_sizes = layout_frames(frames)
+    for (atlas, x, y), frame in zip(placements, frames):
+        width, height = atlas_sizes[atlas]
+        assert x + frame['width'] <= width <= MAX_ATLAS_SIZE
+        assert y + frame['height'] <= height <= MAX_ATLAS_SIZE
+
+
+@pytest.mark.parametrize('frame', [{'width': MAX_ATLAS_SIZE + 1, 'height': 10},
+                                   {'width': 10, 'height': MAX_ATLAS_SIZE + 1},
+                                   {'width': 0, 'height': 10}])
+def test_layout_rejects_oversized_frame(frame):
+    with pytest.raises(ValueError, match='Frame 1'):
+        layout_frames([{'width': 10, 'height': 10}, frame])
+
+
+def test_build_rejects_wide_sprite_before_writing(tmp_path):
+    Image.new('RGBA', (MAX_ATLAS_SIZE + 10, 20)).save(tmp_path / 'sprite.png')
+    (tmp_path / 'meta.json').write_text(json.dumps({'frame_height': 10, 'frame_count': 2}))
+    with pytest.raises(ValueError):
+        build_sequence_pack(str(tmp_path))
+    assert not (tmp_path / PACK_FILENAME).exists()
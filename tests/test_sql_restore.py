@@ -0,0 +1,79 @@
+"""SQL 덤프 -> /api/admin/restore 왕복"""
+
+import io
+
+from conftest import quiet
+
+TRICKY_TEXTS = ["100%", "50% off %s %(name)s", "time :name and :1", "it's; -- not a comment", "줄\n바꿈"]
+
+
+def dump_sql(app_module, tmp_path):
+    import backup_db
+    with app_module.app.app_context():
+        assert quiet(backup_db.backup_postgres_db, str(tmp_path), 'test')
+    return (tmp_path / 'database_test.sql').read_bytes()
+
+
+def restore_sql(client, admin_headers, sql):
+    return quiet(client.post, '/api/admin/restore', data={'backup_file': (io.BytesIO(sql), 'backup.sql')},
+                 headers=admin_headers, content_type='multipart/form-data')
+
+
+def object_rows(app_module):
+    with app_module.app.app_context():
+        return [(o.id, o.name, o.properties, o.scene_id, o.created_at)
+                for o in app_module.Object.query.order_by(app_module.Object.id)]
+
+
+def test_round_trip_keeps_percent_and_colon_literals(app_module, client, admin_headers, project, tmp_path):
+    for text in TRICKY_TEXTS:
+        response = quiet(client.post, f"/api/scenes/{project['scene_id']}/objects",
+                         json={'name': text, 'type': 'text', 'properties': {'text': text}}, headers=project['headers'])
+        assert response.status_code == 201
+    before = object_rows(app_module)
+    sql = dump_sql(app_module, tmp_path)
+
+    with app_module.app.app_context():
+        app_module.Object.query.delete()
+        app_module.db.session.commit()
+
+    response = restore_sql(client, admin_headers, sql)
+    assert response.status_code == 200, response.get_json()
+    assert object_rows(app_module) == before
+    assert {text for _, text, _, _, _ in before} >= set(TRICKY_TEXTS)
+
+
+def test_failing_statement_rolls_back(app_module, client, admin_headers, project):
+    before = object_rows(app_module)
+    sql = b"DELETE FROM objects;\nINSERT INTO no_such_table VALUES (1);\n"
+    response = restore_sql(client, admin_headers, sql)
+    assert response.status_code == 400
+    assert '2' in response.get_json()['error']
+    assert object_rows(app_module) == before
+
+
+def test_dump_without_admin_keeps_current_admin(app_module, client, admin_headers):
+    with app_module.app.app_context():
+        before = app_module.User.query.filter_by(username='admin').one().to_dict()
+    sql = (b"INSERT INTO \"user\" (id, username, password, created_at, is_active) "
+           b"VALUES (9999, 'restored', 'x', '2024-01-01 00:00:00', 1);\n")
+    response = restore_sql(client, admin_headers, sql)
+    assert response.status_code == 200, response.get_json()
+    with app_module.app.app_context():
+        users = {u.username: u.to_dict() for u in app_module.User.query.all()}
+    assert set(users) == {'admin', 'restored'}
+    assert users['admin'] == before
+
+
+def test_dump_admin_row_replaces_admin(app_module, client, admin_headers):
+    # 예전 덤프처럼 DELETE 없이 admin 행을 넣어도 충돌하지 않고 덤프의 값으로 바뀜
+    with app_module.app.app_context():
+        admin = app_module.User.query.filter_by(username='admin').one()
+        admin_id, password = admin.id, admin.password
+    sql = (b"INSERT INTO \"user\" (id, username, password, created_at, is_active) "
+           b"VALUES (%d, 'admin', '%s', '2020-02-02 00:00:00', 1);\n" % (admin_id, password.encode()))
+    response = restore_sql(client, admin_headers, sql)
+    assert response.status_code == 200, response.get_json()
+    with app_module.app.app_context():
+        users = app_module.User.query.all()
+        assert [(u.id, u.username, u.created_at.year) for u in users] == [(admin_id, 'admin', 2020)]
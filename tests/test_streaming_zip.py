@@ -0,0 +1,42 @@
+"""streaming_zip.extract_member: 임시 파일에 풀고 CRC 를 확인한 뒤에만 대상 파일을 교체"""
+
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from streaming_zip import extract_member
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / 'backup.zip')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr('images/a.png', b'new image data' * 1000)
+    return path
+
+
+def test_extract_replaces_file(archive, tmp_path):
+    target = tmp_path / 'library' / 'a.png'
+    target.parent.mkdir()
+    target.write_bytes(b'old')
+    inode = os.stat(target).st_ino
+    extract_member(archive, zipfile.ZipFile(archive).getinfo('images/a.png'), str(target))
+    assert target.read_bytes() == b'new image data' * 1000
+    assert os.stat(target).st_ino != inode  # 제자리에서 다시 쓰지 않음
+    assert os.listdir(target.parent) == ['a.png']
+
+
+def test_crc_mismatch_keeps_original(archive, tmp_path):
+    target = tmp_path / 'library' / 'a.png'
+    target.parent.mkdir()
+    target.write_bytes(b'old')
+    info = zipfile.ZipFile(archive).getinfo('images/a.png')
+    info.CRC ^= 1
+    with pytest.raises(zipfile.BadZipFile):
+        extract_member(archive, info, str(target))
+    assert target.read_bytes() == b'old'
+    assert os.listdir(target.parent) == ['a.png']